@@ -4,6 +4,7 @@ import numpy as np
 import os
 import json
 from datetime import datetime
+import indicator_graph
 
 class AdaptiveTrader:
     def __init__(self):
@@ -42,6 +43,9 @@ class AdaptiveTrader:
         
     def prepare_features(self, data):
         """İndikatörlerden özellikler oluştur"""
+        if isinstance(data, pd.DataFrame):
+            indicator_graph.ensure(data, ['RSI', 'MACD', 'MACD_Signal', 'BB_upper', 'BB_lower', 'MA20'])
+        
         return {
             'rsi': data['RSI'].iloc[-1],
             'macd': data['MACD'].iloc[-1],
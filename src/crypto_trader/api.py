@@ -10,8 +10,14 @@ import threading
 from model_trainer import ModelTrainer
 from trading_bot import TradingBot
 from data_collector import DataCollector
+from async_data_collector import AsyncDataCollector
+from exchange_pool import close_async_exchanges
+from kline_stream import FileReplayTransport, recording_path
+from request_scheduler import PRIORITY_POSITION, PRIORITY_SCAN
+from candle_scheduler import CandleScheduler
 from config import RECOMMENDED_COINS
 from trading_signals import SignalGenerator
+import indicator_graph
 
 app = FastAPI(title="Crypto Trading API")
 
@@ -29,7 +35,57 @@ active_symbols = set()
 trading_bots = {}
 latest_signals = {}
 signal_lock = threading.Lock()
+scan_lock = threading.Lock()  # scan_generator aynı anda tek taramada kullanılır (işçi thread'lerde)
 signal_generators = {}
+async_collector = None
+compact_collector = None
+stream_task = None
+scan_generator = None  # evren taramasının paylaşılan sinyal durumu (aktif işlemler, bekleme süreleri)
+candle_scheduler = None
+scheduler_task = None
+
+# Açık pozisyonlar stop/hedef kontrolü için mum kapanışı beklenmeden bu aralıkla izlenir
+POSITION_CHECK_TIMEFRAME = '1m'
+
+def get_async_collector():
+    """
+    API genelinde paylaşılan asenkron veri toplayıcıyı döndürür
+    """
+    global async_collector
+    if async_collector is None:
+        async_collector = AsyncDataCollector()
+    return async_collector
+
+def get_compact_collector():
+    """
+    Toplu çekimler (tüm coinler için eğitim verisi, akış öncesi depo ısıtma) için
+    çerçeveleri kompakt float32 blokta tutan toplayıcı. Canlı sinyal, stop/hedef ve
+    mesaj hesapları float64 çerçevelerle get_async_collector üzerinden yapılır.
+    """
+    global compact_collector
+    if compact_collector is None:
+        compact_collector = AsyncDataCollector(frame_dtype='float32')
+    return compact_collector
+
+def create_signal_generator():
+    """
+    Çoklu zaman dilimi trend uyumunu paylaşılan toplayıcının önbelleğinden okuyan SignalGenerator
+    """
+    signal_generator = SignalGenerator()
+    signal_generator.set_data_collector(get_async_collector())
+    return signal_generator
+
+def get_candle_scheduler():
+    """
+    Sinyal değerlendirmelerini mum kapanışlarına hizalayan paylaşılan zamanlayıcı;
+    döngüsü ilk çağrıda başlatılır
+    """
+    global candle_scheduler, scheduler_task
+    if candle_scheduler is None:
+        candle_scheduler = CandleScheduler()
+    if scheduler_task is None or scheduler_task.done():
+        scheduler_task = asyncio.create_task(candle_scheduler.run())
+    return candle_scheduler
 
 class TradingSignal(BaseModel):
     symbol: str
@@ -60,20 +116,20 @@ async def start_trading(symbol: str):
                 "message": f"{formatted_symbol} zaten izleniyor"
             }
             
-        # Veri toplayıcı oluştur
-        collector = DataCollector()
-        historical_data = collector.get_multi_timeframe_data(formatted_symbol)
+        # Veri toplayıcı (event loop'u bloklamadan)
+        collector = get_async_collector()
+        historical_data = await collector.get_multi_timeframe_data(formatted_symbol)
         
         if historical_data:
             # Trading bot ve sinyal üretici oluştur
-            signal_generators[formatted_symbol] = SignalGenerator()
+            signal_generators[formatted_symbol] = create_signal_generator()
             active_symbols.add(formatted_symbol)
             
             # Sadece 1h timeframe için izleme başlat
-            asyncio.create_task(monitor_signals(formatted_symbol, '1h'))
+            monitor_signals(formatted_symbol, '1h')
             
             # İlk fiyat bilgisini al
-            current_price = collector.get_current_price(formatted_symbol)
+            current_price = await collector.get_current_price(formatted_symbol)
             
             return {
                 "status": "success",
@@ -101,6 +157,10 @@ async def stop_trading(symbol: str):
         active_symbols.remove(symbol)
         trading_bots.pop(symbol, None)
         latest_signals.pop(symbol, None)
+        if candle_scheduler is not None:
+            candle_scheduler.unsubscribe(symbol)
+        if async_collector is not None:
+            async_collector.ticker_snapshot.unwatch(symbol)
         return {"message": f"{symbol} trading durduruldu"}
     return {"message": f"{symbol} zaten izlenmiyor"}
 
@@ -202,67 +262,317 @@ async def watch_signals(symbol: str, timeframe: str = "1h"):
             
         # Veri toplama ve sinyal izleme başlat
         collector = DataCollector([timeframe])
-        signal_generator = SignalGenerator()
+        signal_generator = create_signal_generator()
         
         # Global değişkenlere ekle
         trading_bots[symbol] = signal_generator
         active_symbols.add(symbol)
         
-        # Background task olarak sinyal üretmeye başla
-        asyncio.create_task(monitor_signals(symbol, timeframe))
+        # Sinyal değerlendirmesini mum kapanışı zamanlayıcısına kaydet
+        monitor_signals(symbol, timeframe)
         
         return {"message": f"{symbol} {timeframe} sinyalleri izleniyor"}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-async def monitor_signals(symbol, timeframe):
+def monitor_signals(symbol, timeframe):
     """
-    Belirli bir coin için sinyalleri izler
+    Belirli bir coin için sinyal izlemeyi zamanlayıcıya kaydeder: değerlendirme her mum
+    kapanışında bir kez yapılır. Açık pozisyon varken fiyat dakikalık izlenir.
     """
     print(f"\n=== Monitor Başlatıldı ===")
     print(f"Sembol: {symbol}")
     print(f"Timeframe: {timeframe}")
     
+    if symbol not in signal_generators:
+        signal_generators[symbol] = create_signal_generator()
+    
+    def has_position():
+        signal_generator = signal_generators.get(symbol)
+        return signal_generator is not None and bool(signal_generator.active_trades.get(symbol))
+    
+    async def load(symbol, timeframe):
+        # Açık pozisyonu olan sembollerin istekleri taramalardan önce işlenir
+        position = has_position()
+        priority = PRIORITY_POSITION if position else PRIORITY_SCAN
+        
+        # Veriyi al (event loop bloklanmaz)
+        collector = get_async_collector()
+        data = await collector.get_multi_timeframe_data(symbol, timeframes=[timeframe], priority=priority)
+        df = data.get(timeframe) if data is not None else None
+        if df is None or df.empty:
+            print(f"HATA: {symbol} {timeframe} verisi bulunamadı")
+            return None
+        
+        # Sürüm: son kapanmış mumun açılış zamanı
+        closed = collector.closed_rows(df, timeframe)
+        if not closed.any():
+            return None
+        version = int(df.index.asi8[closed][-1] // 1_000_000)
+        
+        # Pozisyon takibi (stop/hedef) güncel fiyatla yapılır: açık mum korunur ve
+        # fiyat değişimi de yeni sürümdür
+        if position:
+            return (version, float(df['close'].iloc[-1])), df
+        
+        # Sinyaller sadece kapanmış mumlardan üretilir
+        df = await asyncio.to_thread(collector.closed_frame, df, symbol, timeframe)
+        return version, df
+    
+    def evaluate(symbol, timeframe, df):
+        signal_generator = signal_generators.get(symbol)
+        if signal_generator is None:
+            return
+        
+        print(f"\n{symbol} için sinyal kontrolü yapılıyor...")
+        position = has_position()
+        evaluate_signal(signal_generator, df, symbol, timeframe)
+        
+        # Pozisyon açıldı veya kapandıysa uyanma aralığını değiştir
+        if has_position() != position:
+            every = POSITION_CHECK_TIMEFRAME if has_position() else timeframe
+            get_candle_scheduler().subscribe(symbol, timeframe, load, evaluate, immediate=False, every=every)
+    
+    every = POSITION_CHECK_TIMEFRAME if has_position() else timeframe
+    get_candle_scheduler().subscribe(symbol, timeframe, load, evaluate, every=every)
+
+def evaluate_signal(signal_generator, df, symbol, timeframe):
+    """
+    Veriyi analiz eder ve yeni sinyal varsa saklar
+    """
     try:
-        if symbol not in signal_generators:
-            signal_generators[symbol] = SignalGenerator()
-            
-        signal_generator = signal_generators[symbol]
+        # Aynı signal generator'ı kullan
+        signal_data = signal_generator.analyze_signals(df, symbol, timeframe)
+        print(f"Sinyal analizi sonucu: {signal_data}")
         
-        while True:
-            print(f"\n{symbol} için sinyal kontrolü yapılıyor...")
-            
-            # Veriyi al
-            collector = DataCollector()
-            data = collector.get_multi_timeframe_data(symbol)
-            
-            if data is not None:
-                # Timeframe'e göre veriyi al
-                df = data.get(timeframe)
-                
-                if df is not None:
-                    try:
-                        # Aynı signal generator'ı kullan
-                        signal_data = signal_generator.analyze_signals(df, symbol, timeframe)
-                        print(f"Sinyal analizi sonucu: {signal_data}")
-                        
-                        # Son sinyali sakla
-                        if signal_data:
-                            latest_signals[symbol] = signal_data
-                            print(f"Yeni sinyal kaydedildi: {signal_data}")
-                            
-                    except Exception as e:
-                        print(f"Sinyal analiz hatası: {str(e)}")
-                else:
-                    print(f"HATA: {timeframe} verisi bulunamadı")
-            else:
-                print(f"HATA: {symbol} için veri alınamadı")
-                
-            await asyncio.sleep(60)  # 1 dakika bekle
+        # Son sinyali sakla
+        if signal_data:
+            latest_signals[symbol] = signal_data
+            print(f"Yeni sinyal kaydedildi: {signal_data}")
             
     except Exception as e:
-        print(f"Monitor hatası ({symbol}): {str(e)}")
+        print(f"Sinyal analiz hatası: {str(e)}")
+
+async def on_stream_candle_close(symbol, timeframe, candle):
+    """
+    Akış modunda mum kapanır kapanmaz sinyal analizini çalıştırır
+    """
+    try:
+        # Durdurulan sembollerin kapanışları işlenmez
+        if symbol not in active_symbols or symbol not in signal_generators:
+            return
+        
+        collector = get_async_collector()
+        
+        # Akış başlamadan önceki eksik mumları REST ile tamamla
+        if collector.kline_stream is not None and collector.kline_stream.consume_gap(symbol, timeframe):
+            await collector.fetch_ohlcv_frame(symbol, timeframe)
+        
+        # İndikatör motoru kapanışla güncellendi; çerçeveye sadece yeni satır eklenir
+        df = await asyncio.to_thread(collector.get_close_frame, symbol, timeframe)
+        if df is None:
+            print(f"HATA: {symbol} {timeframe} verisi bulunamadı")
+            return
+        
+        signal_generator = signal_generators.get(symbol)
+        if signal_generator is None:
+            return
+        
+        evaluate_signal(signal_generator, df, symbol, timeframe)
+        
+    except Exception as e:
+        print(f"Akış analiz hatası ({symbol} {timeframe}): {str(e)}")
+
+@app.post("/start_streaming")
+async def start_streaming(category: str = "major", timeframes: str = "15m,1h,4h", replay_file: Optional[str] = None):
+    """
+    Kategori için akış modunu başlat: sinyaller her mum kapanışında üretilir.
+    replay_file verilirse borsa websocket'i yerine kayıt klasöründeki (data/recordings)
+    kline dosyası oynatılır.
+    """
+    global stream_task
+    
+    if category not in RECOMMENDED_COINS:
+        return {"error": f"Geçersiz kategori. Mevcut kategoriler: {list(RECOMMENDED_COINS.keys())}"}
+    
+    if stream_task is not None and not stream_task.done():
+        return {"status": "warning", "message": "Akış zaten çalışıyor"}
+    
+    if replay_file:
+        try:
+            replay_file = recording_path(replay_file)
+        except ValueError as e:
+            return {"error": str(e)}
+    
+    symbols = [f"{symbol[:-4]}/USDT" for symbol in RECOMMENDED_COINS[category]]
+    timeframe_list = timeframes.split(',')
+    
+    collector = get_async_collector()
+    
+    # Akış başlamadan önce yerel depoyu güncelle
+    await get_compact_collector().fetch_many(symbols, timeframe_list)
+    active_symbols.update(symbols)
+    for symbol in symbols:
+        if symbol not in signal_generators:
+            signal_generators[symbol] = create_signal_generator()
+    
+    transport = FileReplayTransport(replay_file) if replay_file else None
+    stream_task = asyncio.create_task(collector.stream_klines(
+        symbols,
+        timeframe_list,
+        transport=transport,
+        on_candle_close=on_stream_candle_close
+    ))
+    
+    return {"status": "success", "message": f"Akış başlatıldı: {symbols} {timeframe_list}"}
+
+@app.post("/stop_streaming")
+async def stop_streaming():
+    """
+    Kline akışını ve görevini durdurur
+    """
+    global stream_task
+    
+    collector = async_collector
+    if collector is not None and collector.kline_stream is not None:
+        collector.kline_stream.stop()
+    
+    if stream_task is not None and not stream_task.done():
+        stream_task.cancel()
+        try:
+            await stream_task
+        except asyncio.CancelledError:
+            pass
+    stream_task = None
+    
+    return {"message": "Akış durduruldu"}
+
+@app.get("/scheduler_metrics")
+async def scheduler_metrics():
+    """
+    Rate-limit zamanlayıcısının kuyruk derinliği ve bekleme istatistikleri, mum kapanışı
+    zamanlayıcısının uyanma/değerlendirme sayıları
+    """
+    collector = get_async_collector()
+    return {
+        "scheduler": collector.scheduler.metrics(),
+        "coalescer": dict(collector.coalescer.stats),
+        "ticker_snapshot": dict(collector.ticker_snapshot.stats),
+        "candle_scheduler": candle_scheduler.metrics() if candle_scheduler is not None else None
+    }
+
+@app.post("/scan")
+async def scan_universe(timeframe: str = "1h", category: str = "all", symbols: Optional[str] = None):
+    """
+    Sembol evrenini tek toplu geçişte tarar: indikatörler tüm semboller için vektörel
+    hesaplanır, giriş kuralları dizi ifadeleriyle değerlendirilir ve sadece koşulu
+    sağlayan semboller mesaj yoluna gider. symbols verilmezse kategori (all: tümü) kullanılır.
+    """
+    global scan_generator
+    
+    if symbols:
+        universe = [symbol.strip() for symbol in symbols.split(',') if symbol.strip()]
+    elif category == "all":
+        universe = [symbol for coins in RECOMMENDED_COINS.values() for symbol in coins]
+    elif category in RECOMMENDED_COINS:
+        universe = RECOMMENDED_COINS[category]
+    else:
+        return {"error": f"Geçersiz kategori. Mevcut kategoriler: {list(RECOMMENDED_COINS.keys())}"}
+    
+    universe = list(dict.fromkeys(
+        symbol if '/' in symbol else f"{symbol[:-4]}/USDT" for symbol in universe
+    ))
+    
+    try:
+        collector = get_async_collector()
+        
+        # Sadece mum deposunu güncelle; indikatörler toplu olarak hesaplanır
+        await asyncio.gather(*[
+            collector.fetch_ohlcv_frame(symbol, timeframe, limit=1000) for symbol in universe
+        ], return_exceptions=True)
+        
+        # Depo okuması, 2D indikatör hesabı ve sinyal analizi (Telegram dahil) event loop'u bloklamasın
+        batch = await asyncio.to_thread(collector.load_indicator_batch, universe, timeframe)
+        if batch is None or len(batch) == 0:
+            raise HTTPException(status_code=404, detail=f"{timeframe} için veri yok")
+        
+        if scan_generator is None:
+            scan_generator = create_signal_generator()
+        
+        def analyze():
+            with scan_lock:
+                return scan_generator.analyze_batch(batch, timeframe)
+        
+        signals = await asyncio.to_thread(analyze)
+        
+        with signal_lock:
+            latest_signals.update(signals)
+        
+        return {
+            "timeframe": timeframe,
+            "scanned": len(batch),
+            "signals": list(signals.values())
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/trend_alignment/{symbol}")
+async def trend_alignment(symbol: str, timeframe: str = "15m", timeframes: Optional[str] = None):
+    """
+    Zaman dilimi trendinin diğer zaman dilimleriyle uyumu; trendler önbellekten gelir ve
+    sadece ilgili zaman diliminin mumu kapandığında yeniden hesaplanır.
+    timeframes verilmezse komşu zaman dilimleri (ör. 1h için 15m ve 4h) kullanılır.
+    """
+    formatted_symbol = symbol if '/' in symbol else f"{symbol[:-4]}/USDT"
+    collector = get_async_collector()
+    result = collector.get_trend_alignment(
+        formatted_symbol, timeframe, timeframes.split(',') if timeframes else None
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"{formatted_symbol} {timeframe} için trend verisi yok")
+    return {"symbol": formatted_symbol, "timeframe": timeframe, **result}
+
+@app.get("/indicator_catalog")
+async def indicator_catalog():
+    """
+    İstenebilecek indikatör sütunları ve varsayılan parametreleri
+    """
+    return {"indicators": indicator_graph.catalog()}
+
+@app.get("/indicators/{symbol}")
+async def get_indicators(symbol: str, timeframe: str = "1h", names: str = "RSI,MACD,ADX"):
+    """
+    Depodaki mumlardan istenen indikatörlerin son değerleri. Varsayılan set dışındaki
+    indikatörler sadece istendiğinde hesaplanır.
+    """
+    requested = [name.strip() for name in names.split(',') if name.strip()]
+    catalog = indicator_graph.catalog()
+    unknown = [name for name in requested if name not in catalog]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Tanımsız indikatör: {unknown}")
+    
+    formatted_symbol = symbol if '/' in symbol else f"{symbol[:-4]}/USDT"
+    collector = get_async_collector()
+    # Depo okuması ve çerçeve hazırlığı event loop'u bloklamasın
+    df = await asyncio.to_thread(collector.get_stream_frame, formatted_symbol, timeframe)
+    if df is None:
+        raise HTTPException(status_code=404, detail=f"{formatted_symbol} {timeframe} için veri yok")
+    
+    values = {}
+    for name in requested:
+        value = float(df[name].iloc[-1])
+        values[name] = None if value != value else value
+    
+    return {
+        "symbol": formatted_symbol,
+        "timeframe": timeframe,
+        "timestamp": df.index[-1].isoformat(),
+        "values": values
+    }
 
 @app.post("/stop_all_trading")
 async def stop_all_trading():
@@ -275,8 +585,14 @@ async def stop_all_trading():
         trading_bots.pop(symbol, None)
         signal_generators.pop(symbol, None)  # Signal generator'ı da temizle
         latest_signals.pop(symbol, None)
+        if candle_scheduler is not None:
+            candle_scheduler.unsubscribe(symbol)
+        if async_collector is not None:
+            async_collector.ticker_snapshot.unwatch(symbol)
         stopped_symbols.append(symbol)
     
+    await stop_streaming()
+    
     return {"message": f"İzleme durduruldu: {stopped_symbols}"}
 
 @app.post("/test_telegram")
@@ -307,10 +623,14 @@ async def start_all_trading():
         started_symbols = []
         trainer = ModelTrainer()  # Tek bir trainer instance'ı
         
-        for symbol in all_coins:
+        # Tüm coinlerin verilerini eşzamanlı çek (çok sayıda çerçeve: kompakt)
+        collector = get_compact_collector()
+        pending_symbols = [symbol for symbol in all_coins if symbol not in active_symbols]
+        all_data = await collector.fetch_many(pending_symbols)
+        
+        for symbol in pending_symbols:
             if symbol not in active_symbols:
-                collector = DataCollector()
-                historical_data = collector.get_multi_timeframe_data(symbol)
+                historical_data = all_data.get(symbol)
                 
                 if historical_data:
                     # Symbol'ü de parametre olarak geçiyoruz
@@ -320,13 +640,23 @@ async def start_all_trading():
                     started_symbols.append(symbol)
                     
                     for timeframe in ['15m', '1h', '4h']:
-                        asyncio.create_task(monitor_signals(symbol, timeframe))
+                        monitor_signals(symbol, timeframe)
         
         return {"message": f"Trading başlatıldı: {started_symbols}"}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.on_event("shutdown")
+async def close_connections():
+    """
+    Zamanlayıcıyı ve akışı durdur, asenkron borsa bağlantılarını kapat
+    """
+    if candle_scheduler is not None:
+        candle_scheduler.stop()
+    await stop_streaming()
+    await close_async_exchanges()
+
 def start_api():
     """
     API'yi başlat
@@ -0,0 +1,172 @@
+import asyncio
+from data_collector import DataCollector
+from exchange_pool import get_async_exchange, save_markets_cache
+from ticker_snapshot import ticker_to_market_info
+from request_scheduler import ohlcv_weight, PRIORITY_POSITION, PRIORITY_SCAN
+
+class AsyncDataCollector(DataCollector):
+    """
+    DataCollector'ın asenkron sürümü.
+
+    Borsa çağrıları ccxt.async_support ile yapılır ve (sembol, zaman dilimi)
+    çiftleri eşzamanlı çekilir; aynı anda açık istek sayısı `max_concurrency`
+    ile sınırlanır, ccxt'nin rate-limit kuyruğu da paylaşılan istemcide tutulur.
+    İndikatör hesaplamaları DataCollector ile aynıdır.
+
+    Not: G/Ç yapan metotlar (fetch_*, get_*) burada coroutine'dir ve await edilmelidir.
+    Mum deposu okuma/yazma ve indikatör hesapları event loop'u bloklamasın diye
+    asyncio.to_thread ile iş parçacığı havuzunda çalışır.
+    """
+
+    def __init__(self, timeframes=None, candle_store=None, exchange=None, base_timeframe=None,
+                 coalescer=None, max_concurrency=10, scheduler=None, optional_indicators=None,
+                 frame_dtype=None):
+        # Asenkron istemci çalışan event loop'a bağlıdır
+        super().__init__(
+            timeframes=timeframes,
+            candle_store=candle_store,
+            exchange=exchange or get_async_exchange('binance', 'future'),
+            base_timeframe=base_timeframe,
+            coalescer=coalescer,
+            scheduler=scheduler,
+            optional_indicators=optional_indicators,
+            frame_dtype=frame_dtype
+        )
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._markets_ready = False
+
+    async def _ensure_markets(self):
+        """
+        Market bilgileri önbellekte yoksa bir kez yükler
+        """
+        if self._markets_ready or self.exchange.markets:
+            self._markets_ready = True
+            return
+
+        await self.exchange.load_markets()
+        default_type = self.exchange.options.get('defaultType', 'future')
+        save_markets_cache(self.exchange, f"{self.exchange.id}_{default_type}")
+        self._markets_ready = True
+
+    async def fetch_ohlcv_frame(self, symbol, timeframe='1h', limit=1000, priority=PRIORITY_SCAN):
+        """
+        Yerel mum deposunu günceller ve son `limit` mumu DataFrame olarak döndürür
+        """
+        await self._ensure_markets()
+        since = await asyncio.to_thread(self._incremental_since, symbol, timeframe, limit)
+
+        # Ağırlık kuyruğunda beklerken eşzamanlılık yuvasını meşgul etme
+        await self.scheduler.acquire_async(ohlcv_weight(limit), priority)
+        async with self.semaphore:
+            ohlcv = await self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+
+        return await asyncio.to_thread(self._store_and_load, symbol, timeframe, ohlcv, limit)
+
+    async def fetch_historical_data(self, symbol, timeframe='1h', limit=1000):
+        """
+        Belirli bir zaman dilimi için verileri çeker ve teknik indikatörleri hesaplar
+        """
+        try:
+            df = await self.fetch_ohlcv_frame(symbol, timeframe, limit=limit)
+            if df is None or len(df) == 0:
+                print(f"Veri bulunamadı: {symbol} {timeframe}")
+                return None
+
+            df = await asyncio.to_thread(self.add_indicators, df)
+            if df is None or len(df) < 60:  # En az 60 veri noktası gerekli
+                print(f"Yetersiz veri: {symbol} {timeframe}")
+                return None
+
+            return df
+
+        except Exception as e:
+            print(f"Veri çekme hatası ({symbol} {timeframe}): {e}")
+            return None
+
+    async def _load_timeframe_async(self, symbol, timeframe, base_timeframe=None, priority=PRIORITY_SCAN):
+        if base_timeframe:
+            # Temel zaman dilimi zaten güncellendi, depodan türet
+            df = await asyncio.to_thread(self.load_resampled_frame, symbol, timeframe, base_timeframe, 1000)
+        else:
+            df = await self.fetch_ohlcv_frame(symbol, timeframe, limit=1000, priority=priority)
+        if df is None:
+            return None
+        return await asyncio.to_thread(self.prepare_timeframe_frame, df, timeframe)
+
+    async def _fetch_timeframe(self, symbol, timeframe, base_timeframe=None, priority=PRIORITY_SCAN):
+        try:
+            # Aynı anda isteyen diğer monitörlerle çekimi ve indikatör hesabını paylaş
+            df = await self.coalescer.do_async(
+                self._request_key(symbol, timeframe, base_timeframe, 1000),
+                lambda: self._load_timeframe_async(symbol, timeframe, base_timeframe, priority)
+            )
+            return None if df is None else df.copy()
+
+        except Exception as e:
+            print(f"Veri alma hatası ({symbol} {timeframe}): {str(e)}")
+            return None
+
+    async def get_multi_timeframe_data(self, symbol, timeframes=None, base_timeframe=None, priority=PRIORITY_SCAN):
+        """
+        Tüm zaman dilimlerini eşzamanlı çeker
+        """
+        timeframes = timeframes or self.timeframes
+        base_timeframe = base_timeframe or self.base_timeframe
+        derived = self.derivable_timeframes(timeframes, base_timeframe)
+
+        if derived:
+            try:
+                await self.coalescer.do_async(
+                    self._request_key(symbol, base_timeframe, 'ohlcv', 1000),
+                    lambda: self.fetch_ohlcv_frame(symbol, base_timeframe, limit=1000, priority=priority)
+                )
+            except Exception as e:
+                print(f"Veri alma hatası ({symbol} {base_timeframe}): {str(e)}")
+                return None
+
+        frames = await asyncio.gather(*[
+            self._fetch_timeframe(symbol, timeframe, base_timeframe if timeframe in derived else None, priority)
+            for timeframe in timeframes
+        ])
+
+        data = {
+            timeframe: df for timeframe, df in zip(timeframes, frames) if df is not None
+        }
+        return data or None
+
+    async def fetch_many(self, symbols, timeframes=None, priority=PRIORITY_SCAN):
+        """
+        Birden fazla sembolün tüm zaman dilimlerini tek seferde eşzamanlı çeker.
+        Dönüş: {sembol: {zaman_dilimi: DataFrame}}
+        """
+        symbols = list(symbols)
+        results = await asyncio.gather(*[
+            self.get_multi_timeframe_data(symbol, timeframes, priority=priority) for symbol in symbols
+        ])
+        return {symbol: data for symbol, data in zip(symbols, results) if data}
+
+    async def get_current_price(self, symbol, priority=PRIORITY_POSITION):
+        """
+        Anlık fiyat bilgisini getir
+        """
+        try:
+            ticker = await self.ticker_snapshot.get_async(symbol, priority)
+            if ticker is None or ticker.get('last') is None:
+                raise ValueError("ticker bulunamadı")
+            return ticker['last']
+
+        except Exception as e:
+            print(f"Fiyat alma hatası ({symbol}): {str(e)}")
+            # Yerel mum deposundaki son kapanış fiyatını kullan
+            return self.get_cached_close(symbol)
+
+    async def get_market_info(self, symbol, priority=PRIORITY_SCAN):
+        """
+        Coin hakkında temel bilgileri çeker
+        """
+        try:
+            ticker = await self.ticker_snapshot.get_async(symbol, priority)
+            return ticker_to_market_info(ticker)
+        except Exception as e:
+            print(f"Piyasa bilgisi çekme hatası: {e}")
+            return None
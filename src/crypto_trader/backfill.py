@@ -0,0 +1,290 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from candle_store import get_candle_store, DEFAULT_STORE_DIR
+from exchange_pool import get_exchange
+from request_scheduler import get_scheduler_for, PRIORITY_BACKFILL
+
+PAGE_LIMIT = 1000  # Binance kline isteği başına en fazla 1000 (ağırlık 5) mum döndürür
+FLUSH_PAGES = 10  # Bu kadar sayfada bir depoya yaz (kontrol noktası)
+
+
+def parse_date(value):
+    """
+    'YYYY-MM-DD' (veya ISO) tarihini UTC milisaniyeye çevirir
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+class HistoricalBackfill:
+    """
+    Uzun geçmiş OHLCV verisini sayfa sayfa çekip yerel mum deposuna yazar.
+
+    - Depodaki ilk mumdan `since` ile geriye doğru, son mumdan ileriye doğru sayfalar
+    - Birden fazla (sembol, zaman dilimi) işi paralel çalışır; tüm istekler
+      paylaşılan zamanlayıcıdan BACKFILL önceliğiyle geçer, canlı işleri bekletmez
+    - Depo aynı zamanda kontrol noktasıdır: kesilen iş kaldığı yerden devam eder
+    - Mum dizisindeki boşluklar tespit edilip yeniden çekilir; borsada gerçekten
+      olmayan aralıklar (bakım vb.) durum dosyasına yazılır ve tekrar denenmez
+    """
+
+    def __init__(self, exchange=None, candle_store=None, scheduler=None, page_limit=PAGE_LIMIT,
+                 max_workers=8, flush_pages=FLUSH_PAGES):
+        self.exchange = exchange or get_exchange('binance', 'future')
+        self.candle_store = candle_store or get_candle_store()
+        self.scheduler = scheduler or get_scheduler_for(self.exchange)
+        self.page_limit = page_limit
+        self.max_workers = max_workers
+        self.flush_pages = flush_pages
+        self._state_lock = threading.Lock()
+
+    def _state_path(self, symbol, timeframe):
+        return os.path.join(self.candle_store._partition_dir(symbol, timeframe), 'backfill.json')
+
+    def _load_state(self, symbol, timeframe):
+        path = self._state_path(symbol, timeframe)
+        if not os.path.exists(path):
+            return {'listing_ts': None, 'missing': []}
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Backfill durum dosyası okunamadı ({symbol} {timeframe}): {str(e)}")
+            return {'listing_ts': None, 'missing': []}
+
+    def _save_state(self, symbol, timeframe, state):
+        path = self._state_path(symbol, timeframe)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._state_lock:
+            with open(path, 'w') as f:
+                json.dump(state, f)
+
+    def _fetch_page(self, symbol, timeframe, since, limit):
+        return self.scheduler.call(
+            self.exchange.fetch_ohlcv, symbol, timeframe, since=since, limit=limit,
+            endpoint='fetch_ohlcv', priority=PRIORITY_BACKFILL
+        )
+
+    def _flush(self, symbol, timeframe, pending):
+        if pending:
+            self.candle_store.write(symbol, timeframe, pending)
+        return []
+
+    def _page_backward(self, symbol, timeframe, cursor, start_ms, timeframe_ms, report):
+        """
+        cursor'dan (hariç) start_ms'e kadar geriye doğru sayfalar.
+        Borsanın daha eski verisi yoksa ilk mumun zaman damgasını döndürür.
+        """
+        pending = []
+        pages = 0
+        listing_ts = None
+
+        while cursor > start_ms:
+            since = max(start_ms, cursor - self.page_limit * timeframe_ms)
+            rows = self._fetch_page(symbol, timeframe, since, self.page_limit)
+            rows = [row for row in rows or [] if row[0] < cursor]
+            report['requests'] += 1
+
+            if not rows:
+                # İşlem görmeye başladığı tarihten öncesi yok
+                listing_ts = cursor
+                break
+
+            pending.extend(rows)
+            report['candles'] += len(rows)
+            pages += 1
+            cursor = rows[0][0]
+
+            if pages % self.flush_pages == 0:
+                pending = self._flush(symbol, timeframe, pending)
+
+        self._flush(symbol, timeframe, pending)
+        return listing_ts
+
+    def _page_forward(self, symbol, timeframe, since, end_ms, report, limit=None):
+        """
+        since'tan (dahil) end_ms'e kadar ileriye doğru sayfalar
+        """
+        pending = []
+        pages = 0
+
+        while since <= end_ms:
+            rows = self._fetch_page(symbol, timeframe, since, limit or self.page_limit)
+            rows = [row for row in rows or [] if since <= row[0] <= end_ms]
+            report['requests'] += 1
+            if not rows:
+                break
+
+            pending.extend(rows)
+            report['candles'] += len(rows)
+            pages += 1
+            since = rows[-1][0] + 1
+
+            if limit is not None:
+                break
+            if pages % self.flush_pages == 0:
+                pending = self._flush(symbol, timeframe, pending)
+
+        self._flush(symbol, timeframe, pending)
+
+    def find_gaps(self, symbol, timeframe, start_ms=None, end_ms=None):
+        """
+        Depodaki ardışık mumlar arasındaki boşlukları [(ilk_eksik, son_eksik)] olarak döndürür
+        """
+        columns = self.candle_store.read(symbol, timeframe, since=start_ms)
+        if columns is None or len(columns['timestamp']) < 2:
+            return []
+
+        timestamps = columns['timestamp']
+        if end_ms is not None:
+            timestamps = timestamps[timestamps <= end_ms]
+
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        diffs = timestamps[1:] - timestamps[:-1]
+        gap_idx = (diffs > timeframe_ms).nonzero()[0]
+        return [
+            (int(timestamps[i]) + timeframe_ms, int(timestamps[i + 1]) - timeframe_ms)
+            for i in gap_idx
+        ]
+
+    def _fill_gaps(self, symbol, timeframe, start_ms, end_ms, state, report):
+        known = {tuple(gap) for gap in state.get('missing', [])}
+
+        for gap_start, gap_end in self.find_gaps(symbol, timeframe, start_ms, end_ms):
+            if (gap_start, gap_end) in known:
+                continue
+
+            timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+            before = self.candle_store.count(symbol, timeframe)
+            cursor = gap_start
+            while cursor <= gap_end:
+                missing = (gap_end - cursor) // timeframe_ms + 1
+                self._page_forward(symbol, timeframe, cursor, gap_end, report,
+                                   limit=min(self.page_limit, missing))
+                cursor += self.page_limit * timeframe_ms
+
+            report['gaps_filled'] += 1
+            if self.candle_store.count(symbol, timeframe) == before:
+                # Borsada da yok (ör. bakım arası); bir daha deneme
+                known.add((gap_start, gap_end))
+                report['gaps_missing'] += 1
+
+        state['missing'] = sorted([list(gap) for gap in known])
+
+    def backfill(self, symbol, timeframe, start, end=None):
+        """
+        Tek bir (sembol, zaman dilimi) için [start, end] aralığını depoda tamamlar
+        """
+        started = time.monotonic()
+        report = {
+            'symbol': symbol, 'timeframe': timeframe, 'requests': 0, 'candles': 0,
+            'gaps_filled': 0, 'gaps_missing': 0, 'error': None
+        }
+
+        try:
+            timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+            start_ms = parse_date(start) // timeframe_ms * timeframe_ms
+            end_ms = parse_date(end) if end is not None else self.exchange.milliseconds()
+            end_ms = end_ms // timeframe_ms * timeframe_ms
+
+            state = self._load_state(symbol, timeframe)
+            if state.get('listing_ts') is not None:
+                start_ms = max(start_ms, state['listing_ts'])
+
+            first_ts = self.candle_store.first_timestamp(symbol, timeframe)
+            last_ts = self.candle_store.last_timestamp(symbol, timeframe)
+
+            # 1) Geriye doğru: depodaki ilk mumdan (depo boşsa bitişten) başlangıca
+            cursor = first_ts if first_ts is not None else end_ms + timeframe_ms
+            if cursor > start_ms:
+                listing_ts = self._page_backward(symbol, timeframe, cursor, start_ms, timeframe_ms, report)
+                if listing_ts is not None and listing_ts > start_ms:
+                    state['listing_ts'] = listing_ts
+                self._save_state(symbol, timeframe, state)
+
+            # 2) İleriye doğru: son kayıtlı mumdan bitişe
+            if last_ts is not None and last_ts < end_ms:
+                self._page_forward(symbol, timeframe, last_ts, end_ms, report)
+
+            # 3) Aradaki boşluklar
+            self._fill_gaps(symbol, timeframe, start_ms, end_ms, state, report)
+            self._save_state(symbol, timeframe, state)
+
+        except Exception as e:
+            # Yazılan sayfalar depoda kalır, tekrar çalıştırınca devam edilir
+            report['error'] = str(e)
+            print(f"Backfill hatası ({symbol} {timeframe}): {str(e)}")
+
+        report['total'] = self.candle_store.count(symbol, timeframe)
+        report['seconds'] = round(time.monotonic() - started, 2)
+        return report
+
+    def run(self, symbols, timeframes, start, end=None, progress=True):
+        """
+        Tüm (sembol, zaman dilimi) çiftlerini paralel olarak doldurur
+        """
+        jobs = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        reports = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.backfill, symbol, timeframe, start, end): (symbol, timeframe)
+                for symbol, timeframe in jobs
+            }
+            for future in as_completed(futures):
+                report = future.result()
+                reports.append(report)
+                if progress:
+                    status = 'HATA' if report['error'] else 'OK'
+                    print(f"[{len(reports)}/{len(jobs)}] {report['symbol']} {report['timeframe']}: "
+                          f"{report['candles']} yeni mum, {report['requests']} istek, "
+                          f"toplam {report['total']} ({report['seconds']}s) {status}")
+
+        return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Geçmiş OHLCV verisini yerel depoya indirir')
+    parser.add_argument('--symbols', type=str, default=None,
+                        help='Virgülle ayrılmış semboller (varsayılan: önerilen tüm coinler)')
+    parser.add_argument('--timeframes', type=str, default='15m,1h,4h', help='Zaman dilimleri (virgülle ayrılmış)')
+    parser.add_argument('--start', type=str, required=True, help='Başlangıç tarihi (YYYY-MM-DD)')
+    parser.add_argument('--end', type=str, default=None, help='Bitiş tarihi (varsayılan: şimdi)')
+    parser.add_argument('--workers', type=int, default=8, help='Paralel iş sayısı')
+    parser.add_argument('--store', type=str, default=DEFAULT_STORE_DIR, help='Mum deposu klasörü')
+    parser.add_argument('--market', type=str, default='future', help='Piyasa tipi (future/spot)')
+
+    args = parser.parse_args()
+
+    if args.symbols:
+        symbols = args.symbols.split(',')
+    else:
+        from config import RECOMMENDED_COINS
+        symbols = sorted({symbol for coins in RECOMMENDED_COINS.values() for symbol in coins})
+
+    backfill = HistoricalBackfill(
+        exchange=get_exchange('binance', args.market),
+        candle_store=get_candle_store(args.store),
+        max_workers=args.workers
+    )
+    reports = backfill.run(symbols, args.timeframes.split(','), args.start, args.end)
+
+    failed = [f"{r['symbol']} {r['timeframe']}" for r in reports if r['error']]
+    print(f"\nToplam {sum(r['candles'] for r in reports)} mum, {sum(r['requests'] for r in reports)} istek")
+    if failed:
+        print(f"Hatalı işler (tekrar çalıştırınca kaldığı yerden devam eder): {failed}")
+
+
+if __name__ == "__main__":
+    main()
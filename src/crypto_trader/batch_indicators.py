@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+import indicator_graph
+import indicator_kernels as kernels
+from volume_profile import compute_profiles
+import candlestick_patterns
+
+OHLCV_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+# Toplu yolun ürettiği sütunlar: add_indicators seti + SignalGenerator'ın okudukları
+BATCH_INDICATORS = [
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist',
+    'EMA_9', 'EMA_20', 'EMA_50', 'EMA_200',
+    'BB_middle', 'BB_upper', 'BB_lower',
+    'ATR', 'ADX', 'DMP', 'DMN', 'SuperTrend',
+    'StochRSI_K', 'StochRSI_D', 'Volume_MA20'
+]
+
+
+class IndicatorBatch:
+    """
+    N sembolün mumlarını (semboller x sütunlar x zaman) tek bir NumPy dizisinde tutar ve
+    indikatörleri tüm semboller için tek vektörel geçişte hesaplar.
+
+    Sembollerin son mumları sağa hizalanır; geçmişi kısa olan sembollerin başı NaN ile
+    doldurulur ve dolgu bölgesi indikatör pencerelerine girmez. frame(symbol) ilgili
+    sembolün satırlarını kopyasız bir DataFrame görünümü olarak verir.
+    """
+
+    def __init__(self, symbols, timestamps, data, lengths):
+        self.symbols = list(symbols)
+        self.timestamps = timestamps  # (semboller x zaman) int64, dolguda -1
+        self.data = data  # (semboller x sütunlar x zaman)
+        self.lengths = lengths  # sembol başına gerçek mum sayısı
+        self.columns = list(OHLCV_FIELDS)
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_columns(cls, columns_by_symbol, length=None):
+        """
+        columns_by_symbol: {sembol: CandleStore.read çıktısı (sütun -> dizi)}
+        length: tutulacak son mum sayısı (varsayılan: en uzun geçmiş)
+        """
+        items = [(symbol, columns) for symbol, columns in columns_by_symbol.items()
+                 if columns is not None and len(columns['timestamp'])]
+        if length is None:
+            length = max((len(columns['timestamp']) for _, columns in items), default=0)
+
+        width = len(OHLCV_FIELDS) + len(BATCH_INDICATORS)
+        data = np.full((len(items), width, length), np.nan)
+        timestamps = np.full((len(items), length), -1, dtype='int64')
+        lengths = np.zeros(len(items), dtype='int64')
+
+        for i, (_, columns) in enumerate(items):
+            count = min(len(columns['timestamp']), length)
+            lengths[i] = count
+            timestamps[i, length - count:] = columns['timestamp'][-count:]
+            for j, field in enumerate(OHLCV_FIELDS):
+                data[i, j, length - count:] = columns[field][-count:]
+
+        return cls([symbol for symbol, _ in items], timestamps, data, lengths)
+
+    @classmethod
+    def from_frames(cls, frames, length=None):
+        """
+        frames: {sembol: OHLCV DataFrame (DatetimeIndex)}
+        """
+        columns_by_symbol = {}
+        for symbol, df in frames.items():
+            if df is None or len(df) == 0:
+                continue
+            columns = {field: df[field].to_numpy(dtype='float64') for field in OHLCV_FIELDS}
+            columns['timestamp'] = df.index.asi8 // 1_000_000
+            columns_by_symbol[symbol] = columns
+        return cls.from_columns(columns_by_symbol, length)
+
+    @classmethod
+    def from_store(cls, candle_store, symbols, timeframe, limit=1000):
+        """
+        Yerel mum deposundan (ağ çağrısı yapmadan) toplu küme kurar
+        """
+        return cls.from_columns(
+            {symbol: candle_store.read(symbol, timeframe, limit=limit) for symbol in symbols},
+            limit
+        )
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _field(self, name):
+        return self.data[:, self.columns.index(name), :]
+
+    def _set(self, name, values):
+        self.data[:, self.columns.index(name), :] = values
+
+    def compute(self):
+        """
+        BATCH_INDICATORS sütunlarını tüm semboller için hesaplar (add_indicators ile aynı tanımlar)
+        """
+        self.columns = OHLCV_FIELDS + BATCH_INDICATORS
+        high, low, close, volume = (self._field(name) for name in ('high', 'low', 'close', 'volume'))
+
+        rsi = kernels.rsi(close)
+        self._set('RSI', rsi)
+
+        for name, values in zip(['MACD', 'MACD_Signal', 'MACD_Hist'], kernels.macd(close)):
+            self._set(name, values)
+
+        for span in (9, 20, 50, 200):
+            self._set(f'EMA_{span}', kernels.ema(close, span))
+
+        for name, values in zip(['BB_middle', 'BB_upper', 'BB_lower'], kernels.bollinger_bands(close)):
+            self._set(name, values)
+
+        self._set('ATR', kernels.atr(high, low, close))
+        for name, values in zip(['ADX', 'DMP', 'DMN'], kernels.adx(high, low, close)):
+            self._set(name, values)
+
+        self._set('SuperTrend', kernels.supertrend(high, low, close))
+
+        for name, values in zip(['StochRSI_K', 'StochRSI_D'], kernels.stoch_rsi(rsi)):
+            self._set(name, values)
+
+        self._set('Volume_MA20', kernels.rolling_mean(volume, 20))
+        return self
+
+    def latest(self, name):
+        """
+        Tüm sembollerin son mumdaki değeri (semboller sırasıyla)
+        """
+        return self._field(name)[:, -1]
+
+    def volume_profiles(self, lookback=100, bins=50, bin_size=None):
+        """
+        Tüm semboller için hacim profili seviyeleri: {sembol: {'poc', 'vah', 'val', 'hvn', 'lvn'}}.
+        Dolgu (NaN) mumları profile hacim eklemez.
+        """
+        fields = [self._field(name)[:, -lookback:] for name in ('high', 'low', 'close', 'volume')]
+        profiles = compute_profiles(*fields, lookback=lookback, bins=bins, bin_size=bin_size)
+        return dict(zip(self.symbols, profiles))
+
+    def patterns(self, names=candlestick_patterns.PATTERNS, latest_only=False):
+        """
+        Tüm semboller için mum formasyonları: {isim: (semboller x zaman) boolean dizi}.
+        latest_only=True ise sadece son mum: {isim: sembol başına boolean dizi}
+        """
+        fields = [self._field(name) for name in ('open', 'high', 'low', 'close')]
+        if latest_only:
+            return candlestick_patterns.latest(*fields, names=names)
+        return candlestick_patterns.patterns(*fields, names=names)
+
+    def frame(self, symbol):
+        """
+        Sembolün OHLCV + indikatör satırları; veri toplu diziyle paylaşılır (kopyasız).
+        İndikatör grafı bu sütunları güncel kabul eder, yeniden hesaplamaz.
+        """
+        i = self._positions[symbol]
+        start = self.data.shape[-1] - self.lengths[i]
+        index = pd.DatetimeIndex(self.timestamps[i, start:].astype('datetime64[ms]').astype('datetime64[ns]'),
+                                 name='timestamp')
+
+        df = pd.DataFrame(self.data[i, :len(self.columns), start:].T, index=index,
+                          columns=self.columns, copy=False)
+        indicator_graph.mark_fresh(df, self.columns[len(OHLCV_FIELDS):])
+        return df
+
+    def frames(self):
+        return {symbol: self.frame(symbol) for symbol in self.symbols}
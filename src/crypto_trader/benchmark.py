@@ -0,0 +1,237 @@
+import argparse
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import indicator_graph
+from candle_store import CandleStore
+from data_collector import DataCollector
+from async_data_collector import AsyncDataCollector
+from exchange_replay import install_recorder, ReplayExchange, AsyncReplayExchange
+from request_coalescer import RequestCoalescer
+from request_scheduler import RequestScheduler, WEIGHT_LIMITS
+
+
+def _summary(durations):
+    durations = np.asarray(durations) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(durations, 50)), 2),
+        'p95_ms': round(float(np.percentile(durations, 95)), 2),
+        'max_ms': round(float(durations.max()), 2)
+    }
+
+
+def record(path, symbols, timeframes, default_type='future'):
+    """
+    Canlı borsaya karşı veri hattını bir kez çalıştırır ve tüm çağrıları kaydeder.
+    Oynatma koşularıyla aynı şekilde boş depo ve önbellekle başlar: kaydedilen
+    fetch_ohlcv çağrıları artımlı değil, tam çerçevelerdir.
+    """
+    exchange = install_recorder(path, 'binance', default_type)
+    store_dir = tempfile.mkdtemp(prefix='bench_record_')
+    try:
+        collector = _make_collector(DataCollector, exchange, timeframes, store_dir, default_type)
+
+        for symbol in symbols:
+            collector.get_multi_timeframe_data(symbol)
+            collector.get_current_price(symbol)
+            collector.get_market_info(symbol)
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+    print(f"Kayıt tamamlandı: {path}")
+
+
+def _make_collector(collector_class, exchange, timeframes, store_dir, default_type):
+    # Her koşu boş depo, boş önbellek ve tam kova ile başlar: koşular birbirini etkilemez
+    scheduler = RequestScheduler(WEIGHT_LIMITS.get(('binance', default_type), 1200))
+    return collector_class(
+        timeframes=timeframes,
+        candle_store=CandleStore(store_dir),
+        exchange=exchange,
+        coalescer=RequestCoalescer(),
+        scheduler=scheduler
+    )
+
+
+def replay_run(path, symbols, timeframes, default_type='future', **replay_options):
+    exchange = ReplayExchange(path, default_type=default_type, **replay_options)
+    store_dir = tempfile.mkdtemp(prefix='bench_candles_')
+    try:
+        collector = _make_collector(DataCollector, exchange, timeframes, store_dir, default_type)
+        durations = []
+        started = time.perf_counter()
+        for symbol in symbols:
+            symbol_started = time.perf_counter()
+            collector.get_multi_timeframe_data(symbol)
+            collector.get_current_price(symbol)
+            durations.append(time.perf_counter() - symbol_started)
+        total = time.perf_counter() - started
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+    return total, durations, exchange.stats
+
+
+async def _replay_run_async(path, symbols, timeframes, default_type='future', **replay_options):
+    exchange = AsyncReplayExchange(path, default_type=default_type, **replay_options)
+    store_dir = tempfile.mkdtemp(prefix='bench_candles_')
+    try:
+        collector = _make_collector(AsyncDataCollector, exchange, timeframes, store_dir, default_type)
+        durations = []
+
+        async def run_symbol(symbol):
+            symbol_started = time.perf_counter()
+            await collector.get_multi_timeframe_data(symbol)
+            await collector.get_current_price(symbol)
+            durations.append(time.perf_counter() - symbol_started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[run_symbol(symbol) for symbol in symbols])
+        total = time.perf_counter() - started
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+    return total, durations, exchange.stats
+
+
+def replay(path, symbols, timeframes, runs=5, use_async=False, default_type='future', **replay_options):
+    """
+    Kaydı `runs` kez oynatır ve süre istatistiklerini döndürür
+    """
+    totals = []
+    durations = []
+    stats = None
+
+    for _ in range(runs):
+        if use_async:
+            total, run_durations, stats = asyncio.run(
+                _replay_run_async(path, symbols, timeframes, default_type, **replay_options)
+            )
+        else:
+            total, run_durations, stats = replay_run(path, symbols, timeframes, default_type, **replay_options)
+        totals.append(total)
+        durations.extend(run_durations)
+
+    return {
+        'mode': 'async' if use_async else 'sync',
+        'runs': runs,
+        'symbols': len(symbols),
+        'timeframes': timeframes,
+        'replay_options': replay_options,
+        'run_total': _summary(totals),
+        'per_symbol': _summary(durations),
+        'exchange': stats
+    }
+
+
+def _synthetic_frame(rows, seed):
+    """
+    Rastgele yürüyüşlü OHLCV çerçevesi (indikatör ölçümleri için)
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.005, rows)) * close
+    index = pd.date_range('2024-01-01', periods=rows, freq='h', name='timestamp')
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.uniform(100, 1000, rows)
+    }, index=index)
+
+
+def indicators(rows=1000, runs=50, seed=42):
+    """
+    Varsayılan indikatör seti: düğüm düğüm pandas grafı ile birleşik çekirdek
+    (DataCollector.add_indicators) karşılaştırması. Her koşu boş önbellekli kopyayla başlar.
+    """
+    base = _synthetic_frame(rows, seed)
+    graph_durations = []
+    fused_durations = []
+
+    for _ in range(runs):
+        graph_frame = base.copy()
+        started = time.perf_counter()
+        indicator_graph.ensure(graph_frame, indicator_graph.DEFAULT_INDICATORS)
+        graph_durations.append(time.perf_counter() - started)
+
+        fused_frame = base.copy()
+        started = time.perf_counter()
+        indicator_graph.ensure_default(fused_frame)
+        fused_durations.append(time.perf_counter() - started)
+
+    # İki yolun aynı sonucu verdiğini doğrula (son koşunun çerçeveleri)
+    max_diff = 0.0
+    for column in indicator_graph.DEFAULT_INDICATORS:
+        expected = graph_frame[column].to_numpy()
+        actual = fused_frame[column].to_numpy()
+        if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+            raise AssertionError(f"{column}: NaN konumları farklı")
+        scale = np.maximum(np.abs(expected), 1.0)
+        max_diff = max(max_diff, float(np.nanmax(np.abs(expected - actual) / scale, initial=0.0)))
+
+    graph_summary = _summary(graph_durations)
+    fused_summary = _summary(fused_durations)
+    return {
+        'mode': 'indicators',
+        'rows': rows,
+        'runs': runs,
+        'graph': graph_summary,
+        'fused': fused_summary,
+        'speedup_p50': round(graph_summary['p50_ms'] / max(fused_summary['p50_ms'], 1e-6), 2),
+        'max_relative_diff': max_diff
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kayıt/oynatma ile veri hattı performans ölçümü')
+    parser.add_argument('mode', choices=['record', 'replay', 'indicators'])
+    parser.add_argument('--recording', type=str, default='data/recordings/session.jsonl', help='Kayıt dosyası')
+    parser.add_argument('--symbols', type=str, default='BTCUSDT,ETHUSDT,BNBUSDT', help='Virgülle ayrılmış semboller')
+    parser.add_argument('--timeframes', type=str, default='15m,1h,4h', help='Zaman dilimleri (virgülle ayrılmış)')
+    parser.add_argument('--market', type=str, default='future', help='Piyasa tipi (future/spot)')
+    parser.add_argument('--runs', type=int, default=5, help='Oynatma tekrar sayısı')
+    parser.add_argument('--latency', type=float, default=0.0, help='Çağrı başına gecikme (saniye)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Gecikme sapması (saniye)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Hata enjeksiyon olasılığı (0-1)')
+    parser.add_argument('--seed', type=int, default=42, help='Rastgelelik tohumu')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='AsyncDataCollector ile ölç')
+    parser.add_argument('--rows', type=int, default=1000, help='indicators modunda mum sayısı')
+    parser.add_argument('--json', type=str, default=None, help='Sonucu bu dosyaya yaz (sürümler arası karşılaştırma)')
+
+    args = parser.parse_args()
+    symbols = args.symbols.split(',')
+    timeframes = args.timeframes.split(',')
+
+    if args.mode == 'record':
+        record(args.recording, symbols, timeframes, args.market)
+        return
+
+    if args.mode == 'indicators':
+        result = indicators(rows=args.rows, runs=args.runs, seed=args.seed)
+    else:
+        result = replay(
+            args.recording, symbols, timeframes,
+            runs=args.runs,
+            use_async=args.use_async,
+            default_type=args.market,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=args.seed
+        )
+    print(json.dumps(result, indent=2))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
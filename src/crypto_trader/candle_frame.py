@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+LEVELS_KEY = 'levels'
+
+
+class SnapshotLevels:
+    """
+    Çerçevenin son mumuna ait skaler seviyeler (pivot, destek/direnç, hacim profili).
+    Her satıra yayınlanmak yerine çerçeve başına bir kez tutulur.
+    hvn/lvn: yüksek/düşük hacimli fiyat düğümleri (tuple)
+    """
+
+    __slots__ = ('pivot', 'r1', 'r2', 'r3', 's1', 's2', 's3', 'poc', 'vah', 'val', 'hvn', 'lvn')
+
+    def __init__(self, pivot=np.nan, r1=np.nan, r2=np.nan, r3=np.nan,
+                 s1=np.nan, s2=np.nan, s3=np.nan, poc=np.nan, vah=np.nan, val=np.nan, hvn=(), lvn=()):
+        self.pivot = pivot
+        self.r1 = r1
+        self.r2 = r2
+        self.r3 = r3
+        self.s1 = s1
+        self.s2 = s2
+        self.s3 = s3
+        self.poc = poc
+        self.vah = vah
+        self.val = val
+        self.hvn = tuple(hvn)
+        self.lvn = tuple(lvn)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        values = ', '.join(f"{name}={getattr(self, name):.6g}" for name in self.__slots__[:10])
+        return f"SnapshotLevels({values}, hvn={len(self.hvn)}, lvn={len(self.lvn)})"
+
+
+def pivot_levels(high, low, close):
+    """
+    Klasik pivot noktası ve R1-R3 / S1-S3 seviyeleri (son mumun high/low/close değerlerinden)
+    """
+    pivot = (high + low + close) / 3
+    return {
+        'pivot': pivot,
+        'r1': 2 * pivot - low,
+        'r2': pivot + (high - low),
+        'r3': high + 2 * (pivot - low),
+        's1': 2 * pivot - high,
+        's2': pivot - (high - low),
+        's3': low - 2 * (high - pivot)
+    }
+
+
+def get_levels(df):
+    """
+    DataFrame'e iliştirilmiş SnapshotLevels (yoksa boş)
+    """
+    return df.attrs.get(LEVELS_KEY) or SnapshotLevels()
+
+
+def update_levels(df, **values):
+    """
+    Seviyeleri günceller. Kopyalar aynı nesneyi paylaşabileceği için yerinde
+    değiştirilmez, yeni bir SnapshotLevels iliştirilir.
+    """
+    levels = SnapshotLevels(**{**get_levels(df).as_dict(), **values})
+    df.attrs = {**df.attrs, LEVELS_KEY: levels}
+    return levels
+
+
+class CandleFrame:
+    """
+    Sembol/zaman dilimi başına kompakt mum kabı.
+
+    Sayısal sütunlar tek bir (sütunlar x satırlar) C-sıralı blokta tutulur: her sütun
+    bitişik bir satırdır ve blok, pandas'ın iç blok düzeniyle aynı olduğundan
+    to_pandas() veriyi kopyalamadan DataFrame görünümü döndürür. float32 seçeneği
+    belleği yarıya indirir; skaler seviyeler satırlara yayınlanmaz, SnapshotLevels'ta tutulur.
+    """
+
+    def __init__(self, timestamps, columns, dtype='float32', levels=None, attrs=None, spare_columns=4):
+        self.dtype = np.dtype(dtype)
+        self.timestamps = np.ascontiguousarray(timestamps, dtype='int64')
+        self.levels = levels or SnapshotLevels()
+        self.attrs = dict(attrs or {})  # pandas görünümüne aktarılan diğer meta veriler
+        self.names = []
+
+        # Sonradan eklenecek sütunlar için yedek satır: her eklemede blok kopyalanmaz
+        self._block = np.empty((len(columns) + spare_columns, len(self.timestamps)), dtype=self.dtype)
+        for name, values in columns.items():
+            self.set_column(name, values)
+
+    @classmethod
+    def from_frame(cls, df, dtype='float32', columns=None, levels=None):
+        """
+        DatetimeIndex'li DataFrame'den kurar; sayısal olmayan sütunlar alınmaz
+        """
+        names = columns or [name for name in df.columns if pd.api.types.is_numeric_dtype(df[name])]
+        timestamps = df.index.asi8 // 1_000_000 if isinstance(df.index, pd.DatetimeIndex) else np.arange(len(df))
+        attrs = {key: value for key, value in df.attrs.items() if key != LEVELS_KEY}
+        return cls(timestamps, {name: df[name].to_numpy() for name in names}, dtype,
+                   levels or df.attrs.get(LEVELS_KEY), attrs)
+
+    @classmethod
+    def from_columns(cls, columns, dtype='float32'):
+        """
+        CandleStore.read çıktısından (sütun -> dizi) kurar
+        """
+        return cls(columns['timestamp'],
+                   {name: values for name, values in columns.items() if name != 'timestamp'}, dtype)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __getitem__(self, name):
+        """
+        Sütunun bitişik tampon görünümü
+        """
+        return self._block[self.names.index(name)]
+
+    def set_column(self, name, values):
+        values = np.asarray(values)
+        if values.shape != (len(self),):
+            raise ValueError(f"{name} sütunu {len(self)} satır olmalı, {values.shape} verildi")
+
+        if name in self.names:
+            self._block[self.names.index(name)] = values
+            return
+
+        if len(self.names) == len(self._block):
+            # Yedek satırlar doldu: bloğu iki katına büyüt
+            grown = np.empty((max(2 * len(self._block), 1), len(self)), dtype=self.dtype)
+            grown[:len(self.names)] = self._block[:len(self.names)]
+            self._block = grown
+
+        self._block[len(self.names)] = values
+        self.names.append(name)
+
+    def last(self, name):
+        return float(self[name][-1])
+
+    @property
+    def nbytes(self):
+        return self._block[:len(self.names)].nbytes + self.timestamps.nbytes
+
+    def to_pandas(self):
+        """
+        Eski kod için kopyasız DataFrame görünümü. Seviyeler attrs['levels'] içindedir.
+        Görünümde var olan sütunların yerinde değiştirilmesi bu kaba yansır.
+        """
+        index = pd.DatetimeIndex(self.timestamps.astype('datetime64[ms]').astype('datetime64[ns]'),
+                                 name='timestamp')
+        df = pd.DataFrame(self._block[:len(self.names)].T, index=index, columns=list(self.names), copy=False)
+        df.attrs = {**self.attrs, LEVELS_KEY: self.levels}
+        return df
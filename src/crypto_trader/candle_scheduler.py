@@ -0,0 +1,243 @@
+import asyncio
+import heapq
+import itertools
+import time
+import zlib
+
+TIMEFRAME_UNITS_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+# Binance haftalık mumları pazartesi başlar; epoch (1970-01-01) perşembedir
+WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def timeframe_to_ms(timeframe):
+    """
+    '15m', '4h', '1d', '1w' gibi zaman dilimlerinin süresi (ms)
+    """
+    unit = timeframe[-1]
+    if unit not in TIMEFRAME_UNITS_MS:
+        raise ValueError(f"Desteklenmeyen zaman dilimi: {timeframe}")
+    return int(timeframe[:-1]) * TIMEFRAME_UNITS_MS[unit]
+
+
+def next_close(timeframe, now_ms):
+    """
+    now_ms'den sonraki ilk mum kapanışı (UTC'ye hizalı)
+    """
+    period = timeframe_to_ms(timeframe)
+    offset = WEEK_OFFSET_MS if timeframe.endswith('w') else 0
+    return ((now_ms - offset) // period + 1) * period + offset
+
+
+class _Subscription:
+    __slots__ = ('symbol', 'timeframe', 'every', 'load', 'evaluate', 'offset_ms',
+                 'generation', 'last_timestamp', 'retries')
+
+    def __init__(self, symbol, timeframe, every, load, evaluate, offset_ms, generation):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.every = every  # uyanma periyodu (varsayılan: zaman diliminin kendisi)
+        self.load = load
+        self.evaluate = evaluate
+        self.offset_ms = offset_ms
+        self.generation = generation
+        self.last_timestamp = None
+        self.retries = 0
+
+
+class CandleScheduler:
+    """
+    (sembol, zaman dilimi) abonelikleri için mum kapanışına hizalı değerlendirme zamanlayıcısı.
+
+    Her abonelik bir heap'te bir sonraki kapanış anıyla tutulur; döngü sadece en yakın
+    kapanışta uyanır. Uyanınca load(symbol, timeframe) ile veri çekilir ve son mumun zaman
+    damgası öncekiyle aynıysa (borsa yeni mumu henüz yayınlamadıysa) değerlendirme atlanıp
+    kısa süre sonra yeniden denenir; değiştiyse evaluate(symbol, timeframe, veri) çağrılır.
+    Aynı anda kapanan abonelikler, anahtar başına sabit bir gecikmeyle `stagger_ms`
+    aralığına yayılır: rate-limit kullanımı kapanış anında yığılmaz.
+
+    load: async (symbol, timeframe) -> (sürüm, veri) veya None; sürüm genelde son mumun
+          zaman damgasıdır, aynı sürüm için değerlendirme yapılmaz
+    evaluate: (symbol, timeframe, veri) -> herhangi bir şey (coroutine de olabilir)
+    """
+
+    def __init__(self, clock=None, close_delay_ms=2000, stagger_ms=10_000, retry_ms=5000, max_retries=6):
+        self.clock = clock or (lambda: int(time.time() * 1000))
+        self.close_delay_ms = close_delay_ms  # borsanın kapanan mumu yayınlaması için pay
+        self.stagger_ms = stagger_ms
+        self.retry_ms = retry_ms
+        self.max_retries = max_retries
+
+        self._subscriptions = {}
+        self._heap = []  # (zaman, sıra, anahtar, nesil)
+        self._sequence = itertools.count()
+        self._generations = itertools.count()
+        self._changed = None
+        self._running = False
+        self._tasks = set()
+        self._active = set()  # değerlendirmesi süren anahtarlar
+
+        self.stats = {'wakeups': 0, 'evaluated': 0, 'skipped': 0, 'retries': 0, 'errors': 0}
+
+    def _offset(self, symbol, timeframe):
+        # hash() süreçler arasında değişir; crc32 her çalıştırmada aynı dağılımı verir
+        return self.close_delay_ms + zlib.crc32(f"{symbol}|{timeframe}".encode()) % max(self.stagger_ms, 1)
+
+    def _push(self, key, due_ms):
+        subscription = self._subscriptions[key]
+        heapq.heappush(self._heap, (due_ms, next(self._sequence), key, subscription.generation))
+        if self._changed is not None:
+            self._changed.set()
+
+    def _next_due(self, subscription, now_ms):
+        return next_close(subscription.every, now_ms) + subscription.offset_ms
+
+    def subscribe(self, symbol, timeframe, load, evaluate, immediate=True, every=None):
+        """
+        Aboneliği ekler (varsa yeniler, son sürüm korunur). immediate=True ise ilk
+        değerlendirme hemen yapılır, sonrakiler mum kapanışlarında. every verilirse
+        (ör. açık pozisyon takibi için '1m') uyanmalar o zaman diliminin kapanışlarındadır.
+        """
+        key = (symbol, timeframe)
+        previous = self._subscriptions.get(key)
+        subscription = _Subscription(symbol, timeframe, every or timeframe, load, evaluate,
+                                     self._offset(symbol, timeframe), next(self._generations))
+        if previous is not None:
+            subscription.last_timestamp = previous.last_timestamp
+        self._subscriptions[key] = subscription
+
+        now = self.clock()
+        self._push(key, now if immediate else self._next_due(subscription, now))
+        return key
+
+    def unsubscribe(self, symbol, timeframe=None):
+        """
+        Sembolün (timeframe verilmezse tüm zaman dilimlerinin) aboneliğini kaldırır.
+        Heap'teki eski kayıtlar uyanınca atlanır.
+        """
+        removed = [key for key in self._subscriptions
+                   if key[0] == symbol and (timeframe is None or key[1] == timeframe)]
+        for key in removed:
+            del self._subscriptions[key]
+        return removed
+
+    def subscriptions(self):
+        return list(self._subscriptions)
+
+    def next_wakeup(self):
+        """
+        Geçerli ilk kaydın zamanı (ms), yoksa None
+        """
+        while self._heap:
+            due, _, key, generation = self._heap[0]
+            subscription = self._subscriptions.get(key)
+            if subscription is not None and subscription.generation == generation:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now_ms):
+        due_keys = []
+        while self.next_wakeup() is not None and self._heap[0][0] <= now_ms:
+            _, _, key, _ = heapq.heappop(self._heap)
+            due_keys.append(key)
+        return due_keys
+
+    async def _run_job(self, subscription):
+        key = (subscription.symbol, subscription.timeframe)
+        try:
+            loaded = await subscription.load(subscription.symbol, subscription.timeframe)
+            if self._subscriptions.get(key) is not subscription:
+                return  # beklerken abonelik kaldırıldı veya yenilendi
+
+            now = self.clock()
+            timestamp, data = loaded if loaded is not None else (None, None)
+
+            if timestamp is None or timestamp == subscription.last_timestamp:
+                # Yeni mum henüz yok: kısa süre sonra tekrar dene, sınır aşılırsa sonraki kapanışı bekle
+                self.stats['skipped'] += 1
+                at_close = subscription.every == subscription.timeframe
+                if at_close and subscription.last_timestamp is not None and subscription.retries < self.max_retries:
+                    subscription.retries += 1
+                    self.stats['retries'] += 1
+                    self._push(key, now + self.retry_ms)
+                else:
+                    subscription.retries = 0
+                    self._push(key, self._next_due(subscription, now))
+                return
+
+            subscription.last_timestamp = timestamp
+            subscription.retries = 0
+            self._push(key, self._next_due(subscription, now))
+
+            result = subscription.evaluate(subscription.symbol, subscription.timeframe, data)
+            if asyncio.iscoroutine(result):
+                await result
+            self.stats['evaluated'] += 1
+
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"Zamanlanmış değerlendirme hatası ({subscription.symbol} {subscription.timeframe}): {str(e)}")
+            if self._subscriptions.get(key) is subscription:
+                self._push(key, self._next_due(subscription, self.clock()))
+
+        finally:
+            self._active.discard(key)
+
+    def run_due(self, now_ms=None):
+        """
+        Zamanı gelmiş abonelikler için görev başlatır; başlatılan görevleri döndürür
+        """
+        now_ms = self.clock() if now_ms is None else now_ms
+        tasks = []
+        for key in self._pop_due(now_ms):
+            subscription = self._subscriptions[key]
+            if key in self._active:
+                # Önceki değerlendirme sürüyor: bir sonraki kapanışa bırak
+                self._push(key, self._next_due(subscription, now_ms))
+                continue
+
+            self._active.add(key)
+            task = asyncio.create_task(self._run_job(subscription))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            tasks.append(task)
+
+        if tasks:
+            self.stats['wakeups'] += 1
+        return tasks
+
+    async def run(self):
+        """
+        Zamanlayıcı döngüsü: en yakın kapanışa kadar uyur, abonelik değişince erken uyanır
+        """
+        self._changed = asyncio.Event()
+        self._running = True
+        try:
+            while self._running:
+                self._changed.clear()
+                self.run_due()
+
+                due = self.next_wakeup()
+                timeout = None if due is None else max(due - self.clock(), 0) / 1000
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._running = False
+            self._changed = None
+
+    def stop(self):
+        self._running = False
+        if self._changed is not None:
+            self._changed.set()
+
+    def metrics(self):
+        due = self.next_wakeup()
+        return {
+            'subscriptions': len(self._subscriptions),
+            'next_wakeup_in_ms': None if due is None else max(due - self.clock(), 0),
+            'running_jobs': len(self._tasks),
+            **self.stats
+        }
@@ -0,0 +1,246 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+DEFAULT_STORE_DIR = os.path.join('data', 'candles')
+
+# Bu kadar ek segment birikince bölüm tek dosya setine sıkıştırılır
+MAX_SEGMENTS = 32
+# Bellekte tutulan en fazla bölüm sayısı (en uzun süre kullanılmayan atılır)
+MAX_CACHED_PARTITIONS = 256
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_candle_store(base_dir=DEFAULT_STORE_DIR):
+    """
+    Aynı dizin için süreç genelinde tek bir CandleStore döndürür
+    """
+    with _stores_lock:
+        store = _stores.get(base_dir)
+        if store is None:
+            store = CandleStore(base_dir)
+            _stores[base_dir] = store
+        return store
+
+
+class CandleStore:
+    """
+    OHLCV mumlarını sembol/zaman dilimi bazında diskte saklar.
+
+    Her bölüm (partition) ayrı bir klasördür ve her sütun kendi .npy
+    dosyasında tutulur: data/candles/BTC_USDT/1h/close.npy gibi.
+    Yazmalar bölümü baştan yazmaz: yeni satırlar segment_00000001.npy gibi ek
+    dosyalara eklenir, MAX_SEGMENTS ek birikince bölüm sıkıştırılır. Okumalar bellek
+    içi kopyadan yapılır; bellekte en fazla `max_cached` bölüm tutulur.
+    """
+
+    def __init__(self, base_dir=DEFAULT_STORE_DIR, max_cached=MAX_CACHED_PARTITIONS):
+        self.base_dir = base_dir
+        self.max_cached = max_cached
+        self._cache = OrderedDict()  # (symbol, timeframe) -> {sütun: np.ndarray}
+        self._segments = {}  # (symbol, timeframe) -> diskteki son ek segmentin numarası
+        self._lock = threading.RLock()
+
+    def _partition_dir(self, symbol, timeframe):
+        safe_symbol = symbol.replace('/', '_').replace(':', '_')
+        return os.path.join(self.base_dir, safe_symbol, timeframe)
+
+    def _segment_paths(self, path):
+        if not os.path.isdir(path):
+            return []
+        names = sorted(name for name in os.listdir(path)
+                       if name.startswith('segment_') and name.endswith('.npy') and '.tmp' not in name)
+        return [os.path.join(path, name) for name in names]
+
+    def _remember(self, key, columns, segments):
+        self._cache[key] = columns
+        self._cache.move_to_end(key)
+        self._segments[key] = segments
+        while len(self._cache) > self.max_cached:
+            evicted, _ = self._cache.popitem(last=False)
+            self._segments.pop(evicted, None)
+
+    def _read_partition(self, symbol, timeframe):
+        """
+        Bölümü önce bellekten, yoksa diskten (ana dosyalar + ek segmentler) okur
+        """
+        key = (symbol, timeframe)
+        columns = self._cache.get(key)
+        if columns is not None:
+            self._cache.move_to_end(key)
+            return columns
+
+        path = self._partition_dir(symbol, timeframe)
+        segment_paths = self._segment_paths(path)
+        has_base = os.path.exists(os.path.join(path, 'timestamp.npy'))
+        if not has_base and not segment_paths:
+            return None
+
+        try:
+            columns = None
+            if has_base:
+                columns = {
+                    name: np.load(os.path.join(path, f'{name}.npy'))
+                    for name in OHLCV_COLUMNS
+                }
+            # Segmentler yazıldıkları sırayla uygulanır: aynı mumda en yeni kayıt kalır
+            for segment_path in segment_paths:
+                new = self._columns_from_rows(np.load(segment_path))
+                columns = self._sort_unique(new) if columns is None else self._merge(columns, new)
+        except Exception as e:
+            print(f"Mum deposu okuma hatası ({symbol} {timeframe}): {str(e)}")
+            return None
+
+        # Numaralandırma en büyük segmentten sürer (yarım kalmış sıkıştırmadan kalanlar dahil)
+        last_segment = int(os.path.basename(segment_paths[-1])[8:16]) if segment_paths else 0
+        self._remember(key, columns, last_segment)
+        return columns
+
+    def _write_partition(self, symbol, timeframe, columns):
+        """
+        Bölümü tek dosya setine yazar (sıkıştırma) ve ek segmentleri siler
+        """
+        path = self._partition_dir(symbol, timeframe)
+        os.makedirs(path, exist_ok=True)
+
+        for name in OHLCV_COLUMNS:
+            # Yarım kalan yazma bölümü bozmasın diye önce geçici dosyaya yaz
+            tmp_path = os.path.join(path, f'{name}.tmp.npy')
+            np.save(tmp_path, columns[name])
+            os.replace(tmp_path, os.path.join(path, f'{name}.npy'))
+
+        # Segmentlerin içeriği artık ana dosyalarda; silme yarıda kalırsa tekrar uygulanmaları zararsız
+        for segment_path in self._segment_paths(path):
+            os.remove(segment_path)
+
+        self._remember((symbol, timeframe), columns, 0)
+
+    def _append_segment(self, symbol, timeframe, rows, columns):
+        """
+        Sadece yeni satırları ek segment olarak yazar
+        """
+        key = (symbol, timeframe)
+        segments = self._segments.get(key, 0) + 1
+        path = self._partition_dir(symbol, timeframe)
+
+        tmp_path = os.path.join(path, f'segment_{segments:08d}.tmp.npy')
+        np.save(tmp_path, rows)
+        os.replace(tmp_path, os.path.join(path, f'segment_{segments:08d}.npy'))
+
+        self._remember(key, columns, segments)
+
+    @staticmethod
+    def _columns_from_rows(rows):
+        columns = {'timestamp': rows[:, 0].astype('int64')}
+        for i, name in enumerate(OHLCV_COLUMNS[1:], start=1):
+            columns[name] = rows[:, i]
+        return columns
+
+    def write(self, symbol, timeframe, ohlcv):
+        """
+        ccxt formatındaki [timestamp, open, high, low, close, volume] satırlarını
+        depoya ekler. Aynı zaman damgalı mumlar yeni gelen veriyle güncellenir.
+        """
+        if ohlcv is None or len(ohlcv) == 0:
+            return 0
+
+        rows = np.asarray(ohlcv, dtype='float64')
+        new = self._columns_from_rows(rows)
+
+        with self._lock:
+            existing = self._read_partition(symbol, timeframe)
+
+            if existing is None or len(existing['timestamp']) == 0:
+                self._write_partition(symbol, timeframe, self._sort_unique(new))
+            elif self._segments.get((symbol, timeframe), 0) >= MAX_SEGMENTS:
+                self._write_partition(symbol, timeframe, self._merge(existing, new))
+            else:
+                self._append_segment(symbol, timeframe, rows[:, :len(OHLCV_COLUMNS)], self._merge(existing, new))
+            return len(new['timestamp'])
+
+    def _merge(self, existing, new):
+        old_ts = existing['timestamp']
+        new_ts = new['timestamp']
+        new_sorted = bool(np.all(np.diff(new_ts) > 0))
+
+        # Hızlı yol: yeni mumlar son kayıtlı mumdan (dahil) sonra başlıyor
+        if new_sorted and new_ts[0] >= old_ts[-1]:
+            keep = len(old_ts) - 1 if new_ts[0] == old_ts[-1] else len(old_ts)
+            return {
+                name: np.concatenate([existing[name][:keep], new[name]])
+                for name in OHLCV_COLUMNS
+            }
+
+        # Genel yol (geçmiş doldurma): birleştir, sırala, tekrarlarda yeniyi tut
+        combined = {
+            name: np.concatenate([existing[name], new[name]])
+            for name in OHLCV_COLUMNS
+        }
+        return self._sort_unique(combined)
+
+    def _sort_unique(self, columns):
+        order = np.argsort(columns['timestamp'], kind='stable')
+        ts = columns['timestamp'][order]
+        # Aynı zaman damgasının son (en yeni) kopyasını tut
+        keep = np.append(ts[1:] != ts[:-1], True)
+        return {name: columns[name][order][keep] for name in OHLCV_COLUMNS}
+
+    def read(self, symbol, timeframe, limit=None, since=None):
+        """
+        Sütunları numpy dizileri olarak döndürür
+        """
+        with self._lock:
+            columns = self._read_partition(symbol, timeframe)
+            if columns is None:
+                return None
+
+            start = 0
+            if since is not None:
+                start = int(np.searchsorted(columns['timestamp'], since, side='left'))
+            if limit is not None:
+                start = max(start, len(columns['timestamp']) - limit)
+
+            return {name: columns[name][start:].copy() for name in OHLCV_COLUMNS}
+
+    def load(self, symbol, timeframe, limit=None, since=None):
+        """
+        Kayıtlı mumları fetch_historical_data ile aynı formatta DataFrame olarak döndürür
+        """
+        columns = self.read(symbol, timeframe, limit=limit, since=since)
+        if columns is None or len(columns['timestamp']) == 0:
+            return None
+
+        df = pd.DataFrame({name: columns[name] for name in OHLCV_COLUMNS[1:]})
+        df.index = pd.to_datetime(columns['timestamp'], unit='ms')
+        df.index.name = 'timestamp'
+        return df
+
+    def last_timestamp(self, symbol, timeframe):
+        """
+        Son kayıtlı mumun zaman damgası (ms), yoksa None
+        """
+        with self._lock:
+            columns = self._read_partition(symbol, timeframe)
+            if columns is None or len(columns['timestamp']) == 0:
+                return None
+            return int(columns['timestamp'][-1])
+
+    def first_timestamp(self, symbol, timeframe):
+        """
+        İlk kayıtlı mumun zaman damgası (ms), yoksa None
+        """
+        with self._lock:
+            columns = self._read_partition(symbol, timeframe)
+            if columns is None or len(columns['timestamp']) == 0:
+                return None
+            return int(columns['timestamp'][0])
+
+    def count(self, symbol, timeframe):
+        with self._lock:
+            columns = self._read_partition(symbol, timeframe)
+            return 0 if columns is None else len(columns['timestamp'])
@@ -0,0 +1,127 @@
+"""
+Mum formasyonları, NumPy dizileriyle.
+
+Tüm fonksiyonlar son eksen zaman olacak şekilde 1D (tek sembol) veya 2D (semboller x zaman)
+dizilerle çalışır ve her mum için boolean maske üretir; geçmişin tamamı tek geçişte,
+en yeni mum ise sadece son üç mumla hesaplanır. NaN (dolgu) mumlarda formasyon oluşmaz.
+
+- hammer: alt fitil gövdenin 2 katından uzun, üst fitil gövdenin yarısından kısa
+- doji: gövde, mum aralığının %10'undan küçük
+- bullish/bearish_engulfing: ters yönlü önceki mumun gövdesini tamamen saran gövde
+- morning/evening_star: büyük gövdeli mum, küçük gövdeli mum, ilk mumun gövde ortasını
+  geçen ters yönlü mum
+"""
+from collections import deque
+import numpy as np
+from indicator_kernels import shift
+
+PATTERNS = ['hammer', 'doji', 'bullish_engulfing', 'bearish_engulfing', 'morning_star', 'evening_star']
+
+# Yön bildiren (dönüş) formasyonları; doji kararsızlıktır, iki listede de yoktur
+BULLISH_PATTERNS = ['hammer', 'bullish_engulfing', 'morning_star']
+BEARISH_PATTERNS = ['bearish_engulfing', 'evening_star']
+
+# Formasyonların geriye baktığı mum sayısı (son mum dahil)
+PATTERN_DEPTH = 3
+
+DOJI_BODY = 0.1
+STAR_BODY = 0.3
+
+
+def _as_float(values):
+    return np.asarray(values, dtype='float64')
+
+
+def patterns(open_, high, low, close, names=PATTERNS):
+    """
+    Her mum için formasyon maskeleri: {isim: boolean dizi}
+    """
+    open_, high, low, close = _as_float(open_), _as_float(high), _as_float(low), _as_float(close)
+    names = set(names)
+
+    body = np.abs(close - open_)
+    body_top = np.maximum(open_, close)
+    body_bottom = np.minimum(open_, close)
+    price_range = high - low
+    bullish = close > open_
+    bearish = close < open_
+
+    result = {}
+    if 'hammer' in names:
+        result['hammer'] = ((body_bottom - low) > body * 2) & ((high - body_top) < body * 0.5)
+
+    if 'doji' in names:
+        result['doji'] = (price_range > 0) & (body <= price_range * DOJI_BODY)
+
+    if names & {'bullish_engulfing', 'bearish_engulfing'}:
+        prev_open, prev_close, prev_body = shift(open_), shift(close), shift(body)
+        engulfs = body > prev_body
+        if 'bullish_engulfing' in names:
+            result['bullish_engulfing'] = (bullish & (prev_close < prev_open) & engulfs &
+                                           (open_ <= prev_close) & (close >= prev_open))
+        if 'bearish_engulfing' in names:
+            result['bearish_engulfing'] = (bearish & (prev_close > prev_open) & engulfs &
+                                           (open_ >= prev_close) & (close <= prev_open))
+
+    if names & {'morning_star', 'evening_star'}:
+        # İlk mum iki önce, yıldız bir önceki mum
+        first_open, first_close, first_body = shift(open_, 2), shift(close, 2), shift(body, 2)
+        first_middle = (first_open + first_close) / 2
+        star = shift(body) < first_body * STAR_BODY
+        if 'morning_star' in names:
+            result['morning_star'] = (first_close < first_open) & star & bullish & (close > first_middle)
+        if 'evening_star' in names:
+            result['evening_star'] = (first_close > first_open) & star & bearish & (close < first_middle)
+
+    return result
+
+
+def latest(open_, high, low, close, names=PATTERNS):
+    """
+    Sadece en yeni mumun formasyonları; son PATTERN_DEPTH mumla hesaplanır.
+    1D girişte {isim: bool}, 2D girişte {isim: sembol başına boolean dizi}
+    """
+    window = slice(-PATTERN_DEPTH, None)
+    masks = patterns(*(_as_float(values)[..., window] for values in (open_, high, low, close)), names=names)
+    return {name: mask[..., -1] if mask.ndim > 1 else bool(mask[-1]) for name, mask in masks.items()}
+
+
+def frame_patterns(df, names=PATTERNS):
+    """
+    DataFrame'in tüm mumları için formasyon maskeleri
+    """
+    return patterns(*(df[name].to_numpy() for name in ('open', 'high', 'low', 'close')), names=names)
+
+
+class PatternTracker:
+    """
+    Tek bir (sembol, zaman dilimi) için mum kapanışlarıyla artımlı formasyon tespiti.
+    Son PATTERN_DEPTH mum tutulur; her kapanış sabit sürede değerlendirilir.
+    """
+
+    def __init__(self, names=PATTERNS):
+        self.names = list(names)
+        self.last_timestamp = None
+        self.current = {name: False for name in self.names}
+        self._candles = deque(maxlen=PATTERN_DEPTH)
+
+    def push(self, candle):
+        """
+        Kapanan mumu ekler ve bu mumun formasyonlarını döndürür; aynı mum ikinci kez gelirse yok sayılır
+        """
+        timestamp = candle.get('timestamp')
+        if timestamp is not None and self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return self.current
+        self.last_timestamp = timestamp
+
+        self._candles.append(tuple(float(candle[name]) for name in ('open', 'high', 'low', 'close')))
+        self.current = latest(*np.array(self._candles).T, names=self.names)
+        return self.current
+
+    def extend(self, columns):
+        """
+        Birden fazla kapanmış mumu işler. columns: CandleStore.read çıktısı
+        """
+        for i in range(len(columns['timestamp'])):
+            self.push({name: columns[name][i] for name in ('timestamp', 'open', 'high', 'low', 'close')})
+        return self
@@ -1,32 +1,440 @@
-import ccxt
 import pandas as pd
 import pandas_ta as ta
 import numpy as np
 from datetime import datetime, timedelta
+from candle_store import get_candle_store
+from exchange_pool import get_exchange
+from request_coalescer import get_coalescer
+from kline_stream import KlineStream
+from ticker_snapshot import get_ticker_snapshot, ticker_to_market_info
+from request_scheduler import get_scheduler_for, PRIORITY_POSITION, PRIORITY_SCAN
+from backfill import HistoricalBackfill, parse_date
+from indicator_engine import IndicatorEngine
+from indicator_kernels import supertrend, flow_indicators, FLOW_INDICATORS, DEFAULT_COLUMNS
+import indicator_graph
+from batch_indicators import IndicatorBatch
+from candle_frame import CandleFrame, pivot_levels, update_levels
+from volume_profile import VolumeProfile, compute_profiles, default_bin_size
+from candlestick_patterns import PatternTracker, PATTERN_DEPTH, PATTERNS, latest as latest_patterns
+from trend_alignment import TrendAlignment, TREND_WINDOW
+
+# Kapanış çerçevesinde mumdan muma taşınan sütunlar; diğerleri ilk erişimde hesaplanır
+CLOSE_FRAME_COLUMNS = ['open', 'high', 'low', 'close', 'volume'] + DEFAULT_COLUMNS + indicator_graph.PATTERN_COLUMNS
 
 class DataCollector:
-    def __init__(self):
-        self.exchange = ccxt.binance({
-            'enableRateLimit': True,
-            'options': {
-                'defaultType': 'future'
-            }
-        })
+    def __init__(self, timeframes=None, candle_store=None, exchange=None, base_timeframe=None, coalescer=None,
+                 scheduler=None, optional_indicators=None, frame_dtype=None):
+        # Paylaşılan borsa istemcisi (bağlantı havuzu ve market bilgisi ortak)
+        self.exchange = exchange or get_exchange('binance', 'future')
+        
+        # Tüm borsa çağrıları merkezi, öncelikli rate-limit zamanlayıcısından geçer
+        self.scheduler = scheduler or get_scheduler_for(self.exchange)
+        self.timeframes = timeframes or ['15m', '1h', '4h']
+        
+        # Verilirse üst zaman dilimleri bu zaman diliminden yeniden örneklenir (ör. '15m')
+        self.base_timeframe = base_timeframe
+        
+        # Aynı (sembol, zaman dilimi, pencere) için eşzamanlı istekler tek çekim paylaşır
+        self.coalescer = coalescer or get_coalescer()
+        
+        # Akış modunda kullanılan kline akışı
+        self.kline_stream = None
+        
+        # Tüm semboller için tek fetch_tickers çağrısıyla doldurulan ticker önbelleği
+        self.ticker_snapshot = get_ticker_snapshot(self.exchange)
+        
+        # Yerel mum deposu (sadece yeni mumlar borsadan çekilir)
+        self.candle_store = candle_store or get_candle_store()
+        
+        # Zaman dilimine göre açılan ek indikatörler, ör. {'1h': ['OBV', 'VWAP'], '4h': ['MFI', 'CMF']}
+        self.optional_indicators = optional_indicators or {}
+        
+        # Son satır indikatörleri için mum başına O(1) güncellenen akış durumu
+        self.indicator_engine = IndicatorEngine()
+        
+        # 'float32' verilirse hazırlanan çerçeveler kompakt CandleFrame görünümü olarak döner
+        self.frame_dtype = frame_dtype
+        
+        # Akış modunda mum kapanışlarıyla artımlı güncellenen hacim profilleri
+        self.volume_profiles = {}  # (sembol, zaman dilimi) -> VolumeProfile
+        self.pattern_trackers = {}  # (sembol, zaman dilimi) -> PatternTracker
+        
+        # Akış kapanışlarında analiz edilen son çerçeve; yeni mum satır olarak eklenir
+        self._close_frames = {}  # (sembol, zaman dilimi) -> DataFrame
+        
+        # Zaman dilimi başına son kapanmış mumun trendi; sadece o zaman diliminin mumu kapanınca yenilenir
+        self.trend_alignment = TrendAlignment(
+            self._closed_closes,
+            lambda timeframe: self.exchange.parse_timeframe(timeframe) * 1000,
+            self.exchange.milliseconds
+        )
+    
+    def fetch_ohlcv_frame(self, symbol, timeframe='1h', limit=1000, priority=PRIORITY_SCAN):
+        """
+        Yerel mum deposunu günceller ve son `limit` mumu DataFrame olarak döndürür.
+        Depoda veri varsa sadece son kayıtlı mumdan sonraki mumlar çekilir.
+        """
+        since = self._incremental_since(symbol, timeframe, limit)
+        ohlcv = self.scheduler.call(
+            self.exchange.fetch_ohlcv, symbol, timeframe, since=since, limit=limit,
+            endpoint='fetch_ohlcv', priority=priority
+        )
+        return self._store_and_load(symbol, timeframe, ohlcv, limit)
+    
+    def _incremental_since(self, symbol, timeframe, limit):
+        """
+        Borsadan hangi zaman damgasından itibaren mum çekileceğini belirler
+        """
+        last_timestamp = self.candle_store.last_timestamp(symbol, timeframe)
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        now_ms = self.exchange.milliseconds()
+        
+        if last_timestamp is None or now_ms - last_timestamp > limit * timeframe_ms:
+            # Depo boş ya da çok eski: son `limit` mumu doğrudan çek
+            return None
+        
+        # Son kayıtlı mum kapanmamış olabilir, onu da tekrar çek
+        return last_timestamp
+    
+    def _store_and_load(self, symbol, timeframe, ohlcv, limit):
+        if ohlcv:
+            self.candle_store.write(symbol, timeframe, ohlcv)
+        
+        return self.candle_store.load(symbol, timeframe, limit=limit)
+    
+    async def stream_klines(self, symbols, timeframes=None, transport=None, on_candle_close=None):
+        """
+        Akış modu: kline olaylarını tüketir, kapanan mumları yerel depoya yazar ve
+        her mum kapanışında on_candle_close(symbol, timeframe, candle) çağrılır.
+        transport verilmezse Binance websocket akışı kullanılır; testlerde
+        FileReplayTransport veya SocketTransport verilebilir.
+        """
+        self.kline_stream = KlineStream(
+            symbols,
+            timeframes or self.timeframes,
+            transport=transport,
+            candle_store=self.candle_store
+        )
+        # İndikatör durumu, hacim profili, formasyonlar ve trend sinyal analizinden önce güncellenir
+        self.kline_stream.add_close_listener(
+            lambda symbol, timeframe, candle: self.sync_indicator_state(symbol, timeframe)
+        )
+        self.kline_stream.add_close_listener(
+            lambda symbol, timeframe, candle: self.sync_volume_profile(symbol, timeframe)
+        )
+        self.kline_stream.add_close_listener(
+            lambda symbol, timeframe, candle: self.sync_candle_patterns(symbol, timeframe)
+        )
+        self.kline_stream.add_close_listener(
+            lambda symbol, timeframe, candle: self.trend_alignment.refresh(symbol, timeframe)
+        )
+        if on_candle_close:
+            self.kline_stream.add_close_listener(on_candle_close)
+        
+        await self.kline_stream.run()
+        return self.kline_stream
+    
+    def get_stream_frame(self, symbol, timeframe, limit=1000, include_live=False):
+        """
+        Borsaya istek atmadan depodaki mumlardan indikatörlü DataFrame üretir.
+        include_live=True ise akıştaki henüz kapanmamış mum da eklenir.
+        """
+        df = self.candle_store.load(symbol, timeframe, limit=limit)
+        if df is None:
+            return None
+        
+        if include_live and self.kline_stream is not None:
+            candle = self.kline_stream.get_live_candle(symbol, timeframe)
+            if candle is not None:
+                timestamp = pd.to_datetime(candle['timestamp'], unit='ms')
+                if timestamp > df.index[-1]:
+                    df.loc[timestamp] = [candle[name] for name in df.columns]
+                    df = df.tail(limit)
+        
+        return self.prepare_timeframe_frame(df, timeframe)
+    
+    def get_close_frame(self, symbol, timeframe, limit=1000):
+        """
+        Mum kapanışında analiz için indikatörlü çerçeve (sadece kapanmış mumlar).
+        Önceki kapanış çerçevesinden sonra tek yeni mum geldiyse satırı indikatör motorunun
+        güncel değerleriyle eklenir, varsayılan set tüm seri için yeniden hesaplanmaz.
+        Formasyon bayrakları (CDL_*) kapanan mumu işlemiş formasyon izleyicisinden alınır.
+        İlk çağrıda veya aradaki mumlar eksikse çerçeve depodan tam hazırlanır.
+        """
+        key = (symbol, timeframe)
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        previous = self._close_frames.get(key)
+        
+        df = None
+        if previous is not None:
+            last_timestamp = int(previous.index[-1].value // 1_000_000)
+            columns = self.candle_store.read(symbol, timeframe, since=last_timestamp + 1)
+            if columns is not None:
+                closed = columns['timestamp'] + timeframe_ms <= self.exchange.milliseconds()
+                columns = {name: values[closed] for name, values in columns.items()}
+                if len(columns['timestamp']) == 0:
+                    df = previous.copy()
+                elif (len(columns['timestamp']) == 1 and
+                      int(columns['timestamp'][0]) == last_timestamp + timeframe_ms and
+                      self.indicator_engine.last_timestamp(symbol, timeframe) == last_timestamp + timeframe_ms):
+                    patterns = self._close_patterns(symbol, timeframe, previous, columns)
+                    df = self._append_close_row(previous, columns, self.indicator_engine.latest(symbol, timeframe),
+                                                patterns, limit)
+        
+        if df is None:
+            df = self.candle_store.load(symbol, timeframe, limit=limit + 1)
+            if df is None:
+                return None
+            df = df[df.index.asi8 // 1_000_000 + timeframe_ms <= self.exchange.milliseconds()].tail(limit)
+            if len(df) == 0:
+                return None
+            indicator_graph.ensure_default(df)
+            indicator_graph.ensure(df, indicator_graph.PATTERN_COLUMNS)
+            df = pd.DataFrame({name: df[name].to_numpy() for name in CLOSE_FRAME_COLUMNS}, index=df.index)
+            indicator_graph.mark_fresh(df, CLOSE_FRAME_COLUMNS[5:])
+        
+        self._close_frames[key] = df
+        return self._finish_close_frame(df.copy(), symbol, timeframe)
+    
+    def _close_patterns(self, symbol, timeframe, previous, columns):
+        """
+        Kapanan mumun formasyonları {isim: bool}: izleyici bu mumu işlediyse ondan,
+        işlemediyse önceki çerçevenin son mumlarıyla
+        """
+        tracker = self.pattern_trackers.get((symbol, timeframe))
+        if tracker is not None and tracker.last_timestamp == int(columns['timestamp'][0]):
+            return tracker.current
+        
+        return latest_patterns(*(
+            np.append(previous[name].to_numpy()[-(PATTERN_DEPTH - 1):], columns[name][:1])
+            for name in ('open', 'high', 'low', 'close')
+        ))
+    
+    def _append_close_row(self, previous, columns, values, patterns, limit):
+        """
+        Önceki kapanış çerçevesine kapanan mumu, motorun değerlerini ve formasyonlarını ekler
+        """
+        row = {name: columns[name][:1] for name in ('open', 'high', 'low', 'close', 'volume')}
+        row.update({name: [values[name]] for name in DEFAULT_COLUMNS})
+        row.update({f'CDL_{name}': [bool(patterns[name])] for name in PATTERNS})
+        index = pd.DatetimeIndex(pd.to_datetime(columns['timestamp'][:1], unit='ms'), name=previous.index.name)
+        
+        df = pd.concat([previous.iloc[-(limit - 1):], pd.DataFrame(row, index=index)])
+        return indicator_graph.mark_fresh(df, CLOSE_FRAME_COLUMNS[5:])
+    
+    def closed_rows(self, df, timeframe):
+        """
+        Çerçevenin süresi dolmuş (kapanmış) mumlarının maskesi
+        """
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        return df.index.asi8 // 1_000_000 + timeframe_ms <= self.exchange.milliseconds()
+    
+    def closed_frame(self, df, symbol, timeframe):
+        """
+        Hazırlanmış çerçeveden henüz kapanmamış son mumu çıkarır. Varsayılan set geçmişe
+        bakan indikatörlerden oluştuğu için korunur; seviyeler ve diğer adımlar kapanmış
+        mumlarla yeniden hesaplanır. Kapanmış mum yoksa None.
+        """
+        closed = self.closed_rows(df, timeframe)
+        if closed.all():
+            return df
+        if not closed.any():
+            return None
+        
+        df = df[closed]
+        names = [name for name in DEFAULT_COLUMNS if name in df.columns]
+        df = pd.DataFrame({name: df[name].to_numpy() for name in CLOSE_FRAME_COLUMNS[:5] + names}, index=df.index)
+        indicator_graph.mark_fresh(df, names)
+        return self._finish_close_frame(df, symbol, timeframe)
+    
+    def _finish_close_frame(self, df, symbol, timeframe):
+        """
+        prepare_timeframe_frame'in varsayılan set dışındaki adımları (ucuz, son pencere üzerinde).
+        Hacim profili, son mumu işlemiş artımlı profilden alınır; yoksa pencereden hesaplanır.
+        """
+        flow_names = [name for name in self.optional_indicators.get(timeframe, []) if name in FLOW_INDICATORS]
+        if flow_names:
+            df = self.add_flow_indicators(df, flow_names)
+        df = self.add_support_resistance(df)
+        profile = self.volume_profiles.get((symbol, timeframe))
+        if profile is not None and profile.last_timestamp == int(df.index[-1].value // 1_000_000):
+            update_levels(df, **profile.levels())
+        else:
+            df = self.add_volume_profile(df)
+        if self.frame_dtype is not None:
+            df = self.compact_frame(df, self.frame_dtype)
+        return indicator_graph.lazy(df)
+    
+    def sync_indicator_state(self, symbol, timeframe, warmup=1000):
+        """
+        Depodaki yeni kapanmış mumları indikatör motoruna işler (sadece eksik mumlar).
+        Durum yoksa son `warmup` mumla kurulur. Dönüş: son kapanan muma ait değerler.
+        """
+        engine = self.indicator_engine
+        last_timestamp = engine.last_timestamp(symbol, timeframe)
+        
+        if last_timestamp is None:
+            columns = self.candle_store.read(symbol, timeframe, limit=warmup)
+        else:
+            columns = self.candle_store.read(symbol, timeframe, since=last_timestamp + 1)
+        if columns is None:
+            return engine.latest(symbol, timeframe)
+        
+        # Süresi dolmamış son mum henüz kapanmadı, duruma işlenmez
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        closed = columns['timestamp'] + timeframe_ms <= self.exchange.milliseconds()
+        columns = {name: values[closed] for name, values in columns.items()}
+        
+        if last_timestamp is None:
+            return engine.warmup(symbol, timeframe, columns)
+        return engine.extend(symbol, timeframe, columns)
+    
+    def sync_volume_profile(self, symbol, timeframe, lookback=100, bins=50):
+        """
+        Depodaki yeni kapanmış mumları sembolün hacim profiline işler.
+        Profil yoksa kutu genişliği son `lookback` mumun aralığından belirlenir.
+        """
+        profile = self.volume_profiles.get((symbol, timeframe))
+        
+        if profile is None:
+            columns = self.candle_store.read(symbol, timeframe, limit=lookback)
+        else:
+            since = None if profile.last_timestamp is None else int(profile.last_timestamp) + 1
+            columns = self.candle_store.read(symbol, timeframe, since=since)
+        if columns is None or len(columns['timestamp']) == 0:
+            return None if profile is None else profile.levels()
+        
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        closed = columns['timestamp'] + timeframe_ms <= self.exchange.milliseconds()
+        columns = {name: values[closed] for name, values in columns.items()}
+        
+        if profile is None:
+            if len(columns['timestamp']) == 0:
+                return None
+            bin_size = float(default_bin_size(columns['high'], columns['low'], bins))
+            profile = VolumeProfile(bin_size, lookback)
+            self.volume_profiles[(symbol, timeframe)] = profile
+        
+        return profile.extend(columns).levels()
+    
+    def get_volume_profile(self, symbol, timeframe):
+        """
+        Artımlı profilin güncel seviyeleri {'poc', 'vah', 'val', 'hvn', 'lvn'}, yoksa None
+        """
+        profile = self.volume_profiles.get((symbol, timeframe))
+        return None if profile is None else profile.levels()
+    
+    def sync_candle_patterns(self, symbol, timeframe):
+        """
+        Depodaki yeni kapanmış mumları sembolün formasyon izleyicisine işler.
+        Dönüş: son kapanan mumun formasyonları {isim: bool}
+        """
+        tracker = self.pattern_trackers.get((symbol, timeframe))
+        
+        if tracker is None:
+            columns = self.candle_store.read(symbol, timeframe, limit=PATTERN_DEPTH + 1)
+        else:
+            since = None if tracker.last_timestamp is None else int(tracker.last_timestamp) + 1
+            columns = self.candle_store.read(symbol, timeframe, since=since)
+        if columns is None or len(columns['timestamp']) == 0:
+            return None if tracker is None else tracker.current
+        
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        closed = columns['timestamp'] + timeframe_ms <= self.exchange.milliseconds()
+        columns = {name: values[closed] for name, values in columns.items()}
+        
+        if tracker is None:
+            if len(columns['timestamp']) == 0:
+                return None
+            tracker = PatternTracker()
+            self.pattern_trackers[(symbol, timeframe)] = tracker
+        
+        return tracker.extend(columns).current
+    
+    def get_candle_patterns(self, symbol, timeframe):
+        """
+        Artımlı izleyicideki son kapanan mumun formasyonları, yoksa None
+        """
+        tracker = self.pattern_trackers.get((symbol, timeframe))
+        return None if tracker is None else tracker.current
+    
+    def _closed_closes(self, symbol, timeframe, limit=TREND_WINDOW):
+        """
+        Son `limit` kapanmış mumun kapanışları ve son kapanmış mumun zaman damgası.
+        Zaman dilimi depoda yoksa temel zaman diliminden türetilir.
+        """
+        columns = self.candle_store.read(symbol, timeframe, limit=limit + 1)
+        if (columns is None or len(columns['timestamp']) == 0) and \
+                timeframe in self.derivable_timeframes([timeframe], self.base_timeframe):
+            df = self.load_resampled_frame(symbol, timeframe, self.base_timeframe, limit=limit + 1)
+            if df is not None:
+                columns = {'timestamp': df.index.asi8 // 1_000_000, 'close': df['close'].to_numpy()}
+        if columns is None:
+            return None
+        
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        closed = columns['timestamp'] + timeframe_ms <= self.exchange.milliseconds()
+        if not closed.any():
+            return None
+        return columns['close'][closed][-limit:], int(columns['timestamp'][closed][-1])
+    
+    def get_trend_alignment(self, symbol, base_timeframe, timeframes=None, base_trend=None):
+        """
+        Temel zaman dilimi trendinin diğer zaman dilimleriyle uyumu (önbellekten).
+        Dönüş: {'trend', 'timeframes': {zaman dilimi: trend}, 'alignment'} veya None
+        """
+        try:
+            return self.trend_alignment.alignment(symbol, base_timeframe, timeframes, base_trend)
+        
+        except Exception as e:
+            print(f"Trend uyumu hesaplama hatası ({symbol} {base_timeframe}): {str(e)}")
+            return None
+    
+    def load_indicator_batch(self, symbols, timeframe, limit=1000):
+        """
+        Depodaki mumlardan tüm semboller için indikatörleri tek vektörel geçişte hesaplar.
+        Dönüş: IndicatorBatch (batch.frame(symbol) ile sembol başına DataFrame görünümü)
+        """
+        try:
+            return IndicatorBatch.from_store(self.candle_store, symbols, timeframe, limit).compute()
+            
+        except Exception as e:
+            print(f"Toplu indikatör hesaplama hatası ({timeframe}): {str(e)}")
+            return None
+    
+    def get_latest_indicators(self, symbol, timeframe, include_live=False):
+        """
+        Varsayılan indikatör setinin son değerleri (add_indicators'ın son satırı),
+        tüm tabloyu yeniden hesaplamadan. include_live=True ise açık mum da dahil edilir.
+        """
+        values = self.sync_indicator_state(symbol, timeframe)
+        if values is None or not include_live:
+            return values
+        
+        candle = None
+        if self.kline_stream is not None:
+            candle = self.kline_stream.get_live_candle(symbol, timeframe)
+        if candle is None:
+            # REST ile çekilen son mum açıksa onu kullan
+            columns = self.candle_store.read(symbol, timeframe, limit=1)
+            last_closed = self.indicator_engine.last_timestamp(symbol, timeframe)
+            if columns is not None and len(columns['timestamp']) and columns['timestamp'][-1] != last_closed:
+                candle = {name: values[-1] for name, values in columns.items()}
+        
+        if candle is None:
+            return values
+        return self.indicator_engine.peek(symbol, timeframe, candle)
     
     def fetch_historical_data(self, symbol, timeframe='1h', limit=1000):
         """
         Belirli bir zaman dilimi için kripto para verilerini çeker ve teknik indikatörleri hesaplar
         """
         try:
-            # OHLCV verilerini çek
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            if len(ohlcv) == 0:
+            # OHLCV verilerini yerel depodan al (sadece yeni mumlar çekilir)
+            df = self.fetch_ohlcv_frame(symbol, timeframe, limit=limit)
+            if df is None or len(df) == 0:
                 print(f"Veri bulunamadı: {symbol} {timeframe}")
                 return None
-                
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
             
             # Teknik indikatörleri hesapla
             try:
@@ -49,30 +457,9 @@ class DataCollector:
         Tüm teknik indikatörleri hesaplar ve ekler
         """
         try:
-            # RSI
-            df['RSI'] = self.calculate_rsi(df)
-            
-            # MACD
-            exp1 = df['close'].ewm(span=12, adjust=False).mean()
-            exp2 = df['close'].ewm(span=26, adjust=False).mean()
-            df['MACD'] = exp1 - exp2
-            df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-            df['MACD_Hist'] = df['MACD'] - df['MACD_Signal']
-            
-            # EMA'lar
-            df['EMA_9'] = df['close'].ewm(span=9, adjust=False).mean()
-            df['EMA_20'] = df['close'].ewm(span=20, adjust=False).mean()
-            df['EMA_50'] = df['close'].ewm(span=50, adjust=False).mean()
-            df['EMA_200'] = df['close'].ewm(span=200, adjust=False).mean()
-            
-            # Bollinger Bands
-            df['BB_middle'] = df['close'].rolling(window=20).mean()
-            std = df['close'].rolling(window=20).std()
-            df['BB_upper'] = df['BB_middle'] + (std * 2)
-            df['BB_lower'] = df['BB_middle'] - (std * 2)
-            
-            # ADX
-            df['ADX'] = self.calculate_adx(df)
+            # Varsayılan set birleşik çekirdekle tek seferde; bu mum sürümünde
+            # hesaplanmış sütunlar yeniden hesaplanmaz
+            indicator_graph.ensure_default(df)
             
             return df
             
@@ -80,54 +467,82 @@ class DataCollector:
             print(f"İndikatör hesaplama hatası: {str(e)}")
             return df
     
-    def get_current_price(self, symbol):
+    def get_current_price(self, symbol, priority=PRIORITY_POSITION):
         """
-        Anlık fiyat bilgisini getir
+        Anlık fiyat bilgisini getir (varsayılan olarak pozisyon kontrolü önceliğiyle)
         """
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = self.ticker_snapshot.get(symbol, priority)
+            if ticker is None or ticker.get('last') is None:
+                raise ValueError("ticker bulunamadı")
             return ticker['last']
             
         except Exception as e:
             print(f"Fiyat alma hatası ({symbol}): {str(e)}")
-            # Son kapanış fiyatını al
-            data = self.get_multi_timeframe_data(symbol)
-            if data and '1h' in data:
-                return data['1h']['close'].iloc[-1]
-            return None
+            # Yerel mum deposundaki son kapanış fiyatını kullan
+            return self.get_cached_close(symbol)
+    
+    def load_history(self, symbol, timeframe, start, end=None):
+        """
+        Eğitim/backtest için uzun geçmişi döndürür. Depoda eksik olan aralık
+        sayfalanarak tamamlanır (tek istekteki 1000 mum sınırına takılmaz).
+        """
+        backfill = HistoricalBackfill(exchange=self.exchange, candle_store=self.candle_store,
+                                      scheduler=self.scheduler)
+        backfill.backfill(symbol, timeframe, start, end)
+
+        df = self.candle_store.load(symbol, timeframe, since=parse_date(start))
+        if df is not None and end is not None:
+            df = df[df.index <= pd.to_datetime(parse_date(end), unit='ms')]
+        return df
+
+    def get_cached_close(self, symbol):
+        """
+        Yerel mum deposundaki en güncel kapanış fiyatı (borsaya istek atmaz)
+        """
+        latest = None
+        for timeframe in self.timeframes:
+            columns = self.candle_store.read(symbol, timeframe, limit=1)
+            if columns is None or len(columns['timestamp']) == 0:
+                continue
+            # En son güncellenen zaman dilimindeki kapanışı al
+            if latest is None or columns['timestamp'][-1] > latest[0]:
+                latest = (columns['timestamp'][-1], float(columns['close'][-1]))
+        
+        return None if latest is None else latest[1]
             
-    def get_multi_timeframe_data(self, symbol, timeframes=['15m', '1h', '4h']):
+    def get_multi_timeframe_data(self, symbol, timeframes=None, base_timeframe=None, priority=PRIORITY_SCAN):
         """
-        Geliştirilmiş çoklu zaman dilimi verisi toplama
+        Geliştirilmiş çoklu zaman dilimi verisi toplama.
+        base_timeframe verilirse onun katı olan zaman dilimleri tek bir
+        temel zaman dilimi çekiminden yeniden örneklenerek üretilir.
         """
         try:
+            timeframes = timeframes or self.timeframes
+            base_timeframe = base_timeframe or self.base_timeframe
+            derived = self.derivable_timeframes(timeframes, base_timeframe)
+            
+            if derived:
+                # Temel zaman dilimini bir kez güncelle
+                self.coalescer.do(
+                    self._request_key(symbol, base_timeframe, 'ohlcv', 1000),
+                    lambda: self.fetch_ohlcv_frame(symbol, base_timeframe, limit=1000, priority=priority)
+                )
+            
             data = {}
             for timeframe in timeframes:
-                # Daha fazla veri noktası al
-                ohlcv = self.exchange.fetch_ohlcv(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    limit=1000  # Daha fazla geçmiş veri
-                )
+                base = base_timeframe if timeframe in derived else None
                 
-                df = pd.DataFrame(
-                    ohlcv,
-                    columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+                # Aynı anda isteyen diğer monitörlerle çekimi ve indikatör hesabını paylaş
+                df = self.coalescer.do(
+                    self._request_key(symbol, timeframe, base, 1000),
+                    lambda: self._load_timeframe(symbol, timeframe, base, priority)
                 )
+                if df is None:
+                    continue
                 
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df.set_index('timestamp', inplace=True)
-                
-                # Temel indikatörler
-                df = self.add_indicators(df)
-                
-                # Destek/Direnç seviyeleri
-                df = self.add_support_resistance(df)
-                
-                # Hacim profili
-                df = self.add_volume_profile(df)
-                
-                data[timeframe] = df
+                # Paylaşılan sonuç değiştirilmesin diye her çağırana kopya ver
+                data[timeframe] = df.copy()
                 
             return data
             
@@ -135,19 +550,143 @@ class DataCollector:
             print(f"Veri alma hatası ({symbol}): {str(e)}")
             return None
     
-    def get_market_info(self, symbol):
+    def _request_key(self, symbol, timeframe, source, limit):
+        # Farklı çerçeve tipli toplayıcılar aynı birleştiriciyi paylaşabilir
+        return (id(self.exchange), symbol, timeframe, source, limit, self.frame_dtype)
+    
+    def _load_timeframe(self, symbol, timeframe, base_timeframe=None, priority=PRIORITY_SCAN):
+        """
+        Tek bir zaman dilimini çeker (veya türetir) ve indikatörleri hesaplar
+        """
+        if base_timeframe:
+            df = self.load_resampled_frame(symbol, timeframe, base_timeframe, limit=1000)
+        else:
+            # Daha fazla veri noktası al (yerel depodan, sadece yeni mumlar çekilir)
+            df = self.fetch_ohlcv_frame(symbol, timeframe, limit=1000, priority=priority)
+        if df is None:
+            return None
+        
+        return self.prepare_timeframe_frame(df, timeframe)
+    
+    def derivable_timeframes(self, timeframes, base_timeframe):
+        """
+        Temel zaman diliminden türetilebilecek (tam katı olan) zaman dilimlerini döndürür
+        """
+        if not base_timeframe:
+            return []
+        
+        base_seconds = self.exchange.parse_timeframe(base_timeframe)
+        derived = []
+        for timeframe in timeframes:
+            if timeframe.endswith('M'):
+                continue  # Aylık mumlar sabit uzunlukta değil
+            seconds = self.exchange.parse_timeframe(timeframe)
+            if seconds >= base_seconds and seconds % base_seconds == 0:
+                derived.append(timeframe)
+        return derived
+    
+    def load_resampled_frame(self, symbol, timeframe, base_timeframe, limit=1000):
+        """
+        Depodaki temel zaman dilimi mumlarından `timeframe` mumlarını üretir
+        """
+        ratio = self.exchange.parse_timeframe(timeframe) // self.exchange.parse_timeframe(base_timeframe)
+        
+        # Baştaki eksik grup atılacağı için bir grup fazladan oku
+        base_df = self.candle_store.load(symbol, base_timeframe, limit=(limit + 1) * ratio)
+        if base_df is None:
+            return None
+        if ratio == 1:
+            return base_df.tail(limit)
+        
+        df = self.resample_ohlcv(base_df, timeframe, base_timeframe)
+        return None if df is None else df.tail(limit)
+    
+    def resample_ohlcv(self, df, timeframe, base_timeframe, include_partial=True):
+        """
+        Alt zaman dilimi mumlarını üst zaman dilimine toplar (ör. 15m -> 1h, 2h, 3h, 4h, 1d).
+        
+        Gruplar Binance ile aynı şekilde UTC'ye hizalanır (haftalık mumlar pazartesi başlar).
+        Eksik temel mumu olan gruplar atılır; sadece son grup (henüz kapanmamış mum,
+        borsanın döndürdüğü son mum gibi) include_partial=True ise tutulur.
+        """
+        try:
+            base_seconds = self.exchange.parse_timeframe(base_timeframe)
+            seconds = self.exchange.parse_timeframe(timeframe)
+            if seconds % base_seconds != 0:
+                print(f"{timeframe}, {base_timeframe} zaman diliminden türetilemez")
+                return None
+            ratio = seconds // base_seconds
+            
+            # Haftalık mumlar pazartesi 00:00 UTC'de açılır, diğerleri epoch'a hizalıdır
+            origin = pd.Timestamp('1970-01-05') if timeframe.endswith('w') else 'epoch'
+            
+            grouped = df.resample(f'{seconds}s', origin=origin, label='left', closed='left')
+            resampled = grouped.agg({
+                'open': 'first',
+                'high': 'max',
+                'low': 'min',
+                'close': 'last',
+                'volume': 'sum'
+            })
+            counts = grouped['close'].count()
+            
+            complete = counts == ratio
+            if include_partial and len(complete) > 0:
+                complete.iloc[-1] = counts.iloc[-1] > 0
+            
+            resampled = resampled[complete]
+            resampled.index.name = df.index.name
+            return resampled
+            
+        except Exception as e:
+            print(f"Yeniden örnekleme hatası ({base_timeframe} -> {timeframe}): {str(e)}")
+            return None
+    
+    def prepare_timeframe_frame(self, df, timeframe=None):
+        """
+        Ham OHLCV verisine indikatörleri, destek/direnç ve hacim profilini ekler
+        """
+        # Temel indikatörler
+        df = self.add_indicators(df)
+        
+        # Bu zaman dilimi için açılmış hacim akışı indikatörleri
+        flow_names = [name for name in self.optional_indicators.get(timeframe, []) if name in FLOW_INDICATORS]
+        if flow_names:
+            df = self.add_flow_indicators(df, flow_names)
+        
+        # Destek/Direnç seviyeleri
+        df = self.add_support_resistance(df)
+        
+        # Hacim profili
+        df = self.add_volume_profile(df)
+        
+        if self.frame_dtype is not None:
+            df = self.compact_frame(df, self.frame_dtype)
+        
+        # Katalogdaki diğer indikatörler (Ichimoku, KC, ROC, MFI, CMF, StochRSI...) ilk
+        # df['sütun'] erişiminde hesaplanır ve bir sonraki muma kadar saklanır
+        return indicator_graph.lazy(df)
+    
+    def compact_frame(self, df, dtype='float32'):
+        """
+        Çerçeveyi tek bitişik blokta tutulan (isteğe bağlı float32) CandleFrame'e taşır ve
+        kopyasız pandas görünümünü döndürür. Hesaplanmış indikatörler önbellekte kalır.
+        """
+        try:
+            compact = CandleFrame.from_frame(df, dtype).to_pandas()
+            return indicator_graph.carry_memo(df, compact)
+            
+        except Exception as e:
+            print(f"Kompakt çerçeve hatası: {str(e)}")
+            return df
+    
+    def get_market_info(self, symbol, priority=PRIORITY_SCAN):
         """
         Coin hakkında temel bilgileri çeker
         """
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
-            return {
-                'son_fiyat': ticker['last'],
-                'günlük_değişim': ticker['percentage'],
-                'günlük_hacim': ticker['quoteVolume'],
-                'en_yüksek_24h': ticker['high'],
-                'en_düşük_24h': ticker['low']
-            }
+            ticker = self.ticker_snapshot.get(symbol, priority)
+            return ticker_to_market_info(ticker)
         except Exception as e:
             print(f"Piyasa bilgisi çekme hatası: {e}")
             return None
@@ -157,28 +696,13 @@ class DataCollector:
         Destek ve direnç seviyelerini hesaplar
         """
         try:
-            # Pivot noktaları
-            high = df['high'].iloc[-1]
-            low = df['low'].iloc[-1]
-            close = df['close'].iloc[-1]
-            
-            pivot = (high + low + close) / 3
-            
-            r1 = 2 * pivot - low
-            r2 = pivot + (high - low)
-            r3 = high + 2 * (pivot - low)
+            # Pivot noktaları: skaler seviyeler satırlara yayınlanmaz, çerçeve başına bir kez
+            # tutulur (candle_frame.get_levels(df))
+            high = float(df['high'].iloc[-1])
+            low = float(df['low'].iloc[-1])
+            close = float(df['close'].iloc[-1])
             
-            s1 = 2 * pivot - high
-            s2 = pivot - (high - low)
-            s3 = low - 2 * (high - pivot)
-            
-            df['Pivot'] = pivot
-            df['R1'] = r1
-            df['R2'] = r2
-            df['R3'] = r3
-            df['S1'] = s1
-            df['S2'] = s2
-            df['S3'] = s3
+            update_levels(df, **pivot_levels(high, low, close))
             
             return df
             
@@ -186,21 +710,17 @@ class DataCollector:
             print(f"Destek/Direnç hesaplama hatası: {str(e)}")
             return df
 
-    def add_volume_profile(self, df):
+    def add_volume_profile(self, df, lookback=100, bins=50, bin_size=None):
         """
-        Hacim profili analizi ekler
+        Hacim profili analizi ekler: son `lookback` mumun hacmi fiyat kutularına dağıtılır,
+        POC, değer alanı (VAH/VAL) ve yüksek/düşük hacim düğümleri seviyelere yazılır
         """
         try:
-            # Son 100 mum için hacim profili
-            price_bins = pd.qcut(df['close'].tail(100), q=10, labels=False)
-            volume_profile = df['volume'].tail(100).groupby(price_bins).sum()
-            
-            # POC (Point of Control) - En yüksek hacimli seviye
-            poc_index = volume_profile.idxmax()
-            poc_price = df['close'].tail(100).iloc[poc_index]
-            
-            df['POC'] = poc_price
-            df['Volume_Profile'] = volume_profile
+            profile = compute_profiles(
+                df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), df['volume'].to_numpy(),
+                lookback=lookback, bins=bins, bin_size=bin_size
+            )
+            update_levels(df, **profile)
             
             return df
             
@@ -214,67 +734,22 @@ class DataCollector:
 
     def calculate_mfi(self, df, period=14):
         """Money Flow Index hesaplar"""
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        money_flow = typical_price * df['volume']
-        
-        positive_flow = money_flow.where(typical_price > typical_price.shift(1), 0).rolling(period).sum()
-        negative_flow = money_flow.where(typical_price < typical_price.shift(1), 0).rolling(period).sum()
-        
-        mfi = 100 - (100 / (1 + positive_flow / negative_flow))
-        return mfi
+        return self._flow_series(df, 'MFI', mfi_period=period)
 
     def calculate_cmf(self, df, period=20):
         """Chaikin Money Flow hesaplar"""
-        mf_multiplier = ((df['close'] - df['low']) - (df['high'] - df['close'])) / (df['high'] - df['low'])
-        mf_volume = mf_multiplier * df['volume']
-        
-        return mf_volume.rolling(period).sum() / df['volume'].rolling(period).sum()
+        return self._flow_series(df, 'CMF', cmf_period=period)
 
     def calculate_supertrend(self, df, period=10, multiplier=3):
         """
-        SuperTrend indikatörünü hesaplar
+        SuperTrend indikatörünü hesaplar (NumPy çekirdeği, DataFrame'e ara sütun yazılmaz)
         """
         try:
-            # True Range hesaplama
-            df['TR'] = pd.DataFrame([
-                df['high'] - df['low'],
-                abs(df['high'] - df['close'].shift(1)),
-                abs(df['low'] - df['close'].shift(1))
-            ]).max()
-            
-            # ATR (Average True Range) hesaplama
-            df['ATR'] = df['TR'].rolling(period).mean()
-            
-            # SuperTrend hesaplama
-            df['Upper Basic'] = (df['high'] + df['low']) / 2 + (multiplier * df['ATR'])
-            df['Lower Basic'] = (df['high'] + df['low']) / 2 - (multiplier * df['ATR'])
-            
-            df['Upper'] = df['Upper Basic']
-            df['Lower'] = df['Lower Basic']
-            
-            for i in range(1, len(df)):
-                if df['close'].iloc[i-1] <= df['Upper'].iloc[i-1]:
-                    df['Upper'].iloc[i] = min(df['Upper Basic'].iloc[i], df['Upper'].iloc[i-1])
-                else:
-                    df['Upper'].iloc[i] = df['Upper Basic'].iloc[i]
-            
-                if df['close'].iloc[i-1] >= df['Lower'].iloc[i-1]:
-                    df['Lower'].iloc[i] = max(df['Lower Basic'].iloc[i], df['Lower'].iloc[i-1])
-                else:
-                    df['Lower'].iloc[i] = df['Lower Basic'].iloc[i]
-            
-            # SuperTrend değeri
-            df['SuperTrend'] = np.nan
-            for i in range(1, len(df)):
-                if df['close'].iloc[i] <= df['Upper'].iloc[i]:
-                    df['SuperTrend'].iloc[i] = df['Upper'].iloc[i]
-                else:
-                    df['SuperTrend'].iloc[i] = df['Lower'].iloc[i]
-            
-            # Gereksiz sütunları temizle
-            df.drop(['TR', 'Upper Basic', 'Lower Basic', 'Upper', 'Lower'], axis=1, inplace=True)
-            
-            return df['SuperTrend']
+            values = supertrend(
+                df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(),
+                period=period, multiplier=multiplier
+            )
+            return pd.Series(values, index=df.index)
             
         except Exception as e:
             print(f"SuperTrend hesaplama hatası: {str(e)}")
@@ -285,26 +760,8 @@ class DataCollector:
         Ichimoku indikatörünü hesaplar
         """
         try:
-            # Tenkan-sen (Conversion Line)
-            period9_high = df['high'].rolling(window=9).max()
-            period9_low = df['low'].rolling(window=9).min()
-            df['tenkan_sen'] = (period9_high + period9_low) / 2
-            
-            # Kijun-sen (Base Line)
-            period26_high = df['high'].rolling(window=26).max()
-            period26_low = df['low'].rolling(window=26).min()
-            df['kijun_sen'] = (period26_high + period26_low) / 2
-            
-            # Senkou Span A (Leading Span A)
-            df['senkou_span_a'] = ((df['tenkan_sen'] + df['kijun_sen']) / 2).shift(26)
-            
-            # Senkou Span B (Leading Span B)
-            period52_high = df['high'].rolling(window=52).max()
-            period52_low = df['low'].rolling(window=52).min()
-            df['senkou_span_b'] = ((period52_high + period52_low) / 2).shift(26)
-            
-            # Chikou Span (Lagging Span)
-            df['chikou_span'] = df['close'].shift(-26)
+            # tenkan_sen, kijun_sen, senkou_span_a/b ve chikou_span sütunları (mum başına bir kez)
+            indicator_graph.ensure(df, indicator_graph.ICHIMOKU_COLUMNS)
             
             return df['senkou_span_a']  # Ana sinyal çizgisini döndür
             
@@ -317,12 +774,8 @@ class DataCollector:
         Keltner Channels hesaplar
         """
         try:
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
-            ema = typical_price.ewm(span=period, adjust=False).mean()
-            atr = self.calculate_atr(df, period)
-            
-            kc_upper = ema + (multiplier * atr)
-            kc_lower = ema - (multiplier * atr)
+            kc_upper = indicator_graph.get(df, 'KC_upper', period=period, multiplier=multiplier)
+            kc_lower = indicator_graph.get(df, 'KC_lower', period=period, multiplier=multiplier)
             
             return kc_upper, kc_lower
             
@@ -335,14 +788,7 @@ class DataCollector:
         Average True Range hesaplar
         """
         try:
-            high_low = df['high'] - df['low']
-            high_close = np.abs(df['high'] - df['close'].shift())
-            low_close = np.abs(df['low'] - df['close'].shift())
-            
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = np.max(ranges, axis=1)
-            
-            return true_range.rolling(period).mean()
+            return indicator_graph.atr(df['high'], df['low'], df['close'], period)
             
         except Exception as e:
             print(f"ATR hesaplama hatası: {str(e)}")
@@ -353,66 +799,54 @@ class DataCollector:
         On Balance Volume (OBV) hesaplar
         """
         try:
-            obv = pd.Series(index=df.index, dtype='float64')
-            obv.iloc[0] = 0
-            
-            for i in range(1, len(df)):
-                if df['close'].iloc[i] > df['close'].iloc[i-1]:
-                    obv.iloc[i] = obv.iloc[i-1] + df['volume'].iloc[i]
-                elif df['close'].iloc[i] < df['close'].iloc[i-1]:
-                    obv.iloc[i] = obv.iloc[i-1] - df['volume'].iloc[i]
-                else:
-                    obv.iloc[i] = obv.iloc[i-1]
-            
-            return obv
+            return self._flow_series(df, 'OBV')
             
         except Exception as e:
             print(f"OBV hesaplama hatası: {str(e)}")
             return pd.Series(np.nan, index=df.index)
 
-    def calculate_vwap(self, df):
+    def calculate_vwap(self, df, session_reset=False):
         """
-        Volume Weighted Average Price (VWAP) hesaplar
+        Volume Weighted Average Price (VWAP) hesaplar.
+        session_reset=True ise her UTC gün başında sıfırlanır.
         """
         try:
-            # Tipik fiyat = (Yüksek + Düşük + Kapanış) / 3
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
-            
-            # Tipik fiyat * Hacim
-            price_volume = typical_price * df['volume']
-            
-            # Kümülatif toplamlar
-            cum_price_volume = price_volume.cumsum()
-            cum_volume = df['volume'].cumsum()
-            
-            # VWAP = Kümülatif (Fiyat * Hacim) / Kümülatif Hacim
-            vwap = cum_price_volume / cum_volume
-            
-            return vwap
+            return self._flow_series(df, 'VWAP', session_reset=session_reset)
             
         except Exception as e:
             print(f"VWAP hesaplama hatası: {str(e)}")
             return pd.Series(np.nan, index=df.index)
 
+    def _flow_series(self, df, name, session_reset=False, **params):
+        return pd.Series(self._flow_arrays(df, [name], session_reset, **params)[name], index=df.index)
+
+    def _flow_arrays(self, df, names, session_reset=True, **params):
+        timestamps = None
+        if session_reset and isinstance(df.index, pd.DatetimeIndex):
+            timestamps = df.index.asi8 // 1_000_000  # ns -> ms
+        
+        return flow_indicators(
+            df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), df['volume'].to_numpy(),
+            timestamps=timestamps, names=names, **params
+        )
+
+    def add_flow_indicators(self, df, names=FLOW_INDICATORS):
+        """
+        OBV, AD, VWAP (günlük seans), MFI ve CMF sütunlarını tek geçişte ekler
+        """
+        try:
+            return indicator_graph.ensure(df, names)
+            
+        except Exception as e:
+            print(f"Hacim akışı indikatörleri hesaplama hatası: {str(e)}")
+            return df
+
     def calculate_rsi(self, df, period=14):
         """
         RSI (Relative Strength Index) hesaplar
         """
         try:
-            # Fiyat değişimlerini hesapla
-            delta = df['close'].diff()
-            
-            # Pozitif ve negatif değişimleri ayır
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            
-            # RS = Ortalama Kazanç / Ortalama Kayıp
-            rs = gain / loss
-            
-            # RSI = 100 - (100 / (1 + RS))
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
+            return indicator_graph.rsi(df['close'], period)
             
         except Exception as e:
             print(f"RSI hesaplama hatası: {str(e)}")
@@ -423,43 +857,8 @@ class DataCollector:
         ADX (Average Directional Index) hesaplar
         """
         try:
-            # True Range
-            df['TR'] = pd.DataFrame([
-                df['high'] - df['low'],
-                abs(df['high'] - df['close'].shift(1)),
-                abs(df['low'] - df['close'].shift(1))
-            ]).max()
-            
-            # +DM ve -DM
-            df['plus_DM'] = np.where(
-                (df['high'] - df['high'].shift(1)) > (df['low'].shift(1) - df['low']),
-                np.maximum(df['high'] - df['high'].shift(1), 0),
-                0
-            )
-            
-            df['minus_DM'] = np.where(
-                (df['low'].shift(1) - df['low']) > (df['high'] - df['high'].shift(1)),
-                np.maximum(df['low'].shift(1) - df['low'], 0),
-                0
-            )
-            
-            # TR14, +DM14, -DM14
-            df['TR14'] = df['TR'].rolling(window=period).mean()
-            df['plus_DM14'] = df['plus_DM'].rolling(window=period).mean()
-            df['minus_DM14'] = df['minus_DM'].rolling(window=period).mean()
-            
-            # +DI14 ve -DI14
-            df['plus_DI14'] = 100 * df['plus_DM14'] / df['TR14']
-            df['minus_DI14'] = 100 * df['minus_DM14'] / df['TR14']
-            
-            # DX ve ADX
-            df['DX'] = 100 * abs(df['plus_DI14'] - df['minus_DI14']) / (df['plus_DI14'] + df['minus_DI14'])
-            adx = df['DX'].rolling(window=period).mean()
-            
-            # Gereksiz sütunları temizle
-            df.drop(['TR', 'plus_DM', 'minus_DM', 'TR14', 'plus_DM14', 'minus_DM14', 
-                    'plus_DI14', 'minus_DI14', 'DX'], axis=1, inplace=True)
-            
+            # Ara sütunlar DataFrame'e yazılmaz
+            adx, _, _ = indicator_graph.adx(df['high'], df['low'], df['close'], period)
             return adx
             
         except Exception as e:
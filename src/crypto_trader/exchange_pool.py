@@ -0,0 +1,173 @@
+import asyncio
+import ccxt
+import ccxt.async_support as ccxt_async
+import json
+import os
+import threading
+import time
+from requests.adapters import HTTPAdapter
+
+MARKETS_CACHE_DIR = os.path.join('data', 'markets')
+MARKETS_CACHE_TTL = 6 * 3600  # 6 saat
+HTTP_POOL_SIZE = 32  # Eşzamanlı açık tutulacak bağlantı sayısı
+
+_exchanges = {}
+_exchanges_lock = threading.Lock()
+_async_exchanges = {}
+
+
+def get_exchange(exchange_id='binance', default_type='future'):
+    """
+    Süreç genelinde paylaşılan borsa istemcisini döndürür.
+
+    Aynı (borsa, piyasa tipi) için her çağrı aynı ccxt nesnesini alır; böylece
+    HTTP bağlantıları, market bilgileri ve ccxt'nin rate-limit sayacı paylaşılır.
+    """
+    key = (exchange_id, default_type)
+    with _exchanges_lock:
+        exchange = _exchanges.get(key)
+        if exchange is None:
+            exchange = _create_exchange(exchange_id, default_type)
+            _exchanges[key] = exchange
+        return exchange
+
+
+def register_exchange(exchange, exchange_id='binance', default_type='future'):
+    """
+    Kayıt defterine hazır bir istemci yerleştirir (ör. test veya kayıt/oynatma istemcisi)
+    """
+    with _exchanges_lock:
+        _exchanges[(exchange_id, default_type)] = exchange
+
+
+def clear_exchanges():
+    """
+    Paylaşılan istemcileri bırakır
+    """
+    with _exchanges_lock:
+        _exchanges.clear()
+
+
+def _create_exchange(exchange_id, default_type):
+    exchange_class = getattr(ccxt, exchange_id)
+    exchange = exchange_class({
+        'enableRateLimit': True,
+        'options': {
+            'defaultType': default_type
+        }
+    })
+
+    # Keep-alive bağlantı havuzunu büyüt (varsayılan 10 bağlantı)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    exchange.session.mount('https://', adapter)
+    exchange.session.mount('http://', adapter)
+
+    load_markets_cached(exchange, f"{exchange_id}_{default_type}")
+    return exchange
+
+
+def load_markets_cached(exchange, cache_name, ttl=MARKETS_CACHE_TTL):
+    """
+    Market bilgilerini diskteki önbellekten yükler, süresi dolmuşsa borsadan çeker
+    """
+    if _read_markets_cache(exchange, cache_name, ttl):
+        return exchange.markets
+
+    try:
+        markets = exchange.load_markets()
+    except Exception as e:
+        # İlk istekte ccxt tekrar deneyecek
+        print(f"Market bilgisi yükleme hatası ({cache_name}): {str(e)}")
+        return None
+
+    save_markets_cache(exchange, cache_name)
+    return markets
+
+
+def _read_markets_cache(exchange, cache_name, ttl=MARKETS_CACHE_TTL):
+    """
+    Süresi dolmamış market önbelleğini istemciye yükler, başarılıysa True döner
+    """
+    path = os.path.join(MARKETS_CACHE_DIR, f"{cache_name}.json")
+
+    try:
+        if os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+            exchange.set_markets(cached['markets'], cached.get('currencies'))
+            return True
+    except Exception as e:
+        print(f"Market önbelleği okuma hatası ({cache_name}): {str(e)}")
+
+    return False
+
+
+def save_markets_cache(exchange, cache_name):
+    """
+    İstemcinin yüklü market bilgilerini diske yazar
+    """
+    path = os.path.join(MARKETS_CACHE_DIR, f"{cache_name}.json")
+
+    try:
+        os.makedirs(MARKETS_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'markets': exchange.markets, 'currencies': exchange.currencies}, f, default=str)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Market önbelleği yazma hatası ({cache_name}): {str(e)}")
+
+
+def get_async_exchange(exchange_id='binance', default_type='future'):
+    """
+    Çalışan event loop için paylaşılan asenkron (ccxt.async_support) istemciyi döndürür.
+    Market bilgileri diskteki önbellekten yüklenir, yoksa ilk istekte çekilir.
+    """
+    loop = asyncio.get_running_loop()
+    key = (exchange_id, default_type, id(loop))
+
+    exchange = _async_exchanges.get(key)
+    if exchange is None:
+        exchange_class = getattr(ccxt_async, exchange_id)
+        exchange = exchange_class({
+            'enableRateLimit': True,
+            'options': {
+                'defaultType': default_type
+            }
+        })
+        _read_markets_cache(exchange, f"{exchange_id}_{default_type}")
+        _async_exchanges[key] = exchange
+
+    return exchange
+
+
+def register_async_exchange(exchange, exchange_id='binance', default_type='future'):
+    """
+    Çalışan event loop için hazır bir asenkron istemci yerleştirir
+    """
+    loop = asyncio.get_running_loop()
+    _async_exchanges[(exchange_id, default_type, id(loop))] = exchange
+
+
+async def close_async_exchanges():
+    """
+    Çalışan event loop'a ait asenkron istemcilerin bağlantılarını kapatır
+    """
+    loop_id = id(asyncio.get_running_loop())
+    for key in [key for key in _async_exchanges if key[2] == loop_id]:
+        exchange = _async_exchanges.pop(key)
+        try:
+            await exchange.close()
+        except Exception as e:
+            print(f"Borsa bağlantısı kapatma hatası: {str(e)}")
+
+
+def get_used_weight(exchange):
+    """
+    Binance'in son yanıtta bildirdiği 1 dakikalık kullanılan istek ağırlığı
+    """
+    headers = getattr(exchange, 'last_response_headers', None) or {}
+    for name, value in headers.items():
+        if name.lower() == 'x-mbx-used-weight-1m':
+            return int(value)
+    return None
@@ -0,0 +1,319 @@
+import asyncio
+import ccxt
+import json
+import os
+import random
+import threading
+import time
+from exchange_pool import get_exchange, register_exchange, register_async_exchange
+
+RECORDED_METHODS = ('fetch_ohlcv', 'fetch_ticker', 'fetch_tickers', 'fetch_balance')
+
+
+def _call_key(method, args, kwargs):
+    """
+    Çağrıyı kayıt dosyasında eşleştirmek için kullanılan anahtar.
+    fetch_ohlcv(symbol, timeframe, since, limit) konumsal/isimli fark etmeksizin aynı anahtarı üretir.
+    """
+    if method == 'fetch_ohlcv':
+        names = ('symbol', 'timeframe', 'since', 'limit')
+        values = dict(zip(names, args))
+        values.update({name: kwargs[name] for name in names if name in kwargs})
+        values.setdefault('timeframe', '1m')
+        return json.dumps([method] + [values.get(name) for name in names])
+
+    return json.dumps([method, list(args), {k: v for k, v in kwargs.items() if k != 'params'}],
+                      sort_keys=True, default=str)
+
+
+class RecordingExchange:
+    """
+    ccxt istemcisini saran ve fetch_ohlcv / fetch_ticker / fetch_tickers / fetch_balance
+    çağrılarını (argümanlar, sonuç, hata, gecikme) satır başına bir JSON olarak kaydeden vekil.
+    Diğer tüm öznitelikler sarılan istemciye yönlendirilir. Senkron ve asenkron
+    (ccxt.async_support) istemcilerle çalışır.
+    """
+
+    def __init__(self, exchange, path):
+        self._exchange = exchange
+        self.path = path
+        self._lock = threading.Lock()
+        self._market = (exchange.options or {}).get('defaultType')
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        for method in RECORDED_METHODS:
+            target = getattr(exchange, method, None)
+            if target is None:
+                continue
+            if asyncio.iscoroutinefunction(target):
+                setattr(self, method, self._wrap_async(method, target))
+            else:
+                setattr(self, method, self._wrap(method, target))
+
+    def __getattr__(self, name):
+        return getattr(self._exchange, name)
+
+    def _write(self, method, args, kwargs, result, error, started):
+        record = {
+            'method': method,
+            'key': _call_key(method, args, kwargs),
+            'market': self._market,
+            'ts': self._exchange.milliseconds(),
+            'latency_ms': round((time.monotonic() - started) * 1000, 2),
+            'result': result,
+            'error': None if error is None else {'type': type(error).__name__, 'message': str(error)}
+        }
+        line = json.dumps(record, default=str)
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(line + '\n')
+
+    def _wrap(self, method, target):
+        def wrapper(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                result = target(*args, **kwargs)
+            except Exception as e:
+                self._write(method, args, kwargs, None, e, started)
+                raise
+            self._write(method, args, kwargs, result, None, started)
+            return result
+        wrapper.__name__ = method
+        return wrapper
+
+    def _wrap_async(self, method, target):
+        async def wrapper(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                result = await target(*args, **kwargs)
+            except Exception as e:
+                self._write(method, args, kwargs, None, e, started)
+                raise
+            self._write(method, args, kwargs, result, None, started)
+            return result
+        wrapper.__name__ = method
+        return wrapper
+
+
+class ReplayExchange:
+    """
+    RecordingExchange kayıtlarını canlı borsa yerine sunan sahte istemci.
+
+    - Aynı argümanlı çağrıya kayıttaki yanıt(lar) sırayla verilir
+    - Kayıtta birebir karşılığı olmayan fetch_ohlcv çağrıları, o sembol/zaman dilimi
+      için kaydedilen tüm mumlardan since/limit kurallarıyla üretilir
+    - `latency` ± `jitter` saniye gecikme ve `error_rate` olasılıkla ccxt.NetworkError eklenir
+    - milliseconds() kaydın saatini döndürür; artımlı çekim mantığı kayıttaki gibi çalışır
+
+    Aynı `seed` ile gecikme ve hata dizisi her çalıştırmada aynıdır.
+    """
+
+    def __init__(self, path, latency=0.0, jitter=0.0, error_rate=0.0, seed=None,
+                 exchange_id='binance', default_type='future'):
+        self.id = exchange_id
+        self.options = {'defaultType': default_type}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.markets = {}
+        self.currencies = {}
+        self.last_response_headers = {}
+        self.stats = {'calls': 0, 'misses': 0, 'injected_errors': 0}
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._responses = {}  # anahtar -> [kayıt, ...]
+        self._positions = {}  # anahtar -> sıradaki yanıtın indeksi
+        self._candles = {}  # (sembol, zaman dilimi) -> {zaman damgası: mum}
+        self._latest = {}  # metot -> son başarılı sonuç
+        self._clock = None
+        self._load(path, default_type)
+
+    def _load(self, path, default_type):
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if record.get('market') not in (None, default_type):
+                    continue
+
+                self._responses.setdefault(record['key'], []).append(record)
+                if self._clock is None:
+                    self._clock = record['ts']
+                if record['error'] is not None:
+                    continue
+
+                method = record['method']
+                self._latest[method] = record['result']
+                if method == 'fetch_ohlcv':
+                    _, symbol, timeframe, _, _ = json.loads(record['key'])
+                    candles = self._candles.setdefault((symbol, timeframe), {})
+                    for row in record['result']:
+                        candles[row[0]] = row
+                    self.markets.setdefault(symbol, {'symbol': symbol})
+                elif method == 'fetch_tickers':
+                    for symbol in record['result']:
+                        self.markets.setdefault(symbol, {'symbol': symbol})
+
+        self._sorted_candles = {
+            key: [candles[ts] for ts in sorted(candles)]
+            for key, candles in self._candles.items()
+        }
+        if self._clock is None:
+            self._clock = int(time.time() * 1000)
+
+    # --- ccxt uyumlu yardımcılar ---
+
+    def parse_timeframe(self, timeframe):
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
+    def milliseconds(self):
+        return self._clock
+
+    def load_markets(self, reload=False, params={}):
+        return self.markets
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = markets
+        self.currencies = currencies or {}
+        return markets
+
+    # --- oynatma ---
+
+    def _delay(self):
+        if self.latency <= 0 and self.jitter <= 0:
+            return 0.0
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def _serve(self, method, args, kwargs):
+        """
+        Dönüş: (gecikme, sonuç); enjekte edilen veya kaydedilmiş hatalar exception olarak atılır
+        """
+        with self._lock:
+            self.stats['calls'] += 1
+            delay = self._delay()
+
+            if self.error_rate > 0 and self._random.random() < self.error_rate:
+                self.stats['injected_errors'] += 1
+                raise ccxt.NetworkError(f"Enjekte edilmiş oynatma hatası: {method}")
+
+            key = _call_key(method, args, kwargs)
+            records = self._responses.get(key)
+            if records:
+                position = self._positions.get(key, 0)
+                record = records[min(position, len(records) - 1)]
+                self._positions[key] = position + 1
+                self._clock = max(self._clock, record['ts'])
+
+                if record['error'] is not None:
+                    error_class = getattr(ccxt, record['error']['type'], ccxt.ExchangeError)
+                    raise error_class(record['error']['message'])
+                return delay, record['result']
+
+            self.stats['misses'] += 1
+            return delay, self._synthesize(method, key, args)
+
+    def _synthesize(self, method, key, args):
+        if method == 'fetch_ohlcv':
+            _, symbol, timeframe, since, limit = json.loads(key)
+            rows = self._sorted_candles.get((symbol, timeframe))
+            if rows is None:
+                raise ccxt.BadSymbol(f"Kayıtta veri yok: {symbol} {timeframe}")
+
+            limit = limit or 500
+            if since is None:
+                return [list(row) for row in rows[-limit:]]
+            return [list(row) for row in rows if row[0] >= since][:limit]
+
+        if method == 'fetch_ticker':
+            tickers = self._latest.get('fetch_tickers') or {}
+            ticker = tickers.get(args[0]) if args else None
+            if ticker is None:
+                raise ccxt.BadSymbol(f"Kayıtta ticker yok: {args[0] if args else ''}")
+            return ticker
+
+        if method in self._latest:
+            return self._latest[method]
+        raise ccxt.ExchangeError(f"Kayıtta yanıt yok: {method}")
+
+    def _call(self, method, *args, **kwargs):
+        delay, result = self._serve(method, args, kwargs)
+        if delay:
+            time.sleep(delay)
+        return result
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return self._call('fetch_ohlcv', symbol, timeframe, since=since, limit=limit)
+
+    def fetch_ticker(self, symbol, params={}):
+        return self._call('fetch_ticker', symbol)
+
+    def fetch_tickers(self, symbols=None, params={}):
+        args = () if symbols is None else (symbols,)
+        return self._call('fetch_tickers', *args)
+
+    def fetch_balance(self, params={}):
+        return self._call('fetch_balance')
+
+
+class AsyncReplayExchange(ReplayExchange):
+    """
+    ReplayExchange'in ccxt.async_support arayüzüne uyan sürümü (gecikme event loop'u bloklamaz)
+    """
+
+    async def load_markets(self, reload=False, params={}):
+        return self.markets
+
+    async def _call(self, method, *args, **kwargs):
+        delay, result = self._serve(method, args, kwargs)
+        if delay:
+            await asyncio.sleep(delay)
+        return result
+
+    async def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None, params={}):
+        return await self._call('fetch_ohlcv', symbol, timeframe, since=since, limit=limit)
+
+    async def fetch_ticker(self, symbol, params={}):
+        return await self._call('fetch_ticker', symbol)
+
+    async def fetch_tickers(self, symbols=None, params={}):
+        args = () if symbols is None else (symbols,)
+        return await self._call('fetch_tickers', *args)
+
+    async def fetch_balance(self, params={}):
+        return await self._call('fetch_balance')
+
+    async def close(self):
+        pass
+
+
+def install_recorder(path, exchange_id='binance', default_type='future'):
+    """
+    Paylaşılan istemciyi kaydedici ile sarar; sonraki get_exchange çağrıları kaydeder
+    """
+    recorder = RecordingExchange(get_exchange(exchange_id, default_type), path)
+    register_exchange(recorder, exchange_id, default_type)
+    return recorder
+
+
+def install_replay(path, exchange_id='binance', default_type='future', **kwargs):
+    """
+    Paylaşılan istemci yerine kayıttan oynatan istemciyi yerleştirir (canlı borsa gerekmez)
+    """
+    replay = ReplayExchange(path, exchange_id=exchange_id, default_type=default_type, **kwargs)
+    register_exchange(replay, exchange_id, default_type)
+    return replay
+
+
+def install_async_replay(path, exchange_id='binance', default_type='future', **kwargs):
+    """
+    Çalışan event loop için asenkron oynatma istemcisini yerleştirir
+    """
+    replay = AsyncReplayExchange(path, exchange_id=exchange_id, default_type=default_type, **kwargs)
+    register_async_exchange(replay, exchange_id, default_type)
+    return replay
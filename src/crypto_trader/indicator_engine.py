@@ -0,0 +1,333 @@
+import math
+import threading
+
+# add_indicators ile aynı sütun adları
+INDICATOR_COLUMNS = [
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist',
+    'EMA_9', 'EMA_20', 'EMA_50', 'EMA_200',
+    'BB_middle', 'BB_upper', 'BB_lower', 'ADX', 'DMP', 'DMN', 'SuperTrend'
+]
+
+
+class _EMA:
+    """
+    pandas ewm(span, adjust=False) ile aynı özyineleme; ilk değer ilk gözlemdir
+    """
+
+    def __init__(self, span):
+        self.alpha = 2.0 / (span + 1)
+        self.value = None
+
+    def peek(self, x):
+        if self.value is None:
+            return x
+        return self.alpha * x + (1 - self.alpha) * self.value
+
+    def push(self, x):
+        self.value = self.peek(x)
+        return self.value
+
+
+class _RollingWindow:
+    """
+    Sabit uzunluklu pencere için kayan toplam ve kareler toplamı.
+
+    NaN değerler pandas rolling(window) gibi pencereyi geçersiz kılar. Kareler
+    toplamı ilk değere göre ötelenmiş değerlerle tutulur (büyük fiyatlarda
+    sayısal kaybı önler) ve halka her döndüğünde toplamlar baştan hesaplanır.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.buffer = [0.0] * size
+        self.count = 0
+        self.head = 0
+        self.nans = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.ref = None
+
+    def _outgoing(self):
+        return self.buffer[self.head] if self.count >= self.size else None
+
+    def _totals_with(self, x):
+        """
+        x eklenirse oluşacak (adet, nan sayısı, toplam, kareler toplamı)
+        """
+        ref = self.ref if self.ref is not None else (0.0 if math.isnan(x) else x)
+        count = min(self.count + 1, self.size)
+        nans, total, sumsq = self.nans, self.sum, self.sumsq
+
+        old = self._outgoing()
+        if old is not None:
+            if math.isnan(old):
+                nans -= 1
+            else:
+                total -= old
+                sumsq -= (old - ref) ** 2
+
+        if math.isnan(x):
+            nans += 1
+        else:
+            total += x
+            sumsq += (x - ref) ** 2
+        return count, nans, total, sumsq, ref
+
+    def _mean(self, count, nans, total):
+        if count < self.size or nans:
+            return math.nan
+        return total / self.size
+
+    def _std(self, count, nans, total, sumsq, ref):
+        if count < self.size or nans:
+            return math.nan
+        shifted_mean = total / self.size - ref
+        variance = (sumsq - self.size * shifted_mean ** 2) / (self.size - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def peek_mean(self, x):
+        count, nans, total, _, _ = self._totals_with(x)
+        return self._mean(count, nans, total)
+
+    def peek_std(self, x):
+        return self._std(*self._totals_with(x))
+
+    def push(self, x):
+        count, nans, total, sumsq, ref = self._totals_with(x)
+        self.count, self.nans, self.sum, self.sumsq, self.ref = count, nans, total, sumsq, ref
+        self.buffer[self.head] = x
+        self.head = (self.head + 1) % self.size
+
+        if self.head == 0:
+            # Birikmiş yuvarlama hatasını sıfırla
+            values = [v for v in self.buffer if not math.isnan(v)]
+            self.sum = sum(values)
+            self.sumsq = sum((v - self.ref) ** 2 for v in values)
+
+    @property
+    def mean(self):
+        return self._mean(self.count, self.nans, self.sum)
+
+    @property
+    def std(self):
+        return self._std(self.count, self.nans, self.sum, self.sumsq, self.ref)
+
+
+class IndicatorState:
+    """
+    Tek bir (sembol, zaman dilimi) için varsayılan indikatör setinin akış durumu.
+    Her mum O(1) işlemle güncellenir; sonuçlar DataCollector.add_indicators'ın
+    son satırıyla (tolerans dahilinde) aynıdır.
+    """
+
+    def __init__(self, rsi_period=14, adx_period=14, bb_period=20, bb_std=2,
+                 supertrend_period=10, supertrend_multiplier=3):
+        self.bb_std = bb_std
+        self.supertrend_multiplier = supertrend_multiplier
+        self.last_timestamp = None
+        self.prev = None  # (high, low, close) son kapanan mum
+
+        self.ema = {span: _EMA(span) for span in (9, 20, 50, 200)}
+        self.ema_fast = _EMA(12)
+        self.ema_slow = _EMA(26)
+        self.macd_signal = _EMA(9)
+
+        self.gain = _RollingWindow(rsi_period)
+        self.loss = _RollingWindow(rsi_period)
+        self.bb = _RollingWindow(bb_period)
+
+        self.tr = _RollingWindow(adx_period)
+        self.plus_dm = _RollingWindow(adx_period)
+        self.minus_dm = _RollingWindow(adx_period)
+        self.dx = _RollingWindow(adx_period)
+
+        self.supertrend_tr = _RollingWindow(supertrend_period)
+        self.supertrend_bands = None  # (üst, alt) son kapanan mumda
+
+        self.values = {name: math.nan for name in INDICATOR_COLUMNS}
+
+    def _step(self, candle, commit):
+        high, low, close = float(candle['high']), float(candle['low']), float(candle['close'])
+
+        if self.prev is None:
+            # İlk satır: fark yok, batch sürümündeki gibi 0 kabul edilir; TR = high - low
+            delta = 0.0
+            true_range = high - low
+            plus_dm = minus_dm = 0.0
+        else:
+            prev_high, prev_low, prev_close = self.prev
+            delta = close - prev_close
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            up_move = high - prev_high
+            down_move = prev_low - low
+            plus_dm = max(up_move, 0.0) if up_move > down_move else 0.0
+            minus_dm = max(down_move, 0.0) if down_move > up_move else 0.0
+
+        gain_in = delta if delta > 0 else 0.0
+        loss_in = -delta if delta < 0 else 0.0
+
+        def apply(item, x):
+            if commit:
+                item.push(x)
+                return item.value if isinstance(item, _EMA) else item.mean
+            return item.peek(x) if isinstance(item, _EMA) else item.peek_mean(x)
+
+        values = {}
+
+        # RSI (kayan ortalama, batch sürümüyle aynı)
+        gain = apply(self.gain, gain_in)
+        loss = apply(self.loss, loss_in)
+        values['RSI'] = _rsi(gain, loss)
+
+        # MACD
+        macd = apply(self.ema_fast, close) - apply(self.ema_slow, close)
+        signal = apply(self.macd_signal, macd)
+        values['MACD'] = macd
+        values['MACD_Signal'] = signal
+        values['MACD_Hist'] = macd - signal
+
+        # EMA'lar
+        for span, ema in self.ema.items():
+            values[f'EMA_{span}'] = apply(ema, close)
+
+        # Bollinger Bands
+        std = self.bb.peek_std(close)
+        middle = apply(self.bb, close)
+        values['BB_middle'] = middle
+        values['BB_upper'] = middle + std * self.bb_std
+        values['BB_lower'] = middle - std * self.bb_std
+
+        # ADX
+        tr14 = apply(self.tr, true_range)
+        plus_dm14 = apply(self.plus_dm, plus_dm)
+        minus_dm14 = apply(self.minus_dm, minus_dm)
+        plus_di = 100 * plus_dm14 / tr14 if tr14 else math.nan
+        minus_di = 100 * minus_dm14 / tr14 if tr14 else math.nan
+        di_sum = plus_di + minus_di
+        dx = 100 * abs(plus_di - minus_di) / di_sum if di_sum else math.nan
+        values['ADX'] = apply(self.dx, dx)
+        values['DMP'] = plus_di
+        values['DMN'] = minus_di
+
+        # SuperTrend (indicator_kernels.supertrend ile aynı bant özyinelemesi)
+        average_range = apply(self.supertrend_tr, true_range)
+        upper = (high + low) / 2 + self.supertrend_multiplier * average_range
+        lower = (high + low) / 2 - self.supertrend_multiplier * average_range
+        if self.supertrend_bands is None:
+            values['SuperTrend'] = math.nan
+        else:
+            prev_upper, prev_lower = self.supertrend_bands
+            prev_close = self.prev[2]
+            if prev_close <= prev_upper:
+                upper = min(upper, prev_upper)
+            if prev_close >= prev_lower:
+                lower = max(lower, prev_lower)
+            values['SuperTrend'] = upper if close <= upper else lower
+
+        if commit:
+            self.prev = (high, low, close)
+            self.supertrend_bands = (upper, lower)
+            self.values = values
+        return values
+
+    def push(self, candle):
+        """
+        Kapanan mumu duruma işler ve güncel değerleri döndürür
+        """
+        timestamp = candle.get('timestamp')
+        if timestamp is not None and self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            # Aynı mum ikinci kez geldi
+            return self.values
+        self.last_timestamp = timestamp
+        return self._step(candle, commit=True)
+
+    def peek(self, candle):
+        """
+        Henüz kapanmamış mum için değerleri hesaplar, durumu değiştirmez
+        """
+        return self._step(candle, commit=False)
+
+
+def _rsi(gain, loss):
+    if math.isnan(gain) or math.isnan(loss):
+        return math.nan
+    if loss == 0:
+        return math.nan if gain == 0 else 100.0
+    return 100 - 100 / (1 + gain / loss)
+
+
+class IndicatorEngine:
+    """
+    (sembol, zaman dilimi) başına IndicatorState tutan akış indikatör motoru.
+    Binlerce çifti tek çekirdekte izlemek için tam tablo yeniden hesaplaması yerine
+    her mum kapanışında sadece o çiftin durumu güncellenir.
+    """
+
+    def __init__(self, **params):
+        self.params = params
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _state(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = IndicatorState(**self.params)
+                self._states[key] = state
+            return state
+
+    def has_state(self, symbol, timeframe):
+        return (symbol, timeframe) in self._states
+
+    def last_timestamp(self, symbol, timeframe):
+        state = self._states.get((symbol, timeframe))
+        return None if state is None else state.last_timestamp
+
+    def warmup(self, symbol, timeframe, columns):
+        """
+        Durumu sıfırdan kurar. columns: CandleStore.read çıktısı (sütun -> dizi)
+        """
+        state = IndicatorState(**self.params)
+        with self._lock:
+            self._states[(symbol, timeframe)] = state
+        return self.extend(symbol, timeframe, columns)
+
+    def extend(self, symbol, timeframe, columns):
+        """
+        Birden fazla kapanmış mumu sırayla işler
+        """
+        state = self._state(symbol, timeframe)
+        timestamps = columns['timestamp']
+        highs, lows, closes = columns['high'], columns['low'], columns['close']
+        for i in range(len(timestamps)):
+            state.push({
+                'timestamp': int(timestamps[i]),
+                'high': highs[i],
+                'low': lows[i],
+                'close': closes[i]
+            })
+        return state.values
+
+    def update(self, symbol, timeframe, candle):
+        """
+        Kapanan mumu işler ve güncel indikatör değerlerini döndürür
+        """
+        return dict(self._state(symbol, timeframe).push(candle))
+
+    def peek(self, symbol, timeframe, candle):
+        """
+        Açık mumla birlikte oluşacak değerler (durum değişmez)
+        """
+        return self._state(symbol, timeframe).peek(candle)
+
+    def latest(self, symbol, timeframe):
+        state = self._states.get((symbol, timeframe))
+        return None if state is None else dict(state.values)
+
+    def reset(self, symbol=None, timeframe=None):
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+            else:
+                self._states.pop((symbol, timeframe), None)
@@ -0,0 +1,440 @@
+import numpy as np
+import pandas as pd
+from indicator_kernels import true_range, supertrend, flow_indicators, default_indicators, DEFAULT_COLUMNS
+from candlestick_patterns import PATTERNS, frame_patterns
+
+MEMO_KEY = 'indicator_memo'
+
+# DataCollector.add_indicators'ın ürettiği varsayılan sütunlar
+DEFAULT_INDICATORS = [
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist',
+    'EMA_9', 'EMA_20', 'EMA_50', 'EMA_200',
+    'BB_middle', 'BB_upper', 'BB_lower', 'ADX', 'SuperTrend'
+]
+
+stats = {'computed': 0, 'reused': 0}
+
+
+# --- Saf hesaplama fonksiyonları (pandas Series girer, Series/dizi çıkar) ---
+
+def rsi(close, period=14):
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    signal_line = line.ewm(span=signal, adjust=False).mean()
+    return line, signal_line, line - signal_line
+
+
+def bollinger_bands(close, period=20, std_dev=2):
+    middle = close.rolling(window=period).mean()
+    std = close.rolling(window=period).std()
+    return middle, middle + std * std_dev, middle - std * std_dev
+
+
+def adx(high, low, close, period=14):
+    """
+    DataCollector.calculate_adx ile aynı (SMA yumuşatmalı) ADX; +DI ve -DI ile birlikte döner.
+    DataFrame'e ara sütun yazılmaz.
+    """
+    tr = pd.Series(true_range(high, low, close), index=close.index)
+
+    up_move = high - high.shift(1)
+    down_move = low.shift(1) - low
+    plus_dm = pd.Series(np.where(up_move > down_move, np.maximum(up_move, 0), 0), index=close.index)
+    minus_dm = pd.Series(np.where(down_move > up_move, np.maximum(down_move, 0), 0), index=close.index)
+
+    tr14 = tr.rolling(window=period).mean()
+    plus_di = 100 * plus_dm.rolling(window=period).mean() / tr14
+    minus_di = 100 * minus_dm.rolling(window=period).mean() / tr14
+
+    dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+    return dx.rolling(window=period).mean(), plus_di, minus_di
+
+
+def atr(high, low, close, period=14):
+    return pd.Series(true_range(high, low, close), index=close.index).rolling(period).mean()
+
+
+def stoch_rsi(rsi_values, period=14, smoothK=3, smoothD=3):
+    lowest = rsi_values.rolling(period).min()
+    highest = rsi_values.rolling(period).max()
+    k = (100 * (rsi_values - lowest) / (highest - lowest)).rolling(smoothK).mean()
+    return k, k.rolling(smoothD).mean()
+
+
+def ichimoku(high, low, close):
+    """
+    Dönüş: (tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, chikou_span)
+    """
+    tenkan = (high.rolling(window=9).max() + low.rolling(window=9).min()) / 2
+    kijun = (high.rolling(window=26).max() + low.rolling(window=26).min()) / 2
+    span_a = ((tenkan + kijun) / 2).shift(26)
+    span_b = ((high.rolling(window=52).max() + low.rolling(window=52).min()) / 2).shift(26)
+    return tenkan, kijun, span_a, span_b, close.shift(-26)
+
+
+def keltner_channels(high, low, close, period=20, multiplier=2):
+    """
+    Dönüş: (üst, alt); orta çizgi tipik fiyatın EMA'sı, bant genişliği ATR(period)
+    """
+    middle = ((high + low + close) / 3).ewm(span=period, adjust=False).mean()
+    average_range = atr(high, low, close, period)
+    return middle + multiplier * average_range, middle - multiplier * average_range
+
+
+def roc(close, period=12):
+    previous = close.shift(period)
+    return (close - previous) / previous * 100
+
+
+def _timestamps_ms(df):
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df.index.asi8 // 1_000_000
+    return None
+
+
+# --- Graf tanımı ---
+
+class Indicator:
+    """
+    Graf düğümü: girdi sütunları, varsayılan parametreler ve ürettiği sütunlar.
+    compute(df, **params) -> {çıktı adı: değerler}
+    """
+
+    def __init__(self, name, inputs, outputs, compute, **params):
+        self.name = name
+        self.inputs = inputs
+        self.outputs = outputs
+        self.compute = compute
+        self.params = params
+
+    def resolve_params(self, params):
+        unknown = set(params) - set(self.params)
+        if unknown:
+            raise ValueError(f"{self.name} için bilinmeyen parametre: {sorted(unknown)}")
+        return {**self.params, **params}
+
+    def column_names(self, params):
+        """
+        Varsayılan parametrelerde sütun adları aynen kullanılır, diğerlerinde parametre eki alır
+        """
+        if params == self.params:
+            return list(self.outputs)
+        suffix = '_'.join(str(params[key]) for key in sorted(params))
+        return [f"{output}_{suffix}" for output in self.outputs]
+
+
+INDICATORS = {}
+_OUTPUTS = {}  # sütun adı -> düğüm
+
+
+def register(indicator):
+    INDICATORS[indicator.name] = indicator
+    for output in indicator.outputs:
+        _OUTPUTS[output] = indicator
+    return indicator
+
+
+def _single(name, fn):
+    return lambda df, **params: {name: fn(df, **params)}
+
+
+register(Indicator('RSI', ['close'], ['RSI'], _single('RSI', lambda df, period: rsi(df['close'], period)), period=14))
+
+register(Indicator(
+    'MACD', ['close'], ['MACD', 'MACD_Signal', 'MACD_Hist'],
+    lambda df, fast, slow, signal: dict(zip(['MACD', 'MACD_Signal', 'MACD_Hist'], macd(df['close'], fast, slow, signal))),
+    fast=12, slow=26, signal=9
+))
+
+for _span in (9, 20, 50, 200):
+    register(Indicator(
+        f'EMA_{_span}', ['close'], [f'EMA_{_span}'],
+        (lambda name: lambda df, span: {name: df['close'].ewm(span=span, adjust=False).mean()})(f'EMA_{_span}'),
+        span=_span
+    ))
+
+register(Indicator(
+    'BB', ['close'], ['BB_middle', 'BB_upper', 'BB_lower'],
+    lambda df, period, std_dev: dict(zip(['BB_middle', 'BB_upper', 'BB_lower'], bollinger_bands(df['close'], period, std_dev))),
+    period=20, std_dev=2
+))
+
+register(Indicator(
+    'ADX', ['high', 'low', 'close'], ['ADX', 'DMP', 'DMN'],
+    lambda df, period: dict(zip(['ADX', 'DMP', 'DMN'], adx(df['high'], df['low'], df['close'], period))),
+    period=14
+))
+
+register(Indicator(
+    'SuperTrend', ['high', 'low', 'close'], ['SuperTrend'],
+    _single('SuperTrend', lambda df, period, multiplier: supertrend(
+        df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), period, multiplier
+    )),
+    period=10, multiplier=3
+))
+
+register(Indicator(
+    'ATR', ['high', 'low', 'close'], ['ATR'],
+    _single('ATR', lambda df, period: atr(df['high'], df['low'], df['close'], period)),
+    period=14
+))
+
+register(Indicator(
+    'StochRSI', ['RSI'], ['StochRSI_K', 'StochRSI_D'],
+    lambda df, period, smoothK, smoothD: dict(zip(['StochRSI_K', 'StochRSI_D'], stoch_rsi(df['RSI'], period, smoothK, smoothD))),
+    period=14, smoothK=3, smoothD=3
+))
+
+# MA20, Bollinger orta bandıyla aynı seridir: ikinci kez hesaplanmaz
+register(Indicator('MA20', ['BB_middle'], ['MA20'], lambda df: {'MA20': df['BB_middle']}))
+register(Indicator('MA50', ['close'], ['MA50'], _single('MA50', lambda df, period: df['close'].rolling(window=period).mean()), period=50))
+
+register(Indicator(
+    'Volume_MA20', ['volume'], ['Volume_MA20'],
+    _single('Volume_MA20', lambda df, period: df['volume'].rolling(period).mean()),
+    period=20
+))
+
+register(Indicator(
+    'volatility', ['close'], ['volatility'],
+    _single('volatility', lambda df, period: df['close'].pct_change().rolling(period).std() * 100),
+    period=20
+))
+
+for _flow in ('OBV', 'AD', 'VWAP', 'MFI', 'CMF'):
+    register(Indicator(
+        _flow, ['high', 'low', 'close', 'volume'], [_flow],
+        (lambda name: lambda df: flow_indicators(
+            df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(), df['volume'].to_numpy(),
+            timestamps=_timestamps_ms(df), names=[name]
+        ))(_flow)
+    ))
+
+
+ICHIMOKU_COLUMNS = ['tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b', 'chikou_span']
+
+register(Indicator(
+    'Ichimoku', ['high', 'low', 'close'], ICHIMOKU_COLUMNS,
+    lambda df: dict(zip(ICHIMOKU_COLUMNS, ichimoku(df['high'], df['low'], df['close'])))
+))
+
+register(Indicator(
+    'KC', ['high', 'low', 'close'], ['KC_upper', 'KC_lower'],
+    lambda df, period, multiplier: dict(zip(['KC_upper', 'KC_lower'], keltner_channels(
+        df['high'], df['low'], df['close'], period, multiplier
+    ))),
+    period=20, multiplier=2
+))
+
+register(Indicator('ROC', ['close'], ['ROC'], _single('ROC', lambda df, period: roc(df['close'], period)), period=12))
+
+# Mum formasyonları: mum başına boolean sütunlar (CDL_hammer, CDL_doji, ...)
+PATTERN_COLUMNS = [f'CDL_{name}' for name in PATTERNS]
+
+register(Indicator(
+    'Patterns', ['open', 'high', 'low', 'close'], PATTERN_COLUMNS,
+    lambda df: {f'CDL_{name}': mask for name, mask in frame_patterns(df).items()}
+))
+
+
+def catalog():
+    """
+    Hesaplanabilen tüm sütunlar: {sütun: (düğüm, varsayılan parametreler)}
+    """
+    return {column: (indicator.name, dict(indicator.params)) for column, indicator in _OUTPUTS.items()}
+
+
+# --- Memoizasyon ---
+
+def frame_version(df):
+    """
+    Çerçevenin mum sürümü: satır sayısı, son mumun zamanı ve kapanışı.
+    Yeni mum eklendiğinde veya açık mum güncellendiğinde değişir.
+    """
+    if len(df) == 0:
+        return (0, None, None)
+    return (len(df), df.index[-1], float(df['close'].iloc[-1]))
+
+
+def _memo(df, version):
+    memo = df.attrs.get(MEMO_KEY)
+    if memo is None or memo.get('version') != version:
+        return {'version': version, 'columns': {}}
+    return {'version': version, 'columns': dict(memo['columns'])}
+
+
+def _is_fresh(df, memo, column, key):
+    return column in df.columns and memo['columns'].get(column) == key
+
+
+def _resolve(df, requests):
+    """
+    requests: [(sütun veya düğüm adı, parametreler)]. Eksik ya da bu mum sürümünde
+    hesaplanmamış sütunları girdileriyle birlikte hesaplar, sütun adlarını döndürür.
+    """
+    version = frame_version(df)
+    memo = _memo(df, version)
+
+    def visit(name, node_params):
+        if name in ('open', 'high', 'low', 'close', 'volume'):
+            return name
+
+        indicator = _OUTPUTS.get(name) or INDICATORS.get(name)
+        if indicator is None:
+            raise KeyError(f"Tanımsız indikatör: {name}")
+
+        resolved = indicator.resolve_params(node_params)
+        columns = indicator.column_names(resolved)
+        key = (indicator.name, tuple(sorted(resolved.items())))
+
+        if all(_is_fresh(df, memo, column, key) for column in columns):
+            stats['reused'] += 1
+        else:
+            for dependency in indicator.inputs:
+                visit(dependency, {})
+
+            values = indicator.compute(df, **resolved)
+            for output, column in zip(indicator.outputs, columns):
+                df[column] = values[output]
+                memo['columns'][column] = key
+            stats['computed'] += 1
+
+            # Her hesaplamadan sonra yazılır: tembel çerçevede compute içindeki
+            # sütun erişimleri güncel önbelleği görür. Kopyalar aynı attrs sözlüğünü
+            # paylaşabilir; yerinde değiştirme
+            df.attrs = {**df.attrs, MEMO_KEY: {'version': version, 'columns': dict(memo['columns'])}}
+
+        output_index = indicator.outputs.index(name) if name in indicator.outputs else 0
+        return columns[output_index]
+
+    return [visit(name, params) for name, params in requests]
+
+
+def ensure(df, names):
+    """
+    Varsayılan parametreli sütunların çerçevede güncel olmasını sağlar ve çerçeveyi döndürür.
+    Her indikatör aynı mum sürümü için en fazla bir kez hesaplanır.
+    """
+    _resolve(df, [(name, {}) for name in names])
+    return df
+
+
+def get(df, name, **params):
+    """
+    Tek bir indikatör sütununu döndürür (gerekirse hesaplar).
+    Varsayılan dışı parametreler ayrı sütuna yazılır, ör. get(df, 'ATR', period=21) -> 'ATR_21'
+    """
+    column = _resolve(df, [(name, params)])[0]
+    return df[column]
+
+
+def mark_fresh(df, columns):
+    """
+    Dışarıda (ör. toplu hesaplamada) varsayılan parametrelerle üretilmiş sütunları
+    bu mum sürümü için güncel olarak işaretler
+    """
+    memo = _memo(df, frame_version(df))
+    for column in columns:
+        indicator = _OUTPUTS[column]
+        memo['columns'][column] = (indicator.name, tuple(sorted(indicator.params.items())))
+    df.attrs = {**df.attrs, MEMO_KEY: memo}
+    return df
+
+
+def ensure_default(df):
+    """
+    ensure(df, DEFAULT_INDICATORS) ile aynı sonuç; eksik veya eski sütun varsa tüm
+    varsayılan set birleşik çekirdekle (indicator_kernels.default_indicators) tek
+    seferde hesaplanır. Çerçeveye sadece sonuç sütunları yazılır.
+    """
+    version = frame_version(df)
+    memo = _memo(df, version)
+    keys = {column: (_OUTPUTS[column].name, tuple(sorted(_OUTPUTS[column].params.items())))
+            for column in DEFAULT_COLUMNS}
+    if all(_is_fresh(df, memo, column, key) for column, key in keys.items()):
+        stats['reused'] += 1
+        return df
+
+    close = df['close'].to_numpy(dtype='float64')
+    if np.isnan(close).any():
+        # Çekirdek kesintisiz seri bekler; düğüm düğüm hesapla
+        return ensure(df, DEFAULT_INDICATORS)
+
+    values = default_indicators(df['high'].to_numpy(), df['low'].to_numpy(), close)
+    for column, row in zip(DEFAULT_COLUMNS, values):
+        df[column] = row
+    stats['computed'] += 1
+    return mark_fresh(df, DEFAULT_COLUMNS)
+
+
+def carry_memo(source, target):
+    """
+    Aynı mumları taşıyan dönüştürülmüş çerçeveye (ör. float32 kopya) önbelleği aktarır;
+    kaynakta güncel olan ve hedefte bulunan sütunlar yeniden hesaplanmaz
+    """
+    memo = source.attrs.get(MEMO_KEY)
+    if memo is None or memo.get('version') != frame_version(source):
+        return target
+    columns = {column: key for column, key in memo['columns'].items() if column in target.columns}
+    target.attrs = {**target.attrs, MEMO_KEY: {'version': frame_version(target), 'columns': columns}}
+    return target
+
+
+def invalidate(df):
+    """
+    Çerçevenin indikatör önbelleğini boşaltır (sütunlar yerinde değiştirildiyse)
+    """
+    df.attrs = {key: value for key, value in df.attrs.items() if key != MEMO_KEY}
+
+
+# --- Tembel sütunlar ---
+
+class IndicatorFrame(pd.DataFrame):
+    """
+    Kayıtlı indikatör sütunlarını ilk erişimde hesaplayan DataFrame.
+
+    frame['KC_upper'] sütun yoksa (veya önbellekteki mum sürümü eskiyse) grafı çalıştırır,
+    sonuç bir sonraki muma kadar çerçevede kalır. Sadece [] erişimi tetikler;
+    .loc / öznitelik erişimi normal DataFrame gibi davranır.
+    Türetilen çerçeveler (tail, iloc, dropna, maske) düz DataFrame'dir: dilimlerde
+    eksik sütun sessizce yeniden hesaplanmaz, gerekirse ensure açıkça çağrılır.
+    copy() aynı mumları taşıdığı için tembel çerçeve olarak kalır.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def _lazy_names(self, key):
+        if isinstance(key, str):
+            return [key] if key in _OUTPUTS else []
+        if isinstance(key, list):
+            return [name for name in key if isinstance(name, str) and name in _OUTPUTS]
+        return []
+
+    def __getitem__(self, key):
+        names = self._lazy_names(key)
+        if names:
+            ensure(self, names)
+        return super().__getitem__(key)
+
+    def copy(self, deep=True):
+        # Önbellek (attrs) kopyaya taşınır, hesaplanmış sütunlar yeniden hesaplanmaz
+        return lazy(super().copy(deep=deep))
+
+
+def lazy(df):
+    """
+    Çerçeveyi (kopyalamadan) tembel indikatör çerçevesine çevirir
+    """
+    if df is None or isinstance(df, IndicatorFrame):
+        return df
+    frame = IndicatorFrame(df)
+    frame.attrs = dict(df.attrs)
+    return frame
@@ -0,0 +1,490 @@
+"""
+NumPy tabanlı indikatör çekirdekleri.
+
+Tüm fonksiyonlar son eksen zaman olacak şekilde 1D (tek sembol) veya
+2D (semboller x zaman) dizilerle çalışır ve pandas'a dokunmaz.
+"""
+import numpy as np
+
+
+def _as_float(values):
+    return np.asarray(values, dtype='float64')
+
+
+def shift(values, periods=1, fill=np.nan):
+    """
+    pandas shift(periods) karşılığı (son eksende)
+    """
+    values = _as_float(values)
+    result = np.full_like(values, fill)
+    if periods > 0:
+        result[..., periods:] = values[..., :-periods]
+    elif periods < 0:
+        result[..., :periods] = values[..., -periods:]
+    else:
+        result[...] = values
+    return result
+
+
+def _first_valid(values):
+    """
+    Her satırın ilk geçerli (NaN olmayan) değeri, (..., 1) şeklinde; hiç yoksa 0
+    """
+    valid = ~np.isnan(values)
+    first = np.take_along_axis(values, np.argmax(valid, axis=-1)[..., None], axis=-1)
+    return np.where(np.isnan(first), 0.0, first)
+
+
+def rolling_sum(values, window):
+    """
+    pandas rolling(window).sum() karşılığı. Kümülatif toplam farkıyla O(n) hesaplanır;
+    değerler satırın ilk geçerli değerine göre ötelenir (büyük fiyatlarda hassasiyet kaybını önler).
+    """
+    values = _as_float(values)
+    result = np.full_like(values, np.nan)
+    n = values.shape[-1]
+    if n < window:
+        return result
+
+    missing = np.isnan(values)
+    reference = _first_valid(values)
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    total = np.concatenate([zeros, np.cumsum(np.where(missing, 0.0, values - reference), axis=-1)], axis=-1)
+    gaps = np.concatenate([zeros, np.cumsum(missing, axis=-1)], axis=-1)
+
+    window_total = total[..., window:] - total[..., :-window] + window * reference
+    window_gaps = gaps[..., window:] - gaps[..., :-window]
+    result[..., window - 1:] = np.where(window_gaps > 0, np.nan, window_total)
+    return result
+
+
+def rolling_mean(values, window):
+    """
+    pandas rolling(window).mean() karşılığı: ilk window-1 değer ve NaN içeren pencereler NaN
+    """
+    return rolling_sum(values, window) / window
+
+
+def _window_reduce(values, window, reduce):
+    """
+    Pencere ofsetleri üzerinde döngüyle kayan indirgeme (np.minimum/np.maximum);
+    her adım tüm semboller ve zaman üzerinde vektöreldir
+    """
+    values = _as_float(values)
+    result = np.full_like(values, np.nan)
+    n = values.shape[-1]
+    if n >= window:
+        acc = values[..., :n - window + 1].copy()
+        for k in range(1, window):
+            reduce(acc, values[..., k:n - window + 1 + k], out=acc)
+        result[..., window - 1:] = acc
+    return result
+
+
+def rolling_std(values, window, ddof=1):
+    """
+    pandas rolling(window).std() karşılığı (örneklem standart sapması, iki geçişli)
+    """
+    values = _as_float(values)
+    mean = rolling_mean(values, window)
+    result = np.full_like(values, np.nan)
+    n = values.shape[-1]
+    if n >= window:
+        center = mean[..., window - 1:]
+        squares = np.zeros_like(center)
+        for k in range(window):
+            squares += (values[..., k:n - window + 1 + k] - center) ** 2
+        result[..., window - 1:] = np.sqrt(squares / (window - ddof))
+    return result
+
+
+def rolling_min(values, window):
+    return _window_reduce(values, window, np.minimum)
+
+
+def rolling_max(values, window):
+    return _window_reduce(values, window, np.maximum)
+
+
+def ema(values, span):
+    """
+    pandas ewm(span, adjust=False).mean() karşılığı. Baştaki NaN'lar (kısa geçmişli
+    sembollerin dolgusu) atlanır ve seri ilk geçerli değerden başlar; ara NaN beklenmez.
+    Özyineleme zaman boyunca sıralı, semboller boyunca vektöreldir.
+    """
+    values = _as_float(values)
+    alpha = 2.0 / (span + 1)
+    valid = ~np.isnan(values)
+    if values.shape[-1] == 0:
+        return values.copy()
+
+    # Dolguyu ilk geçerli değerle doldur: sabit serinin EMA'sı kendisidir
+    first = np.argmax(valid, axis=-1)
+    first_value = np.take_along_axis(values, first[..., None], axis=-1)
+    filled = np.where(np.cumsum(valid, axis=-1) == 0, first_value, values)
+
+    # Zaman ilk eksene alınır: her adım bitişik bellekte çalışır
+    steps = np.ascontiguousarray(np.moveaxis(filled, -1, 0))
+    result = np.empty_like(steps)
+    previous = steps[0]
+    result[0] = previous
+    for i in range(1, len(steps)):
+        previous = alpha * steps[i] + (1 - alpha) * previous
+        result[i] = previous
+
+    result = np.moveaxis(result, 0, -1)
+    result[~valid] = np.nan
+    return result
+
+
+def _pad_mask(values, reference):
+    """
+    reference NaN olan (dolgu) konumlarda values'u NaN yapar
+    """
+    values[np.isnan(reference)] = np.nan
+    return values
+
+
+def rsi(close, period=14):
+    """
+    Kayan ortalamalı RSI (DataCollector.calculate_rsi ile aynı); ilk fark 0 sayılır
+    """
+    close = _as_float(close)
+    delta = close - shift(close)
+    gain = _pad_mask(np.where(delta > 0, delta, 0.0), close)
+    loss = _pad_mask(np.where(delta < 0, -delta, 0.0), close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + rolling_mean(gain, period) / rolling_mean(loss, period)))
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger_bands(close, period=20, std_dev=2):
+    """
+    Dönüş: (orta, üst, alt)
+    """
+    middle = rolling_mean(close, period)
+    std = rolling_std(close, period)
+    return middle, middle + std * std_dev, middle - std * std_dev
+
+
+def adx(high, low, close, period=14):
+    """
+    SMA yumuşatmalı ADX; dönüş: (ADX, +DI, -DI)
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    up_move = high - shift(high)
+    down_move = shift(low) - low
+    plus_dm = _pad_mask(np.where(up_move > down_move, np.maximum(up_move, 0), 0.0), close)
+    minus_dm = _pad_mask(np.where(down_move > up_move, np.maximum(down_move, 0), 0.0), close)
+
+    tr14 = rolling_mean(true_range(high, low, close), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100 * rolling_mean(plus_dm, period) / tr14
+        minus_di = 100 * rolling_mean(minus_dm, period) / tr14
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return rolling_mean(dx, period), plus_di, minus_di
+
+
+def stoch_rsi(rsi_values, period=14, smoothK=3, smoothD=3):
+    """
+    Dönüş: (%K, %D)
+    """
+    lowest = rolling_min(rsi_values, period)
+    highest = rolling_max(rsi_values, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = rolling_mean(100 * (rsi_values - lowest) / (highest - lowest), smoothK)
+    return k, rolling_mean(k, smoothD)
+
+
+def true_range(high, low, close):
+    """
+    max(high-low, |high-önceki kapanış|, |low-önceki kapanış|); ilk mumda high-low
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = shift(close)
+    # fmax NaN'ı yok sayar: önceki kapanış yoksa high-low, mum yoksa (dolgu) NaN
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high, low, close, period=14):
+    """
+    Basit ortalamalı ATR (DataCollector.calculate_atr ile aynı)
+    """
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def _supertrend_bands_1d(close, upper_basic, lower_basic):
+    """
+    Tek sembol için bant özyinelemesi; sayısal işlemler Python float'larıyla yapılır
+    (tek elemanlı NumPy işlemlerinden çok daha hızlıdır)
+    """
+    n = len(close)
+    close = close.tolist()
+    upper = upper_basic.tolist()
+    lower = lower_basic.tolist()
+
+    for i in range(1, n):
+        prev_upper = upper[i - 1]
+        prev_lower = lower[i - 1]
+        # Karşılaştırmalar NaN'da False döner; min/max NaN davranışı orijinal döngüyle aynı
+        if close[i - 1] <= prev_upper:
+            upper[i] = min(upper[i], prev_upper)
+        if close[i - 1] >= prev_lower:
+            lower[i] = max(lower[i], prev_lower)
+
+    return np.array(upper), np.array(lower)
+
+
+def _supertrend_bands_2d(close, upper_basic, lower_basic):
+    """
+    Semboller boyunca vektörel, zaman boyunca sıralı bant özyinelemesi
+    """
+    # Zaman ilk eksende: her adım bitişik bellekte çalışır
+    close = np.ascontiguousarray(close.T)
+    upper = np.ascontiguousarray(upper_basic.T)
+    lower = np.ascontiguousarray(lower_basic.T)
+
+    for i in range(1, len(close)):
+        prev_upper = upper[i - 1]
+        prev_lower = lower[i - 1]
+        prev_close = close[i - 1]
+
+        # min(ub, önceki) == önceki < ub ise önceki, değilse ub (NaN dahil)
+        tighten_upper = prev_close <= prev_upper
+        upper[i] = np.where(tighten_upper & (prev_upper < upper[i]), prev_upper, upper[i])
+
+        tighten_lower = prev_close >= prev_lower
+        lower[i] = np.where(tighten_lower & (prev_lower > lower[i]), prev_lower, lower[i])
+
+    return upper.T, lower.T
+
+
+def supertrend(high, low, close, period=10, multiplier=3):
+    """
+    SuperTrend: kapanış üst bandın altındaysa üst bant, değilse alt bant.
+    1D girişte tek seri, 2D girişte (semboller x zaman) matris döndürür.
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+
+    average_range = atr(high, low, close, period)
+    median_price = (high + low) / 2
+    upper_basic = median_price + multiplier * average_range
+    lower_basic = median_price - multiplier * average_range
+
+    if close.ndim == 1:
+        upper, lower = _supertrend_bands_1d(close, upper_basic, lower_basic)
+    else:
+        upper, lower = _supertrend_bands_2d(close, upper_basic, lower_basic)
+
+    result = np.where(close <= upper, upper, lower)
+    result[..., 0] = np.nan
+    return result
+
+
+# default_indicators çıktı satırları: DataCollector.add_indicators'ın ürettiği sütunlar
+# (ADX düğümünün +DI/-DI çıktıları dahil)
+DEFAULT_COLUMNS = [
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist',
+    'EMA_9', 'EMA_20', 'EMA_50', 'EMA_200',
+    'BB_middle', 'BB_upper', 'BB_lower', 'ADX', 'DMP', 'DMN', 'SuperTrend'
+]
+
+
+def _default_recursions(close, upper_basic, lower_basic):
+    """
+    EMA 9/12/20/26/50/200, MACD sinyal çizgisi ve SuperTrend bantları tek zaman geçişinde
+    """
+    close = close.tolist()
+    upper = upper_basic.tolist()
+    lower = lower_basic.tolist()
+    n = len(close)
+    a9, a12, a20, a26, a50, a200, a_signal = (2.0 / (span + 1) for span in (9, 12, 20, 26, 50, 200, 9))
+
+    ema9, ema20, ema50, ema200, line, signal = ([0.0] * n for _ in range(6))
+    e9 = e12 = e20 = e26 = e50 = e200 = close[0]
+    s = 0.0
+    for i in range(n):
+        x = close[i]
+        if i:
+            e9 += a9 * (x - e9)
+            e12 += a12 * (x - e12)
+            e20 += a20 * (x - e20)
+            e26 += a26 * (x - e26)
+            e50 += a50 * (x - e50)
+            e200 += a200 * (x - e200)
+            m = e12 - e26
+            s += a_signal * (m - s)
+
+            # SuperTrend bantları (_supertrend_bands_1d ile aynı)
+            prev_close = close[i - 1]
+            if prev_close <= upper[i - 1]:
+                upper[i] = min(upper[i], upper[i - 1])
+            if prev_close >= lower[i - 1]:
+                lower[i] = max(lower[i], lower[i - 1])
+        else:
+            m = s = e12 - e26
+
+        ema9[i] = e9
+        ema20[i] = e20
+        ema50[i] = e50
+        ema200[i] = e200
+        line[i] = m
+        signal[i] = s
+
+    return ema9, ema20, ema50, ema200, line, signal, upper, lower
+
+
+def default_indicators(high, low, close, out=None):
+    """
+    Varsayılan indikatör setini (DEFAULT_COLUMNS) tek seferde, önceden ayrılmış
+    (sütunlar x zaman) tampona hesaplar. Tek sembol (1D) içindir; kapanışta NaN beklenmez.
+
+    Ortak ara değerler bir kez üretilir: fark/true range tek geçişte, aynı pencereli
+    kayan ortalamalar (RSI kazanç/kayıp, ATR, +DM/-DM) tek kümülatif toplamda,
+    tüm özyinelemeler (EMA'lar, MACD sinyali, SuperTrend) tek zaman döngüsünde.
+    Sonuçlar indicator_graph'ın pandas tanımlarıyla aynıdır.
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    n = len(close)
+    if out is None:
+        out = np.empty((len(DEFAULT_COLUMNS), n))
+    rows = dict(zip(DEFAULT_COLUMNS, out))
+    if n == 0:
+        return out
+
+    prev_close = shift(close)
+    delta = close - prev_close
+    up_move = high - shift(high)
+    down_move = shift(low) - low
+    # fmax NaN'ı yok sayar: ilk mumda high-low
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+    # 14'lük pencereler tek blokta: RSI kazanç/kayıp, ATR(14), +DM, -DM
+    block = np.empty((5, n))
+    np.copyto(block[0], np.where(delta > 0, delta, 0.0))
+    np.copyto(block[1], np.where(delta < 0, -delta, 0.0))
+    block[2] = tr
+    np.copyto(block[3], np.where(up_move > down_move, np.maximum(up_move, 0), 0.0))
+    np.copyto(block[4], np.where(down_move > up_move, np.maximum(down_move, 0), 0.0))
+    gain, loss, tr14, plus_dm, minus_dm = rolling_mean(block, 14)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(100, 1 + gain / loss, out=rows['RSI'])
+        np.subtract(100, rows['RSI'], out=rows['RSI'])
+
+        np.multiply(100, plus_dm / tr14, out=rows['DMP'])
+        np.multiply(100, minus_dm / tr14, out=rows['DMN'])
+        dx = 100 * np.abs(rows['DMP'] - rows['DMN']) / (rows['DMP'] + rows['DMN'])
+    rows['ADX'][:] = rolling_mean(dx, 14)
+
+    # Bollinger: ortalama ve iki geçişli standart sapma
+    middle = rows['BB_middle']
+    middle[:] = rolling_mean(close, 20)
+    deviation = np.full(n, np.nan)
+    if n >= 20:
+        center = middle[19:]
+        squares = np.zeros_like(center)
+        for k in range(20):
+            squares += (close[k:n - 19 + k] - center) ** 2
+        deviation[19:] = np.sqrt(squares / 19)
+    np.add(middle, 2 * deviation, out=rows['BB_upper'])
+    np.subtract(middle, 2 * deviation, out=rows['BB_lower'])
+
+    # SuperTrend(10, 3) bant başlangıçları
+    average_range = rolling_mean(tr, 10)
+    median_price = (high + low) / 2
+    upper_basic = median_price + 3 * average_range
+    lower_basic = median_price - 3 * average_range
+
+    ema9, ema20, ema50, ema200, line, signal, upper, lower = _default_recursions(close, upper_basic, lower_basic)
+    rows['EMA_9'][:] = ema9
+    rows['EMA_20'][:] = ema20
+    rows['EMA_50'][:] = ema50
+    rows['EMA_200'][:] = ema200
+    rows['MACD'][:] = line
+    rows['MACD_Signal'][:] = signal
+    np.subtract(rows['MACD'], rows['MACD_Signal'], out=rows['MACD_Hist'])
+
+    upper = np.asarray(upper)
+    lower = np.asarray(lower)
+    np.copyto(rows['SuperTrend'], np.where(close <= upper, upper, lower))
+    rows['SuperTrend'][0] = np.nan
+    return out
+
+
+def session_cumsum(values, timestamps=None, session_ms=86400000):
+    """
+    Son eksende kümülatif toplam; zaman damgaları (ms) verilirse her seans başında sıfırlanır
+    """
+    values = _as_float(values)
+    total = np.cumsum(values, axis=-1)
+    if timestamps is None:
+        return total
+
+    session = np.asarray(timestamps, dtype='int64') // session_ms
+    starts = np.zeros(session.shape[-1], dtype='bool')
+    starts[0] = True
+    starts[1:] = session[1:] != session[:-1]
+
+    # Her satır için seans başlamadan önceki kümülatif toplamı çıkar
+    start_index = np.maximum.accumulate(np.where(starts, np.arange(len(starts)), 0))
+    before = np.concatenate([np.zeros(values.shape[:-1] + (1,)), total[..., :-1]], axis=-1)
+    return total - before[..., start_index]
+
+
+FLOW_INDICATORS = ('OBV', 'AD', 'VWAP', 'MFI', 'CMF')
+
+
+def flow_indicators(high, low, close, volume, timestamps=None, names=FLOW_INDICATORS,
+                    mfi_period=14, cmf_period=20, session_ms=86400000):
+    """
+    Hacim akışı indikatörlerini tek geçişte hesaplar; ortak ara değerler
+    (tipik fiyat, para akışı, akış çarpanı) bir kez üretilir.
+
+    - OBV: kapanış yönüne göre işaretli kümülatif hacim (ilk değer 0)
+    - AD: Accumulation/Distribution çizgisi
+    - VWAP: zaman damgaları verilirse günlük (UTC) seansta sıfırlanır
+    - MFI, CMF: DataCollector.calculate_mfi / calculate_cmf ile aynı tanım
+    Dönüş: {isim: dizi}
+    """
+    high, low, close, volume = _as_float(high), _as_float(low), _as_float(close), _as_float(volume)
+    names = set(names)
+    result = {}
+
+    if 'OBV' in names:
+        direction = np.sign(np.diff(close, axis=-1, prepend=close[..., :1]))
+        result['OBV'] = np.cumsum(direction * volume, axis=-1)
+
+    if names & {'AD', 'CMF'}:
+        price_range = high - low
+        with np.errstate(divide='ignore', invalid='ignore'):
+            multiplier = np.where(price_range > 0, ((close - low) - (high - close)) / price_range, 0.0)
+        flow_volume = multiplier * volume
+        if 'AD' in names:
+            result['AD'] = np.cumsum(flow_volume, axis=-1)
+        if 'CMF' in names:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result['CMF'] = rolling_sum(flow_volume, cmf_period) / rolling_sum(volume, cmf_period)
+
+    if names & {'VWAP', 'MFI'}:
+        typical_price = (high + low + close) / 3
+        money_flow = typical_price * volume
+
+        if 'VWAP' in names:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result['VWAP'] = (session_cumsum(money_flow, timestamps, session_ms) /
+                                  session_cumsum(volume, timestamps, session_ms))
+
+        if 'MFI' in names:
+            prev_typical = shift(typical_price)
+            positive = rolling_sum(np.where(typical_price > prev_typical, money_flow, 0.0), mfi_period)
+            negative = rolling_sum(np.where(typical_price < prev_typical, money_flow, 0.0), mfi_period)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                result['MFI'] = 100 - (100 / (1 + positive / negative))
+
+    return result
@@ -0,0 +1,271 @@
+import asyncio
+import ccxt
+import json
+import os
+import time
+
+BINANCE_FUTURES_WS_URL = 'wss://fstream.binance.com/stream'
+
+# API üzerinden oynatılabilecek kayıtlı kline dosyalarının klasörü
+RECORDINGS_DIR = os.path.join('data', 'recordings')
+
+
+def stream_symbol_id(symbol):
+    """
+    'BTC/USDT' (veya 'BTC/USDT:USDT') -> 'BTCUSDT'
+    """
+    return symbol.split(':')[0].replace('/', '').upper()
+
+
+def recording_path(name, base_dir=RECORDINGS_DIR):
+    """
+    Kayıt klasörü içindeki dosyanın yolu; klasör dışına çıkan veya olmayan dosya için ValueError
+    """
+    base = os.path.realpath(base_dir)
+    path = os.path.realpath(os.path.join(base, name))
+    if os.path.commonpath([base, path]) != base or not os.path.isfile(path):
+        raise ValueError(f"Kayıt dosyası bulunamadı: {name}")
+    return path
+
+
+def parse_kline_event(message):
+    """
+    Binance kline mesajını (tekli veya birleşik stream formatı) sade bir sözlüğe çevirir.
+    Kline olmayan mesajlar için None döner.
+    """
+    if isinstance(message, (str, bytes)):
+        message = json.loads(message)
+
+    data = message.get('data', message)
+    if data.get('e') != 'kline' or 'k' not in data:
+        return None
+
+    k = data['k']
+    return {
+        'symbol_id': k.get('s', data.get('s')),
+        'timeframe': k['i'],
+        'timestamp': int(k['t']),
+        'open': float(k['o']),
+        'high': float(k['h']),
+        'low': float(k['l']),
+        'close': float(k['c']),
+        'volume': float(k['v']),
+        'closed': bool(k['x']),
+        'event_time': int(data.get('E', 0))
+    }
+
+
+class BinanceWebSocketTransport:
+    """
+    Binance futures kline websocket akışı. `websockets` paketi gerektirir.
+    Bağlantı koparsa artan bekleme süresiyle yeniden bağlanır.
+    """
+
+    def __init__(self, symbols, timeframes, url=BINANCE_FUTURES_WS_URL, max_backoff=60):
+        streams = [
+            f"{stream_symbol_id(symbol).lower()}@kline_{timeframe}"
+            for symbol in symbols for timeframe in timeframes
+        ]
+        self.url = f"{url}?streams={'/'.join(streams)}"
+        self.max_backoff = max_backoff
+        self.running = True
+
+    async def events(self):
+        try:
+            import websockets
+        except ImportError:
+            raise ImportError("Websocket akışı için 'websockets' paketi gerekli: pip install websockets")
+
+        backoff = 1
+        while self.running:
+            try:
+                async with websockets.connect(self.url, ping_interval=20) as ws:
+                    backoff = 1
+                    async for message in ws:
+                        yield message
+            except Exception as e:
+                if not self.running:
+                    break
+                print(f"Websocket bağlantı hatası: {str(e)} - {backoff}s sonra tekrar denenecek")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def close(self):
+        self.running = False
+
+
+class FileReplayTransport:
+    """
+    Satır başına bir JSON kline mesajı içeren dosyayı akış gibi oynatır (test ve ölçüm için).
+    delay verilirse mesajlar arasında o kadar saniye beklenir.
+    """
+
+    def __init__(self, path, delay=0.0):
+        self.path = path
+        self.delay = delay
+        self.running = True
+
+    async def events(self):
+        with open(self.path, 'r') as f:
+            for line in f:
+                if not self.running:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                yield line
+                # Diğer görevlerin (sinyal analizleri) çalışabilmesi için kontrolü bırak
+                await asyncio.sleep(self.delay)
+
+    def close(self):
+        self.running = False
+
+
+class SocketTransport:
+    """
+    TCP soketten satır satır JSON kline mesajları okur (yerel sahte borsa beslemesi için)
+    """
+
+    def __init__(self, host='127.0.0.1', port=9000):
+        self.host = host
+        self.port = port
+        self.running = True
+
+    async def events(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while self.running:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if line:
+                    yield line
+        finally:
+            writer.close()
+
+    def close(self):
+        self.running = False
+
+
+class KlineStream:
+    """
+    Kline olaylarını tüketir, açık mumları bellekte tutar ve mum kapandığında
+    mumu depoya yazıp dinleyicileri tetikler.
+
+    Dinleyiciler normal fonksiyon veya coroutine olabilir:
+        listener(symbol, timeframe, candle)
+    Coroutine dinleyiciler ayrı görev olarak başlatılır, böylece akış beklemez.
+    """
+
+    def __init__(self, symbols, timeframes, transport=None, candle_store=None):
+        self.symbols = list(symbols)
+        self.timeframes = list(timeframes)
+        self.transport = transport or BinanceWebSocketTransport(self.symbols, self.timeframes)
+        self.candle_store = candle_store
+        self.live_candles = {}  # (sembol, zaman dilimi) -> açık mum
+        self.last_closed = {}  # (sembol, zaman dilimi) -> son kapanan mum
+        self._symbol_map = {stream_symbol_id(symbol): symbol for symbol in self.symbols}
+        self._close_listeners = []
+        self._update_listeners = []
+        self._tasks = set()
+        self.gaps = set()  # Depoda kapanan mumdan önce eksik mum olan (sembol, zaman dilimi)
+        self.stats = {'events': 0, 'closed': 0, 'last_close_latency_ms': None}
+
+    def add_close_listener(self, listener):
+        self._close_listeners.append(listener)
+
+    def add_update_listener(self, listener):
+        self._update_listeners.append(listener)
+
+    async def run(self):
+        """
+        Akış bitene (veya stop çağrılana) kadar olayları işler
+        """
+        async for message in self.transport.events():
+            try:
+                self.process_message(message)
+            except Exception as e:
+                print(f"Kline işleme hatası: {str(e)}")
+
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stop(self):
+        self.transport.close()
+
+    def process_message(self, message):
+        event = parse_kline_event(message)
+        if event is None:
+            return None
+
+        symbol = self._symbol_map.get(event['symbol_id'], event['symbol_id'])
+        timeframe = event['timeframe']
+        key = (symbol, timeframe)
+        candle = {
+            'timestamp': event['timestamp'],
+            'open': event['open'],
+            'high': event['high'],
+            'low': event['low'],
+            'close': event['close'],
+            'volume': event['volume']
+        }
+        self.stats['events'] += 1
+
+        if not event['closed']:
+            self.live_candles[key] = candle
+            self._notify(self._update_listeners, symbol, timeframe, candle)
+            return candle
+
+        # Aynı mum için tekrar gelen kapanış olayını yok say
+        previous = self.last_closed.get(key)
+        if previous is not None and previous['timestamp'] >= candle['timestamp']:
+            return candle
+
+        self.live_candles.pop(key, None)
+        self.last_closed[key] = candle
+
+        if self.candle_store is not None:
+            last_timestamp = self.candle_store.last_timestamp(symbol, timeframe)
+            timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+            if last_timestamp is None or candle['timestamp'] - last_timestamp > timeframe_ms:
+                self.gaps.add(key)
+
+            self.candle_store.write(symbol, timeframe, [[
+                candle['timestamp'], candle['open'], candle['high'],
+                candle['low'], candle['close'], candle['volume']
+            ]])
+
+        self.stats['closed'] += 1
+        if event['event_time']:
+            self.stats['last_close_latency_ms'] = time.time() * 1000 - event['event_time']
+
+        self._notify(self._close_listeners, symbol, timeframe, candle)
+        return candle
+
+    def _notify(self, listeners, symbol, timeframe, candle):
+        for listener in listeners:
+            try:
+                result = listener(symbol, timeframe, candle)
+                if asyncio.iscoroutine(result):
+                    task = asyncio.ensure_future(result)
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            except Exception as e:
+                print(f"Kline dinleyici hatası ({symbol} {timeframe}): {str(e)}")
+
+    def consume_gap(self, symbol, timeframe):
+        """
+        Depoda bu mumdan önce eksik mum varsa True döner ve işareti kaldırır
+        """
+        key = (symbol, timeframe)
+        if key in self.gaps:
+            self.gaps.discard(key)
+            return True
+        return False
+
+    def get_live_candle(self, symbol, timeframe):
+        """
+        Henüz kapanmamış güncel mum (yoksa None)
+        """
+        return self.live_candles.get((symbol, timeframe))
@@ -2,6 +2,10 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import MinMaxScaler
 import numpy as np
 import pandas as pd
+import indicator_graph
+
+# prepare_features'ın kullandığı indikatör sütunları
+FEATURE_INDICATORS = ['RSI', 'MACD', 'MACD_Signal', 'BB_upper', 'BB_lower', 'ADX', 'MA20', 'MA50']
 
 class ModelTrainer:
     def __init__(self):
@@ -14,6 +18,9 @@ class ModelTrainer:
         
     def prepare_features(self, data, symbol=None):
         """Veriyi eğitim için hazırla"""
+        if isinstance(data, pd.DataFrame):
+            indicator_graph.ensure(data, FEATURE_INDICATORS)
+        
         features = pd.DataFrame()
         
         # Teknik indikatörler
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+
+class _InFlightCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class RequestCoalescer:
+    """
+    Aynı anahtar için gelen eşzamanlı istekleri tek bir çalıştırmada birleştirir
+    (single-flight) ve sonucu `ttl` saniye boyunca önbellekte tutar.
+
+    Hem thread'ler (do) hem de asyncio görevleri (do_async) için kullanılabilir;
+    ikisi aynı sonuç önbelleğini paylaşır.
+    """
+
+    def __init__(self, ttl=15.0, max_entries=2048):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._results = {}  # anahtar -> (zaman, sonuç)
+        self._inflight = {}  # anahtar -> _InFlightCall
+        self._async_inflight = {}  # anahtar -> asyncio.Future
+        self.stats = {'cache_hits': 0, 'shared': 0, 'executed': 0}
+
+    def _get_fresh(self, key):
+        cached = self._results.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            self.stats['cache_hits'] += 1
+            return True, cached[1]
+        return False, None
+
+    def _store(self, key, result):
+        if result is None:
+            return
+
+        now = time.monotonic()
+        self._results[key] = (now, result)
+
+        if len(self._results) > self.max_entries:
+            # Süresi dolanları temizle
+            expired = [k for k, (ts, _) in self._results.items() if now - ts >= self.ttl]
+            for k in expired:
+                del self._results[k]
+
+    def do(self, key, fn):
+        """
+        fn() sonucunu döndürür; aynı anahtar için çalışan bir çağrı varsa onu bekler
+        """
+        with self._lock:
+            found, result = self._get_fresh(key)
+            if found:
+                return result
+
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlightCall()
+                self._inflight[key] = call
+            else:
+                self.stats['shared'] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            self.stats['executed'] += 1
+            call.result = fn()
+            with self._lock:
+                self._store(key, call.result)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    async def do_async(self, key, coro_fn):
+        """
+        await coro_fn() sonucunu döndürür; aynı anahtar için bekleyen bir görev varsa onu bekler
+        """
+        with self._lock:
+            found, result = self._get_fresh(key)
+            if found:
+                return result
+
+            future = self._async_inflight.get(key)
+            if future is not None:
+                self.stats['shared'] += 1
+
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_inflight[key] = future
+
+        try:
+            self.stats['executed'] += 1
+            result = await coro_fn()
+            with self._lock:
+                self._store(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Bekleyen yoksa "never retrieved" uyarısını engelle
+            raise
+        finally:
+            self._async_inflight.pop(key, None)
+
+    def invalidate(self, key=None):
+        """
+        Önbelleği (veya tek bir anahtarı) temizler
+        """
+        with self._lock:
+            if key is None:
+                self._results.clear()
+            else:
+                self._results.pop(key, None)
+
+
+_default_coalescer = None
+_default_lock = threading.Lock()
+
+
+def get_coalescer():
+    """
+    Süreç genelinde paylaşılan birleştiriciyi döndürür
+    """
+    global _default_coalescer
+    with _default_lock:
+        if _default_coalescer is None:
+            _default_coalescer = RequestCoalescer()
+        return _default_coalescer
@@ -0,0 +1,218 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+# Öncelik sınıfları (küçük değer önce çalışır)
+PRIORITY_POSITION = 0  # Açık pozisyon fiyat kontrolleri
+PRIORITY_SCAN = 1      # Rutin sinyal taramaları
+PRIORITY_BACKFILL = 2  # Geçmiş veri doldurma
+
+PRIORITY_NAMES = {
+    PRIORITY_POSITION: 'position',
+    PRIORITY_SCAN: 'scan',
+    PRIORITY_BACKFILL: 'backfill'
+}
+
+# Binance IP bazlı dakikalık ağırlık limitleri
+WEIGHT_LIMITS = {
+    ('binance', 'future'): 2400,
+    ('binance', 'spot'): 6000
+}
+SAFETY_MARGIN = 0.8  # Limitin sadece %80'ini kullan
+
+# Uç nokta ağırlıkları (Binance dokümantasyonuna göre)
+ENDPOINT_WEIGHTS = {
+    'fetch_ticker': 1,
+    'fetch_tickers': 40,
+    'fetch_balance': 5,
+    'load_markets': 1
+}
+
+
+def ohlcv_weight(limit):
+    """
+    Kline isteğinin ağırlığı `limit` değerine bağlıdır (varsayılan limit 500)
+    """
+    limit = 500 if limit is None else limit
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def endpoint_weight(endpoint, limit=None):
+    if endpoint == 'fetch_ohlcv':
+        return ohlcv_weight(limit)
+    return ENDPOINT_WEIGHTS.get(endpoint, 1)
+
+
+class RequestScheduler:
+    """
+    Tüm borsa çağrıları için merkezi, öncelikli token-bucket zamanlayıcı.
+
+    Kova `capacity` ağırlık tutar ve saniyede `refill_rate` ağırlık dolar.
+    Bekleyenler öncelik sırasına göre (aynı öncelikte geliş sırasına göre)
+    servis edilir; böylece pozisyon kontrolleri taramaların arkasında beklemez.
+    Thread'ler (acquire) ve asyncio görevleri (acquire_async) aynı kovayı paylaşır.
+    """
+
+    def __init__(self, weight_per_minute=2400, safety_margin=SAFETY_MARGIN):
+        self.capacity = weight_per_minute * safety_margin
+        self.refill_rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+        self._condition = threading.Condition()
+        self._waiters = []  # (öncelik, sıra) heap'i
+        self._sequence = itertools.count()
+
+        self.stats = {
+            'granted': {name: 0 for name in PRIORITY_NAMES.values()},
+            'weight': {name: 0 for name in PRIORITY_NAMES.values()},
+            'wait_seconds': {name: 0.0 for name in PRIORITY_NAMES.values()}
+        }
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def _try_take(self, entry, cost):
+        """
+        Sıradaki bekleyen bu istekse ve yeterli token varsa token düşer.
+        Dönüş: (alındı mı, tahmini bekleme süresi)
+        """
+        self._refill()
+        if self._waiters[0] != entry:
+            return False, 0.05
+
+        if self.tokens >= cost:
+            self.tokens -= cost
+            heapq.heappop(self._waiters)
+            return True, 0.0
+
+        return False, (cost - self.tokens) / self.refill_rate
+
+    def _record(self, priority, cost, started):
+        name = PRIORITY_NAMES.get(priority, str(priority))
+        self.stats['granted'][name] = self.stats['granted'].get(name, 0) + 1
+        self.stats['weight'][name] = self.stats['weight'].get(name, 0) + cost
+        self.stats['wait_seconds'][name] = self.stats['wait_seconds'].get(name, 0.0) + time.monotonic() - started
+
+    def acquire(self, cost=1, priority=PRIORITY_SCAN):
+        """
+        Yeterli ağırlık birikene ve sıra bu isteğe gelene kadar bekler
+        """
+        cost = min(cost, self.capacity)
+        started = time.monotonic()
+
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, entry)
+
+            while True:
+                taken, wait = self._try_take(entry, cost)
+                if taken:
+                    self._record(priority, cost, started)
+                    self._condition.notify_all()
+                    return
+                self._condition.wait(timeout=wait)
+
+    async def acquire_async(self, cost=1, priority=PRIORITY_SCAN):
+        """
+        acquire'ın event loop'u bloklamayan sürümü
+        """
+        cost = min(cost, self.capacity)
+        started = time.monotonic()
+
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, entry)
+
+        try:
+            while True:
+                with self._condition:
+                    taken, wait = self._try_take(entry, cost)
+                    if taken:
+                        self._record(priority, cost, started)
+                        self._condition.notify_all()
+                        return
+                await asyncio.sleep(min(wait, 1.0))
+        except asyncio.CancelledError:
+            with self._condition:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._condition.notify_all()
+            raise
+
+    def call(self, fn, *args, endpoint=None, priority=PRIORITY_SCAN, cost=None, **kwargs):
+        """
+        Token alındıktan sonra fn(*args, **kwargs) çağrısını yapar
+        """
+        if cost is None:
+            cost = endpoint_weight(endpoint or getattr(fn, '__name__', ''), kwargs.get('limit'))
+        self.acquire(cost, priority)
+        return fn(*args, **kwargs)
+
+    async def call_async(self, fn, *args, endpoint=None, priority=PRIORITY_SCAN, cost=None, **kwargs):
+        """
+        Token alındıktan sonra await fn(*args, **kwargs) çağrısını yapar
+        """
+        if cost is None:
+            cost = endpoint_weight(endpoint or getattr(fn, '__name__', ''), kwargs.get('limit'))
+        await self.acquire_async(cost, priority)
+        return await fn(*args, **kwargs)
+
+    def metrics(self):
+        """
+        Kuyruk derinliği ve kullanım istatistikleri
+        """
+        with self._condition:
+            self._refill()
+            queue_depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._waiters:
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                queue_depth[name] = queue_depth.get(name, 0) + 1
+
+            return {
+                'tokens': round(self.tokens, 1),
+                'capacity': self.capacity,
+                'queue_depth': queue_depth,
+                'granted': dict(self.stats['granted']),
+                'weight': dict(self.stats['weight']),
+                'avg_wait_seconds': {
+                    name: (self.stats['wait_seconds'][name] / count if count else 0.0)
+                    for name, count in self.stats['granted'].items()
+                }
+            }
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(exchange_id='binance', default_type='future'):
+    """
+    Aynı (borsa, piyasa tipi) için süreç genelinde tek zamanlayıcı döndürür
+    """
+    key = (exchange_id, default_type)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = RequestScheduler(WEIGHT_LIMITS.get(key, 1200))
+            _schedulers[key] = scheduler
+        return scheduler
+
+
+def get_scheduler_for(exchange):
+    """
+    Borsa istemcisinin kimliğine göre zamanlayıcıyı döndürür
+    """
+    options = getattr(exchange, 'options', None) or {}
+    return get_scheduler(getattr(exchange, 'id', 'binance'), options.get('defaultType', 'spot'))
@@ -0,0 +1,213 @@
+"""
+Güven skorlarının tüm seri için vektörel hesabı.
+
+SignalGenerator.calculate_confidence_score ve calculate_sat_confidence_score sadece son
+mumu değerlendirir. Buradaki fonksiyonlar her mum için, o mumda biten çerçeve canlı
+fonksiyona verilmiş gibi skoru tek geçişte hesaplar (geleceğe bakmadan); son mumdaki
+değer canlı fonksiyonla aynıdır. Backtest ve model etiketleri için temel katmandır.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+import indicator_graph
+from candle_frame import get_levels
+from candlestick_patterns import patterns, BULLISH_PATTERNS, BEARISH_PATTERNS
+from swing_levels import swing_points
+from volume_profile import compute_profiles
+
+HISTORY_INDICATORS = ['EMA_20', 'EMA_50', 'ATR', 'RSI', 'MACD_Hist', 'ADX', 'BB_middle', 'Volume_MA20']
+
+# Kayan hacim profili satır bloğu: (satır x lookback x kutu) ara dizileri sınırlı kalır
+PROFILE_CHUNK = 256
+
+
+def trend_history(df):
+    """
+    SignalGenerator.determine_trend'in her mum için karşılığı
+    """
+    indicator_graph.ensure(df, ['EMA_20', 'EMA_50'])
+    open_, high, low, close = (df[name].to_numpy(dtype='float64') for name in ('open', 'high', 'low', 'close'))
+    ema20 = df['EMA_20'].to_numpy(dtype='float64')
+    ema50 = df['EMA_50'].to_numpy(dtype='float64')
+
+    # 20 mum önceki kapanış (iloc[-20]); daha kısa geçmişte canlı fonksiyon "Belirsiz" döner
+    first = np.full_like(close, np.nan)
+    first[19:] = close[:-19] if len(close) > 19 else close[:0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change = (close - first) / first * 100
+    short = np.arange(len(close)) < 19
+
+    labels = np.select(
+        [(close > ema20) & (ema20 > ema50),
+         (close < ema20) & (ema20 < ema50),
+         short,
+         price_change > 2,
+         price_change < -2],
+        ["Yukarı", "Aşağı", "Belirsiz", "Yukarı", "Aşağı"],
+        default="Yatay"
+    )
+    return pd.Series(labels, index=df.index)
+
+
+def swing_support_history(high, low, price, window=5, max_levels=50):
+    """
+    Her mum için, o muma kadar kesinleşmiş son `max_levels` dipten fiyatın altındaki
+    (veya eşit) en yakını; yoksa NaN. SwingLevels(window, max_levels) ile aynı kurallar.
+    """
+    low = np.asarray(low, dtype='float64')
+    price = np.asarray(price, dtype='float64')
+    _, is_low = swing_points(high, low, window)
+
+    positions = np.flatnonzero(is_low)
+    # t. mumda kesinleşmiş dip sayısı: konumu t - window'a kadar olanlar
+    confirmed = np.searchsorted(positions, np.arange(len(low)) - window, side='right')
+
+    # k. satır: k'dan önceki son max_levels dip (eksik yerler NaN)
+    padded = np.concatenate([np.full(max_levels, np.nan), low[positions]])
+    candidates = sliding_window_view(padded, max_levels)[confirmed]
+
+    with np.errstate(invalid='ignore'):
+        eligible = candidates <= price[:, None]
+    best = np.where(eligible, candidates, -np.inf).max(axis=1)
+    return np.where(np.isfinite(best), best, np.nan)
+
+
+def profile_support_history(high, low, close, volume, lookback=100, bins=50):
+    """
+    Her mum için son `lookback` mumun hacim profilinden (POC, VAL, HVN) kapanışın altındaki
+    en yakın seviye; DataCollector.add_volume_profile ile aynı parametreler. Yoksa NaN.
+    """
+    arrays = []
+    for values in (high, low, close, volume):
+        values = np.asarray(values, dtype='float64')
+        # Kısa geçmişli mumların penceresi NaN ile doldurulur; dolgu profile hacim eklemez
+        arrays.append(sliding_window_view(np.concatenate([np.full(lookback - 1, np.nan), values]), lookback))
+
+    price = np.asarray(close, dtype='float64')
+    result = np.full(len(price), np.nan)
+    for start in range(0, len(price), PROFILE_CHUNK):
+        rows = slice(start, start + PROFILE_CHUNK)
+        profiles = compute_profiles(*(values[rows] for values in arrays), lookback=lookback, bins=bins)
+        for offset, profile in enumerate(profiles):
+            i = start + offset
+            candidates = [level for level in (profile['poc'], profile['val'], *profile['hvn'])
+                          if level == level and level <= price[i]]
+            if candidates:
+                result[i] = max(candidates)
+    return result
+
+
+def _all_last3(condition):
+    """
+    Her mumda son 3 mumun (kısa geçmişte mevcut olanların) hepsi koşulu sağlıyor mu
+    """
+    result = condition.copy()
+    result[1:] &= condition[:-1]
+    result[2:] &= condition[:-2]
+    return result
+
+
+def _any_pattern(open_, high, low, close, names):
+    """
+    Her mumda verilen formasyonlardan biri var mı (SignalGenerator.has_pattern karşılığı)
+    """
+    return np.any(list(patterns(open_, high, low, close, names=names).values()), axis=0)
+
+
+def confidence_history(df, window=5, max_levels=50, profile_lookback=100, profile_bins=50):
+    """
+    calculate_confidence_score'un her mum için değeri (pd.Series).
+
+    Destek, çerçeveden kurulan tepe/dip indeksidir (symbol verilmeden çağrılan canlı
+    fonksiyon gibi). Çerçevede hacim profili seviyeleri varsa (prepare_timeframe_frame),
+    her mum için aynı parametrelerle kayan profil hesaplanır ve yakın olan destek alınır.
+    """
+    indicator_graph.ensure(df, HISTORY_INDICATORS)
+    trends = trend_history(df).to_numpy()
+
+    open_, high, low, close, volume = (df[name].to_numpy(dtype='float64')
+                                       for name in ('open', 'high', 'low', 'close', 'volume'))
+    hist = df['MACD_Hist'].to_numpy(dtype='float64')
+    volume_ma = df['Volume_MA20'].to_numpy(dtype='float64')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volatility = df['ATR'].to_numpy(dtype='float64') / close * 100
+
+    # 1. Volatilite (%20)
+    low_volatility = volatility <= 3
+    score = np.where(low_volatility, 20, 0)
+    conditions = low_volatility.astype('int64')
+
+    # 2. Trend ve momentum (%30 + MACD %10)
+    up = trends == "Yukarı"
+    bullish_candles = up & _all_last3(close > open_)
+    score += np.where(bullish_candles, 30, 0)
+    conditions += bullish_candles
+
+    previous_hist = np.concatenate([[np.nan], hist[:-1]])
+    score += np.where(up & (hist > 0) & (hist > previous_hist), 10, 0)
+
+    # Dönüş formasyonu onayı (%10)
+    score += np.where(up & _any_pattern(open_, high, low, close, BULLISH_PATTERNS), 10, 0)
+
+    # 3. Destekten %0.5-%2 uzaklık (%25)
+    support = swing_support_history(high, low, close, window, max_levels)
+    if np.isfinite(get_levels(df).poc):
+        support = np.fmax(support, profile_support_history(high, low, close, volume, profile_lookback, profile_bins))
+    with np.errstate(invalid='ignore'):
+        distance = (close - support) / close * 100
+    near_support = (distance >= 0.5) & (distance <= 2)
+    score += np.where(near_support, 25, 0)
+    conditions += near_support
+
+    # 4. Hacim (%25)
+    volume_surge = _all_last3(volume > volume_ma) & (volume > volume_ma * 1.5)
+    score += np.where(volume_surge, 25, 0)
+    conditions += volume_surge
+
+    result = np.where((volatility > 5) | (conditions < 3) | (score < 85), 0, score)
+    return pd.Series(result, index=df.index)
+
+
+def sat_confidence_history(df):
+    """
+    calculate_sat_confidence_score'un her mum için değeri (pd.Series); indicators
+    sözlüğü analyze_signals'taki gibi o mumun trend, RSI, MACD histogramı ve ADX'idir.
+    """
+    indicator_graph.ensure(df, HISTORY_INDICATORS)
+    trends = trend_history(df).to_numpy()
+
+    open_, high, low, close = (df[name].to_numpy(dtype='float64') for name in ('open', 'high', 'low', 'close'))
+    ema20 = df['EMA_20'].to_numpy(dtype='float64')
+    ema50 = df['EMA_50'].to_numpy(dtype='float64')
+    rsi = df['RSI'].to_numpy(dtype='float64')
+    hist = df['MACD_Hist'].to_numpy(dtype='float64')
+    previous_hist = np.concatenate([[np.nan], hist[:-1]])
+
+    # 1. Trend ve EMA dizilimi (%30, kısmi %15)
+    down = trends == "Aşağı"
+    aligned = down & (close < ema20) & (ema20 < ema50)
+    score = np.where(aligned, 30, np.where(down & (close < ema20), 15, 0))
+    conditions = aligned.astype('int64')
+
+    # Dönüş formasyonu onayı (%10)
+    score += np.where(down & _any_pattern(open_, high, low, close, BEARISH_PATTERNS), 10, 0)
+
+    # 2. RSI + MACD (%25)
+    momentum = (rsi >= 60) & (rsi <= 80) & (hist < 0) & (hist < previous_hist)
+    score += np.where(momentum, 25, 0)
+    conditions += momentum
+
+    # 3. ADX (%20), 4. hacim (%15), 5. Bollinger orta bandı (%10)
+    for condition, points in ((df['ADX'].to_numpy(dtype='float64') > 25, 20),
+                              (df['volume'].to_numpy(dtype='float64') > df['Volume_MA20'].to_numpy(dtype='float64'), 15),
+                              (close < df['BB_middle'].to_numpy(dtype='float64'), 10)):
+        score += np.where(condition, points, 0)
+        conditions += condition
+
+    result = np.select(
+        [conditions >= 5, conditions == 4, conditions == 3],
+        [100, np.minimum(95, score + 10), np.minimum(85, score)],
+        default=np.minimum(70, score)
+    )
+    return pd.Series(result, index=df.index)
@@ -0,0 +1,203 @@
+"""
+Sembol evreni üzerinde toplu sinyal taraması.
+
+SignalGenerator.analyze_signals'ın giriş kuralları (trend, güven skoru, ani yükseliş,
+MACD kesişimi, BB daralması) son mumların sütunsal anlık görüntüsü üzerinde dizi
+ifadeleriyle değerlendirilir: yüzlerce sembol tek seferde taranır ve sadece koşulu
+sağlayanlar sembol başına mesajlaşma yoluna gönderilir.
+"""
+import numpy as np
+from swing_levels import swing_points
+from candlestick_patterns import latest as latest_patterns, BULLISH_PATTERNS
+
+# Kuralların geriye baktığı en uzun aralık (trend için 20 mum önceki kapanış, BB genişlik ortalaması)
+SCAN_DEPTH = 20
+
+SCAN_FIELDS = [
+    'open', 'high', 'low', 'close', 'volume', 'EMA_20', 'EMA_50', 'ATR', 'MACD_Hist',
+    'BB_upper', 'BB_middle', 'BB_lower', 'Volume_MA20'
+]
+
+TREND_UP = "Yukarı"
+TREND_DOWN = "Aşağı"
+TREND_FLAT = "Yatay"
+
+
+def nearest_swing_support(high, low, price, window=5, max_levels=50):
+    """
+    Sembol başına fiyatın altındaki (veya eşit) en yakın kesinleşmiş dip, yoksa NaN.
+    SwingLevels gibi sadece en son `max_levels` dip dikkate alınır.
+    high/low: (semboller x zaman), price: (semboller,)
+    """
+    _, is_low = swing_points(high, low, window)
+    low = np.asarray(low, dtype='float64')
+
+    # Her dipten sonra (kendisi dahil) kaç dip var: en yeni max_levels dip
+    rank = np.cumsum(is_low[:, ::-1], axis=1)[:, ::-1]
+    candidates = is_low & (rank <= max_levels) & (low <= np.asarray(price)[:, None])
+
+    best = np.where(candidates, low, -np.inf).max(axis=1)
+    return np.where(np.isfinite(best), best, np.nan)
+
+
+def profile_support(profiles, price):
+    """
+    Hacim profili seviyelerinden (POC, VAL, HVN) fiyatın altındaki en yakını, yoksa NaN.
+    profiles: sembol sırasıyla compute_profiles çıktısı
+    """
+    result = np.full(len(price), np.nan)
+    for i, profile in enumerate(profiles):
+        candidates = [level for level in (profile['poc'], profile['val'], *profile['hvn'])
+                      if level == level and level <= price[i]]
+        if candidates:
+            result[i] = max(candidates)
+    return result
+
+
+class ScanSnapshot:
+    """
+    Sembollerin son SCAN_DEPTH mumunun sütunsal görüntüsü: her alan (semboller x SCAN_DEPTH)
+    dizisidir, son sütun son mumdur. support: sembol başına en yakın destek (NaN: yok).
+    """
+
+    def __init__(self, symbols, fields, support=None):
+        self.symbols = list(symbols)
+        self.fields = fields
+        self.support = np.full(len(self.symbols), np.nan) if support is None else np.asarray(support, dtype='float64')
+
+    @classmethod
+    def from_batch(cls, batch, swing_window=5, max_levels=50, profiles=None):
+        """
+        Hesaplanmış IndicatorBatch'ten kurar. profiles verilirse ({sembol: seviyeler},
+        ör. batch.volume_profiles()) destek, dip ve profil seviyelerinin yakın olanıdır.
+        """
+        fields = {name: batch._field(name)[:, -SCAN_DEPTH:] for name in SCAN_FIELDS}
+        price = fields['close'][:, -1]
+
+        support = nearest_swing_support(batch._field('high'), batch._field('low'), price, swing_window, max_levels)
+        if profiles is not None:
+            support = np.fmax(support, profile_support([profiles[symbol] for symbol in batch.symbols], price))
+
+        return cls(batch.symbols, fields, support)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def last(self, name, offset=1):
+        """
+        Tüm sembollerin sondan `offset`. mumdaki değeri
+        """
+        return self.fields[name][:, -offset]
+
+
+def trend(snapshot):
+    """
+    SignalGenerator.determine_trend karşılığı; sembol başına trend etiketi dizisi
+    """
+    close = snapshot.last('close')
+    ema20 = snapshot.last('EMA_20')
+    ema50 = snapshot.last('EMA_50')
+    first = snapshot.fields['close'][:, 0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change = (close - first) / first * 100
+
+    return np.select(
+        [(close > ema20) & (ema20 > ema50),
+         (close < ema20) & (ema20 < ema50),
+         price_change > 2,
+         price_change < -2],
+        [TREND_UP, TREND_DOWN, TREND_UP, TREND_DOWN],
+        default=TREND_FLAT
+    )
+
+
+def confidence(snapshot, trends=None):
+    """
+    SignalGenerator.calculate_confidence_score karşılığı, tüm semboller için
+    """
+    trends = trend(snapshot) if trends is None else trends
+    fields = snapshot.fields
+    price = snapshot.last('close')
+    hist = snapshot.last('MACD_Hist')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volatility = snapshot.last('ATR') / price * 100
+
+    # 1. Volatilite (%20); çok volatil piyasada skor 0
+    low_volatility = volatility <= 3
+    score = np.where(low_volatility, 20, 0)
+    conditions = low_volatility.astype('int64')
+
+    # 2. Trend ve momentum (%30 + MACD %10)
+    up = trends == TREND_UP
+    bullish_candles = up & np.all(fields['close'][:, -3:] > fields['open'][:, -3:], axis=1)
+    score = score + np.where(bullish_candles, 30, 0)
+    conditions += bullish_candles
+    score = score + np.where(up & (hist > 0) & (hist > snapshot.last('MACD_Hist', 2)), 10, 0)
+
+    # Dönüş formasyonu onayı (%10), son üç mumdan
+    reversal = latest_patterns(fields['open'], fields['high'], fields['low'], fields['close'], names=BULLISH_PATTERNS)
+    score = score + np.where(up & np.any(list(reversal.values()), axis=0), 10, 0)
+
+    # 3. Destekten %0.5-%2 uzaklık (%25)
+    with np.errstate(invalid='ignore'):
+        distance = (price - snapshot.support) / price * 100
+    near_support = (distance >= 0.5) & (distance <= 2)
+    score = score + np.where(near_support, 25, 0)
+    conditions += near_support
+
+    # 4. Hacim (%25)
+    volume, volume_ma = fields['volume'], fields['Volume_MA20']
+    volume_surge = np.all(volume[:, -3:] > volume_ma[:, -3:], axis=1) & (volume[:, -1] > volume_ma[:, -1] * 1.5)
+    score = score + np.where(volume_surge, 25, 0)
+    conditions += volume_surge
+
+    return np.where((volatility > 5) | (conditions < 3) | (score < 85), 0, score)
+
+
+def early_signals(snapshot):
+    """
+    Erken uyarı kuralları: (ani yükseliş, MACD kesişimi, BB kırılımı) maskeleri
+    """
+    fields = snapshot.fields
+    close = snapshot.last('close')
+    previous = snapshot.last('close', 2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change = (close - previous) / previous * 100
+        bb_width = (fields['BB_upper'] - fields['BB_lower']) / fields['BB_middle']
+        average_width = np.nanmean(bb_width, axis=1)
+
+    rapid_rise = (snapshot.last('volume') > snapshot.last('Volume_MA20') * 2) & (price_change > 2)
+    macd_cross = (snapshot.last('MACD_Hist') > 0) & (snapshot.last('MACD_Hist', 2) < 0)
+    bb_breakout = (bb_width[:, -1] < average_width * 0.8) & (close > snapshot.last('BB_middle'))
+    return rapid_rise, macd_cross, bb_breakout, price_change
+
+
+def scan(snapshot, min_confidence=70):
+    """
+    Giriş koşulunu (yukarı trend ve güven >= min_confidence) sağlayan semboller.
+    Dönüş: sembol başına sözlük listesi (güvene göre azalan)
+    """
+    if len(snapshot) == 0:
+        return []
+
+    trends = trend(snapshot)
+    scores = confidence(snapshot, trends)
+    rapid_rise, macd_cross, bb_breakout, price_change = early_signals(snapshot)
+    price = snapshot.last('close')
+
+    fired = np.flatnonzero((trends == TREND_UP) & (scores >= min_confidence))
+    fired = fired[np.argsort(-scores[fired], kind='stable')]
+
+    return [{
+        'symbol': snapshot.symbols[i],
+        'trend': str(trends[i]),
+        'confidence': float(scores[i]),
+        'price': float(price[i]),
+        'price_change': float(price_change[i]),
+        'rapid_rise': bool(rapid_rise[i]),
+        'macd_cross': bool(macd_cross[i]),
+        'bb_breakout': bool(bb_breakout[i])
+    } for i in fired]
@@ -0,0 +1,138 @@
+import bisect
+from collections import deque
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def swing_points(high, low, window=5):
+    """
+    Tepe/dip (swing high/low) tespiti, sliding window görünümleriyle vektörel.
+
+    i. mum, [i-window, i+window] aralığının en yükseği ise tepe, en düşüğü ise dip
+    sayılır (find_pivot_points ile aynı tanım). Bir nokta ancak `window` mum sonra
+    kesinleşir: dönüşteki işaretler sadece kesinleşmiş noktalar içindir, son `window`
+    mum hiçbir zaman işaretlenmez (gelecek veri sızmaz).
+    1D veya 2D (semboller x zaman) girişle çalışır. Dönüş: (tepe maskesi, dip maskesi)
+    """
+    high = np.asarray(high, dtype='float64')
+    low = np.asarray(low, dtype='float64')
+    size = 2 * window + 1
+
+    is_high = np.zeros(high.shape, dtype='bool')
+    is_low = np.zeros(low.shape, dtype='bool')
+    if high.shape[-1] < size:
+        return is_high, is_low
+
+    center = slice(window, high.shape[-1] - window)
+    is_high[..., center] = high[..., center] == sliding_window_view(high, size, axis=-1).max(axis=-1)
+    is_low[..., center] = low[..., center] == sliding_window_view(low, size, axis=-1).min(axis=-1)
+    return is_high, is_low
+
+
+class LevelIndex:
+    """
+    Fiyat seviyelerinin sıralı indeksi. Ekleme O(log n) aramayla (bisect) yapılır,
+    fiyatın altındaki/üstündeki en yakın seviye O(log n)'de bulunur. `max_levels`
+    aşılınca en eski seviye çıkarılır.
+    """
+
+    def __init__(self, max_levels=50):
+        self.max_levels = max_levels
+        self._sorted = []
+        self._order = deque()  # eklenme sırası (eski seviyeleri çıkarmak için)
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def add(self, price):
+        price = float(price)
+        bisect.insort(self._sorted, price)
+        self._order.append(price)
+
+        if len(self._order) > self.max_levels:
+            oldest = self._order.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+
+    def nearest_below(self, price):
+        """
+        price'ın altındaki (veya eşit) en yakın seviye, yoksa None
+        """
+        position = bisect.bisect_right(self._sorted, price)
+        return self._sorted[position - 1] if position else None
+
+    def nearest_above(self, price):
+        """
+        price'ın üstündeki (veya eşit) en yakın seviye, yoksa None
+        """
+        position = bisect.bisect_left(self._sorted, price)
+        return self._sorted[position] if position < len(self._sorted) else None
+
+    def levels(self):
+        return list(self._sorted)
+
+
+class SwingLevels:
+    """
+    Tek bir (sembol, zaman dilimi) için tepe/dip seviyelerini artımlı tutar.
+    update() sadece son güncellemeden sonra kesinleşen noktaları işler; dipler destek,
+    tepeler direnç indeksine eklenir.
+    """
+
+    def __init__(self, window=5, max_levels=50):
+        self.window = window
+        self.supports = LevelIndex(max_levels)
+        self.resistances = LevelIndex(max_levels)
+        self.confirmed_until = None  # durumu kesinleşmiş son mumun zaman damgası
+
+    def update(self, timestamps, high, low):
+        """
+        timestamps: artan zaman damgaları (ms veya datetime64), high/low: aynı uzunlukta diziler
+        """
+        timestamps = np.asarray(timestamps)
+        count = len(timestamps)
+        last_confirmable = count - 1 - self.window
+        if last_confirmable < self.window:
+            return self
+
+        # İlk işlenmemiş mum; geriye doğru window kadar bağlam gerekir
+        first_new = self.window
+        if self.confirmed_until is not None:
+            first_new = max(first_new, int(np.searchsorted(timestamps, self.confirmed_until, side='right')))
+        if first_new > last_confirmable:
+            return self
+
+        start = first_new - self.window
+        is_high, is_low = swing_points(high[start:], low[start:], self.window)
+        high_values = np.asarray(high[start:], dtype='float64')
+        low_values = np.asarray(low[start:], dtype='float64')
+
+        for position in np.flatnonzero(is_low):
+            self.supports.add(low_values[position])
+        for position in np.flatnonzero(is_high):
+            self.resistances.add(high_values[position])
+
+        self.confirmed_until = timestamps[last_confirmable]
+        return self
+
+    def update_frame(self, df):
+        """
+        DatetimeIndex'li OHLCV DataFrame ile günceller
+        """
+        return self.update(df.index.asi8, df['high'].to_numpy(), df['low'].to_numpy())
+
+    def nearest_support(self, price):
+        return self.supports.nearest_below(price)
+
+    def nearest_resistance(self, price):
+        return self.resistances.nearest_above(price)
+
+
+def pivot_values(series, kind='high', window=5):
+    """
+    Serideki kesinleşmiş tepe (kind='high') veya dip ('low') değerleri, zaman sırasıyla
+    """
+    values = series.to_numpy(dtype='float64') if isinstance(series, pd.Series) else np.asarray(series, dtype='float64')
+    is_high, is_low = swing_points(values, values, window)
+    mask = is_high if kind == 'high' else is_low
+    return values[mask].tolist()
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+from request_scheduler import get_scheduler_for, PRIORITY_SCAN
+
+DEFAULT_TICKER_TTL = 5.0  # saniye
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_ticker_snapshot(exchange, ttl=DEFAULT_TICKER_TTL):
+    """
+    Aynı borsa istemcisi için süreç genelinde tek bir TickerSnapshot döndürür
+    """
+    with _snapshots_lock:
+        snapshot = _snapshots.get(id(exchange))
+        if snapshot is None or snapshot.exchange is not exchange:
+            snapshot = TickerSnapshot(exchange, ttl=ttl)
+            _snapshots[id(exchange)] = snapshot
+        return snapshot
+
+
+class TickerSnapshot:
+    """
+    İzlenen sembollerin ticker bilgisini tek bir fetch_tickers çağrısıyla çeker
+    ve `ttl` saniye boyunca fiyat/24s istatistik sorgularını bellekten cevaplar.
+    Sorgulanan semboller izleme kümesine eklenir; kümede olmayan bir sembol
+    sorgulanınca anlık görüntü süresi dolmadan yenilenir.
+    """
+
+    def __init__(self, exchange, ttl=DEFAULT_TICKER_TTL, scheduler=None):
+        self.exchange = exchange
+        self.ttl = ttl
+        self.scheduler = scheduler or get_scheduler_for(exchange)
+        self.fetched_at = 0.0
+        self._tickers = {}
+        self._by_id = {}
+        self.symbols = set()  # izlenen semboller
+        self._fetched_symbols = frozenset()  # son anlık görüntüde istenen semboller
+        self._lock = threading.Lock()
+        self._async_lock = None
+        self.stats = {'refreshes': 0, 'hits': 0}
+
+    def is_fresh(self):
+        return time.monotonic() - self.fetched_at < self.ttl
+
+    def watch(self, symbols):
+        """
+        Sembolleri izleme kümesine ekler
+        """
+        self.symbols.update(symbols)
+
+    def unwatch(self, symbol):
+        self.symbols.discard(symbol)
+
+    def _needs_refresh(self, symbol):
+        if self._known(symbol):
+            self.symbols.add(symbol)
+        return not self.is_fresh() or (symbol in self.symbols and symbol not in self._fetched_symbols)
+
+    def _known(self, symbol):
+        # Bilinmeyen sembol toplu isteğin tamamını hataya düşürmesin
+        markets = getattr(self.exchange, 'markets', None)
+        if not markets:
+            return True
+        return symbol in markets or ('/' in symbol and f"{symbol}:{symbol.split('/')[1].split(':')[0]}" in markets)
+
+    def _store(self, tickers, symbols):
+        self._tickers = tickers or {}
+        self._by_id = {}
+        for ticker in self._tickers.values():
+            info = ticker.get('info') or {}
+            if isinstance(info, dict) and info.get('symbol'):
+                self._by_id[info['symbol']] = ticker
+        self._fetched_symbols = frozenset(symbols)
+        self.fetched_at = time.monotonic()
+        self.stats['refreshes'] += 1
+
+    def refresh(self, priority=PRIORITY_SCAN):
+        with self._lock:
+            symbols = sorted(self.symbols)
+            if self.is_fresh() and self._fetched_symbols.issuperset(symbols):
+                return
+            # İzlenen tüm semboller tek toplu istekte
+            self._store(self.scheduler.call(
+                self.exchange.fetch_tickers, symbols or None, endpoint='fetch_tickers', priority=priority
+            ), symbols)
+
+    async def refresh_async(self, priority=PRIORITY_SCAN):
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            symbols = sorted(self.symbols)
+            if self.is_fresh() and self._fetched_symbols.issuperset(symbols):
+                return
+            self._store(await self.scheduler.call_async(
+                self.exchange.fetch_tickers, symbols or None, endpoint='fetch_tickers', priority=priority
+            ), symbols)
+
+    def _lookup(self, symbol):
+        ticker = self._tickers.get(symbol)
+        if ticker is None and '/' in symbol and ':' not in symbol:
+            # Vadeli piyasada birleşik sembol 'BTC/USDT:USDT' şeklindedir
+            ticker = self._tickers.get(f"{symbol}:{symbol.split('/')[1]}")
+        if ticker is None:
+            ticker = self._by_id.get(symbol.split(':')[0].replace('/', ''))
+        return ticker
+
+    def get(self, symbol, priority=PRIORITY_SCAN):
+        """
+        Sembolün ticker bilgisini döndürür, önbellek eskiyse toplu olarak yeniler
+        """
+        if self._needs_refresh(symbol):
+            self.refresh(priority)
+        else:
+            self.stats['hits'] += 1
+        return self._lookup(symbol)
+
+    async def get_async(self, symbol, priority=PRIORITY_SCAN):
+        if self._needs_refresh(symbol):
+            await self.refresh_async(priority)
+        else:
+            self.stats['hits'] += 1
+        return self._lookup(symbol)
+
+    def get_price(self, symbol, priority=PRIORITY_SCAN):
+        ticker = self.get(symbol, priority)
+        return None if ticker is None else ticker.get('last')
+
+
+def ticker_to_market_info(ticker):
+    """
+    Ticker'ı get_market_info formatına çevirir
+    """
+    return {
+        'son_fiyat': ticker['last'],
+        'günlük_değişim': ticker['percentage'],
+        'günlük_hacim': ticker['quoteVolume'],
+        'en_yüksek_24h': ticker['high'],
+        'en_düşük_24h': ticker['low']
+    }
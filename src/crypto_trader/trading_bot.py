@@ -1,4 +1,3 @@
-import ccxt
 import numpy as np
 from datetime import datetime, timedelta
 import time
@@ -7,12 +6,16 @@ import json
 import os
 from sentiment_analyzer import SentimentAnalyzer
 from data_collector import DataCollector
+from exchange_pool import get_exchange
+from request_scheduler import get_scheduler_for, PRIORITY_POSITION
+import indicator_graph
 from sklearn.preprocessing import MinMaxScaler
 
 class TradingBot:
     def __init__(self, model):
         self.model = model
-        self.exchange = ccxt.binance()
+        self.exchange = get_exchange('binance', 'spot')
+        self.scheduler = get_scheduler_for(self.exchange)
         self.positions = {}  # Açık pozisyonları takip etmek için
         self.trade_history = []
         self.risk_per_trade = 0.02  # Hesap bakiyesinin %2'si
@@ -34,7 +37,9 @@ class TradingBot:
         Risk yönetimi: Pozisyon büyüklüğünü hesaplar
         """
         try:
-            balance = self.exchange.fetch_balance()
+            balance = self.scheduler.call(
+                self.exchange.fetch_balance, endpoint='fetch_balance', priority=PRIORITY_POSITION
+            )
             usdt_balance = balance['USDT']['free']
             risk_amount = usdt_balance * self.risk_per_trade
             position_size = risk_amount / (price - stop_loss_price)
@@ -64,7 +69,7 @@ class TradingBot:
         Hacim analizi
         """
         current_volume = df['volume'].iloc[-1]
-        avg_volume = df['volume'].rolling(window=20).mean().iloc[-1]
+        avg_volume = indicator_graph.get(df, 'Volume_MA20').iloc[-1]
         
         if current_volume > avg_volume * 2:
             return 20  # Yüksek hacim
@@ -76,8 +81,8 @@ class TradingBot:
         """
         Trend analizi
         """
-        ma20 = df['close'].rolling(window=20).mean().iloc[-1]
-        ma50 = df['close'].rolling(window=50).mean().iloc[-1]
+        ma20 = indicator_graph.get(df, 'MA20').iloc[-1]
+        ma50 = indicator_graph.get(df, 'MA50').iloc[-1]
         current_price = df['close'].iloc[-1]
         
         if current_price > ma20 and ma20 > ma50:
@@ -90,8 +95,9 @@ class TradingBot:
         """
         Volatilite analizi
         """
-        current_volatility = df['volatility'].iloc[-1]
-        avg_volatility = df['volatility'].rolling(window=20).mean().iloc[-1]
+        volatility = indicator_graph.get(df, 'volatility')
+        current_volatility = volatility.iloc[-1]
+        avg_volatility = volatility.rolling(window=20).mean().iloc[-1]
         
         if current_volatility > avg_volatility * 2:
             return -20  # Çok yüksek volatilite - riskli
@@ -113,6 +119,12 @@ class TradingBot:
             # Pozisyon durumunu kontrol et
             self.check_position_status(df, symbol)
             
+            # Analizlerin okuduğu sütunlar tek seferde (eksik olanlar) hesaplanır
+            indicator_graph.ensure(df, [
+                'RSI', 'MACD', 'MACD_Signal', 'BB_upper', 'BB_middle', 'BB_lower',
+                'StochRSI_K', 'StochRSI_D', 'ADX', 'DMP', 'DMN'
+            ])
+            
             signals = {
                 'RSI': self.analyze_rsi(df) * 2.0,
                 'MACD': self.analyze_macd(df) * 1.8,
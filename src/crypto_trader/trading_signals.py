@@ -3,8 +3,19 @@ import numpy as np
 from datetime import datetime, timedelta
 from telegram_bot import TelegramNotifier
 from adaptive_trader import AdaptiveTrader
+import indicator_graph
+from swing_levels import SwingLevels, pivot_values
+from candle_frame import get_levels
+from signal_scanner import ScanSnapshot, scan
+import candlestick_patterns
 import json
 
+# analyze_signals'ın okuduğu sütunlar (çerçevede varsa yeniden hesaplanmaz)
+SIGNAL_INDICATORS = [
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist', 'ADX',
+    'BB_upper', 'BB_middle', 'BB_lower', 'StochRSI_K', 'StochRSI_D', 'Volume_MA20'
+]
+
 class SignalGenerator:
     def __init__(self):
         self.active_trades = {}  # Açık pozisyonları takip etmek için
@@ -14,6 +25,8 @@ class SignalGenerator:
         self.telegram.set_signal_generator(self)  # TelegramNotifier'a referans ver
         self.last_signal_times = {}  # Son sinyal zamanlarını takip etmek için
         self.signal_cooldown = 4 * 3600  # 4 saat (saniye cinsinden)
+        self.swing_levels = {}  # (sembol, zaman dilimi, pencere) -> SwingLevels
+        self.data_collector = None  # çoklu zaman dilimi trend uyumu için (set_data_collector)
         
     def analyze_signals(self, df, symbol, timeframe):
         try:
@@ -32,6 +45,9 @@ class SignalGenerator:
                 if time_diff < 4 * 3600:  # 4 saat
                     return None
 
+            # Eksik indikatörler bir kez hesaplanır, DataCollector'ın hesapladıkları yeniden kullanılır
+            indicator_graph.ensure(df, SIGNAL_INDICATORS)
+            
             # Mevcut değerler
             current_price = df['close'].iloc[-1]
             current_rsi = df['RSI'].iloc[-1]
@@ -54,23 +70,8 @@ class SignalGenerator:
                 'volume': volume_data
             }
             
-            # Temel indikatörler
-            df['RSI'] = self.calculate_rsi(df)
-            macd, signal, hist = self.calculate_macd(df)
-            df['MACD'] = macd
-            df['MACD_Signal'] = signal
-            df['MACD_Hist'] = hist
-            df['ADX'] = self.calculate_adx(df)
-            
-            # Ek indikatörler
-            # Bollinger Bantları
-            df['BB_upper'], df['BB_middle'], df['BB_lower'] = self.calculate_bollinger_bands(df)
-            
-            # Stokastik RSI
-            df['StochRSI_K'], df['StochRSI_D'] = self.calculate_stoch_rsi(df)
-            
             # Destek/Direnç seviyeleri
-            support, resistance = self.find_support_resistance(df)
+            support, resistance = self.find_support_resistance(df, symbol=symbol, timeframe=timeframe)
             
             # Erken uyarı sistemi için ek kontroller
             early_signal = False
@@ -80,7 +81,7 @@ class SignalGenerator:
             rapid_rise = False
             
             # Ani hacim ve fiyat artışı kontrolü
-            volume_ma = df['volume'].rolling(20).mean()
+            volume_ma = df['Volume_MA20']
             current_volume = df['volume'].iloc[-1]
             price_change = ((current_price - df['close'].iloc[-2])/df['close'].iloc[-2]*100)
             
@@ -97,7 +98,7 @@ class SignalGenerator:
             
             # Ana sinyal analizi
             signal_type = None
-            confidence = self.calculate_confidence_score(df, current_price, indicators)
+            confidence = self.calculate_confidence_score(df, current_price, indicators, symbol, timeframe)
             
             if trend == "Yukarı" and confidence >= 70:
                 signal_type = "AL"
@@ -191,6 +192,23 @@ Kar Al 3: %8.0 ({current_price * 1.08:.4f})"""
             print(f"Sinyal analizi hatası: {str(e)}")
             return None
 
+    def analyze_batch(self, batch, timeframe, profiles=None):
+        """
+        IndicatorBatch içindeki semboller için toplu tarama yapar: giriş kuralları tüm
+        semboller için vektörel değerlendirilir, sadece koşulu sağlayanlar (ve pozisyon
+        takibi için açık işlemi olanlar) analyze_signals'a gider.
+        Dönüş: {sembol: sinyal verisi} (sinyal üretenler)
+        """
+        candidates = [hit['symbol'] for hit in scan(ScanSnapshot.from_batch(batch, profiles=profiles))]
+        tracked = [symbol for symbol in batch.symbols if symbol in self.active_trades]
+        
+        signals = {}
+        for symbol in dict.fromkeys(tracked + candidates):
+            signal_data = self.analyze_signals(batch.frame(symbol), symbol, timeframe)
+            if signal_data:
+                signals[symbol] = signal_data
+        return signals
+
     def format_signal_message(self, signal_data):
         """
         Sinyal mesajını formatla
@@ -305,7 +323,7 @@ Benzer Pattern Başarısı: %{stats['pattern_success']:.1f}
             print(f"Trend belirleme hatası: {str(e)}")
             return "Belirsiz"
 
-    def calculate_confidence_score(self, df, current_price, indicators):
+    def calculate_confidence_score(self, df, current_price, indicators, symbol=None, timeframe=None):
         try:
             confidence = 0
             conditions_met = 0
@@ -331,19 +349,29 @@ Benzer Pattern Başarısı: %{stats['pattern_success']:.1f}
                 # MACD kontrolü
                 if df['MACD_Hist'].iloc[-1] > 0 and df['MACD_Hist'].iloc[-1] > df['MACD_Hist'].iloc[-2]:
                     confidence += 10
+                
+                # Dönüş formasyonu onayı
+                if self.has_pattern(df, candlestick_patterns.BULLISH_PATTERNS):
+                    confidence += 10
             
             # 3. Destek/Direnç Analizi (%25)
-            support_levels = self.find_support_levels(df)
-            nearest_support = min([abs(level - current_price) for level in support_levels])
+            # Fiyatın altındaki en yakın kesinleşmiş dip (sıralı indekste O(log n) arama)
+            nearest_support = self.get_swing_levels(df, symbol, timeframe).nearest_support(current_price)
+            
+            # Hacim profili seviyeleri (POC, VAL, HVN) de destek sayılır
+            profile_support = self.nearest_profile_support(df, current_price)
+            if profile_support is not None and (nearest_support is None or profile_support > nearest_support):
+                nearest_support = profile_support
             
             # Destek seviyesine yakınlık
-            distance_to_support = (nearest_support / current_price) * 100
-            if 0.5 <= distance_to_support <= 2:  # Destekten %0.5-%2 uzaklıkta
-                confidence += 25
-                conditions_met += 1
+            if nearest_support is not None:
+                distance_to_support = ((current_price - nearest_support) / current_price) * 100
+                if 0.5 <= distance_to_support <= 2:  # Destekten %0.5-%2 uzaklıkta
+                    confidence += 25
+                    conditions_met += 1
             
             # 4. Hacim Analizi (%25)
-            volume_ma = df['volume'].rolling(20).mean()
+            volume_ma = indicator_graph.get(df, 'Volume_MA20')
             volume_trend = all(df['volume'].tail(3) > volume_ma.tail(3))
             
             if volume_trend and df['volume'].iloc[-1] > volume_ma.iloc[-1] * 1.5:
@@ -360,39 +388,51 @@ Benzer Pattern Başarısı: %{stats['pattern_success']:.1f}
     def calculate_atr(self, df, period=14):
         """Average True Range hesapla"""
         try:
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            
-            tr1 = abs(high - low)
-            tr2 = abs(high - close.shift())
-            tr3 = abs(low - close.shift())
-            
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(period).mean()
-            
-            return atr.iloc[-1]
+            return indicator_graph.get(df, 'ATR', period=period).iloc[-1]
         except Exception as e:
             print(f"ATR hesaplama hatası: {str(e)}")
             return None
 
     def find_support_levels(self, df, period=20):
-        """Destek seviyelerini bul"""
+        """Destek seviyelerini bul (son `period` mumdaki yerel dipler)"""
         try:
-            support_levels = []
+            low = df['low'].to_numpy()
+            positions = len(low) - np.arange(4, period)
+            positions = positions[positions >= 1]
             
-            # Son period kadar mumu kontrol et
-            for i in range(4, period):
-                if (df['low'].iloc[-i] < df['low'].iloc[-i+1] and 
-                    df['low'].iloc[-i] < df['low'].iloc[-i-1] and
-                    df['low'].iloc[-i] < df['low'].iloc[-i+2]):
-                    support_levels.append(df['low'].iloc[-i])
+            is_support = ((low[positions] < low[positions + 1]) &
+                          (low[positions] < low[positions - 1]) &
+                          (low[positions] < low[positions + 2]))
             
-            return support_levels
+            return low[positions][is_support].tolist()
         except Exception as e:
             print(f"Destek seviyesi hesaplama hatası: {str(e)}")
             return []
 
+    def nearest_profile_support(self, df, current_price):
+        """
+        Çerçeveye iliştirilmiş hacim profili seviyelerinden (POC, VAL, HVN) fiyatın altındaki en yakını
+        """
+        levels = get_levels(df)
+        candidates = [level for level in (levels.poc, levels.val, *levels.hvn)
+                      if level == level and level <= current_price]
+        return max(candidates) if candidates else None
+
+    def get_swing_levels(self, df, symbol=None, timeframe=None, window=5):
+        """
+        Sembolün tepe/dip seviye indeksini yeni kesinleşen noktalarla günceller.
+        Sembol verilmezse çerçeveden geçici bir indeks kurulur.
+        """
+        if symbol is None:
+            return SwingLevels(window).update_frame(df)
+        
+        key = (symbol, timeframe, window)
+        levels = self.swing_levels.get(key)
+        if levels is None:
+            levels = SwingLevels(window)
+            self.swing_levels[key] = levels
+        return levels.update_frame(df)
+
     def calculate_sat_confidence_score(self, df, current_price, indicators):
         """
         SAT sinyalleri için güven skoru hesaplar
@@ -410,6 +450,10 @@ Benzer Pattern Başarısı: %{stats['pattern_success']:.1f}
                         conditions_met += 1
                     elif last_close < df['EMA_20'].iloc[-1]:
                         confidence += 15
+                
+                # Dönüş formasyonu onayı
+                if self.has_pattern(df, candlestick_patterns.BEARISH_PATTERNS):
+                    confidence += 10
             
             # 2. RSI + MACD Kombinasyonu (%25)
             rsi = indicators['rsi']
@@ -424,7 +468,7 @@ Benzer Pattern Başarısı: %{stats['pattern_success']:.1f}
                 conditions_met += 1
             
             # 4. Hacim Analizi (%15)
-            avg_volume = df['volume'].rolling(20).mean().iloc[-1]
+            avg_volume = indicator_graph.get(df, 'Volume_MA20').iloc[-1]
             if df['volume'].iloc[-1] > avg_volume:
                 confidence += 15
                 conditions_met += 1
@@ -448,24 +492,23 @@ Benzer Pattern Başarısı: %{stats['pattern_success']:.1f}
             print(f"SAT güven skoru hesaplama hatası: {str(e)}")
             return 50
 
-    def find_support_resistance(self, df, period=20):
+    def find_support_resistance(self, df, period=20, symbol=None, timeframe=None):
         """
-        Destek ve direnç seviyeleri bul
+        Destek ve direnç seviyeleri bul: fiyatın altındaki en yakın dip ve üstündeki
+        en yakın tepe. Sadece kesinleşmiş noktalar kullanılır (ortalanmış pencere yok).
         """
         try:
-            # Pivot noktaları
-            highs = df['high'].rolling(window=period, center=True).max()
-            lows = df['low'].rolling(window=period, center=True).min()
+            levels = self.get_swing_levels(df, symbol, timeframe, window=period // 2)
             
             # Son fiyat
             current_price = df['close'].iloc[-1]
             
             # En yakın destek ve direnç
-            supports = lows[lows < current_price].nlargest(3)
-            resistances = highs[highs > current_price].nsmallest(3)
+            support = levels.nearest_support(current_price)
+            resistance = levels.nearest_resistance(current_price)
             
-            if len(supports) > 0 and len(resistances) > 0:
-                return supports.iloc[0], resistances.iloc[0]
+            if support is not None and resistance is not None:
+                return support, resistance
             
             return None, None
             
@@ -477,72 +520,58 @@ Benzer Pattern Başarısı: %{stats['pattern_success']:.1f}
         """
         Pivot noktalarını belirler
         """
-        pivot_points = []
-        window = 5
-        
-        for i in range(window, len(series)-window):
-            if type == 'high':
-                if series.iloc[i] == max(series.iloc[i-window:i+window+1]):
-                    pivot_points.append(series.iloc[i])
-            else:
-                if series.iloc[i] == min(series.iloc[i-window:i+window+1]):
-                    pivot_points.append(series.iloc[i])
-                
-        return pivot_points
+        return pivot_values(series, type, window=5)
+
+    def set_data_collector(self, data_collector):
+        """DataCollector referansını ayarla (trend önbelleği ve mum deposu için)"""
+        self.data_collector = data_collector
 
-    def analyze_multiple_timeframes(self, symbol, current_timeframe):
+    def analyze_multiple_timeframes(self, symbol, current_timeframe, timeframes=None, df=None):
         """
-        Farklı zaman dilimlerinde analiz yapar
+        Farklı zaman dilimlerinde analiz yapar: komşu zaman dilimlerinin trendi
+        (ALIGNMENT_TIMEFRAMES) mevcut zaman dilimi trendiyle karşılaştırılır.
+        Trendler DataCollector'ın önbelleğinden gelir, sadece mum kapanışlarında yeniden
+        hesaplanır. df verilirse mevcut trend bu çerçeveden belirlenir.
         """
-        timeframes = {
-            '15m': ['5m', '1h'],
-            '1h': ['15m', '4h'],
-            '4h': ['1h', '1d']
-        }
-        
-        if current_timeframe not in timeframes:
+        if self.data_collector is None:
+            print("Çoklu zaman dilimi analizi için veri toplayıcı ayarlanmamış")
             return None
         
-        aligned_trends = 0
-        results = {}
-        
-        for tf in timeframes[current_timeframe]:
-            df = self.get_data_for_timeframe(symbol, tf)
-            trend = self.determine_trend(df)
-            results[tf] = trend
-            
-            if trend == self.determine_trend(df):
-                aligned_trends += 1
-            
-        return {
-            'timeframes': results,
-            'alignment': aligned_trends / len(timeframes[current_timeframe])
-        }
+        base_trend = self.determine_trend(df) if df is not None else None
+        return self.data_collector.get_trend_alignment(symbol, current_timeframe, timeframes, base_trend)
 
     def detect_candlestick_patterns(self, df):
         """
-        Mum formasyonlarını tespit eder
+        Son mumun formasyonlarını tespit eder. Çerçevede formasyon sütunları (CDL_*) varsa
+        son satırları okunur, yoksa sadece son üç mumdan hesaplanır.
+        'engulfing': yönünden bağımsız yutan formasyon
         """
-        patterns = {
-            'hammer': self.is_hammer(df),
-            'engulfing': self.is_engulfing(df),
-            'doji': self.is_doji(df),
-            'morning_star': self.is_morning_star(df),
-            'evening_star': self.is_evening_star(df)
-        }
+        if all(column in df.columns for column in indicator_graph.PATTERN_COLUMNS):
+            patterns = {name: bool(df[f'CDL_{name}'].iloc[-1]) for name in candlestick_patterns.PATTERNS}
+        else:
+            patterns = candlestick_patterns.latest(*(df[name].to_numpy() for name in ('open', 'high', 'low', 'close')))
+        patterns['engulfing'] = patterns['bullish_engulfing'] or patterns['bearish_engulfing']
         
         return patterns
 
+    def has_pattern(self, df, names):
+        """
+        Son mumda verilen formasyonlardan biri var mı
+        """
+        try:
+            patterns = self.detect_candlestick_patterns(df)
+            return any(patterns[name] for name in names)
+        except Exception as e:
+            print(f"Formasyon kontrolü hatası: {str(e)}")
+            return False
+
     def is_hammer(self, df):
         """
         Çekiç formasyonu kontrolü
         """
-        last_candle = df.iloc[-1]
-        body = abs(last_candle['open'] - last_candle['close'])
-        lower_wick = min(last_candle['open'], last_candle['close']) - last_candle['low']
-        upper_wick = last_candle['high'] - max(last_candle['open'], last_candle['close'])
-        
-        return lower_wick > body * 2 and upper_wick < body * 0.5 
+        return candlestick_patterns.latest(
+            *(df[name].to_numpy() for name in ('open', 'high', 'low', 'close')), names=['hammer']
+        )['hammer']
 
     def record_signal_result(self, entry_data, exit_data):
         """
@@ -616,15 +645,8 @@ Timeframe: {entry_data['timeframe']}
         Stochastic RSI hesapla
         """
         try:
-            # Önce RSI hesapla
-            rsi = df['RSI']
-            
-            # StochRSI = (RSI - RSI Low) / (RSI High - RSI Low)
-            stochRSI = 100 * (rsi - rsi.rolling(period).min()) / (rsi.rolling(period).max() - rsi.rolling(period).min())
-            
-            # %K ve %D hesapla
-            K = stochRSI.rolling(smoothK).mean()
-            D = K.rolling(smoothD).mean()
+            K = indicator_graph.get(df, 'StochRSI_K', period=period, smoothK=smoothK, smoothD=smoothD)
+            D = indicator_graph.get(df, 'StochRSI_D', period=period, smoothK=smoothK, smoothD=smoothD)
             
             return K, D
             
@@ -638,7 +660,7 @@ Timeframe: {entry_data['timeframe']}
         """
         try:
             # Ortalama hacim (20 periyot)
-            avg_volume = df['volume'].rolling(20).mean()
+            avg_volume = indicator_graph.get(df, 'Volume_MA20')
             current_volume = df['volume'].iloc[-1]
             
             # Hacim artış oranı
@@ -678,10 +700,10 @@ Timeframe: {entry_data['timeframe']}
             current_price = df['close'].iloc[-1]
             
             # Volatilite hesaplama (son 20 mumdaki fiyat değişim yüzdesi)
-            volatility = df['close'].pct_change().rolling(20).std().iloc[-1] * 100
+            volatility = indicator_graph.get(df, 'volatility').iloc[-1]
             
             # Hacim analizi
-            volume_ratio = df['volume'].iloc[-1] / df['volume'].rolling(20).mean().iloc[-1]
+            volume_ratio = df['volume'].iloc[-1] / indicator_graph.get(df, 'Volume_MA20').iloc[-1]
             
             # Baz hedefler (düşük volatilite durumu için)
             base_tp1 = 1.5  # İlk hedef
@@ -895,113 +917,46 @@ Kar/Zarar: %{profit_loss:.2f}
         RSI (Relative Strength Index) hesaplar
         """
         try:
-            # Fiyat değişimlerini hesapla
-            delta = df['close'].diff()
-            
-            # Pozitif ve negatif değişimleri ayır
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            
-            # RS = Ortalama Kazanç / Ortalama Kayıp
-            rs = gain / loss
-            
-            # RSI = 100 - (100 / (1 + RS))
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
+            return indicator_graph.rsi(df['close'], period)
             
         except Exception as e:
             print(f"RSI hesaplama hatası: {str(e)}")
-            return pd.Series([50] * len(df))  # Hata durumunda nötr değer döndür 
+            return pd.Series(np.nan, index=df.index)
 
     def calculate_macd(self, df, fast=12, slow=26, signal=9):
         """
-        MACD (Moving Average Convergence Divergence) hesaplar
+        MACD (Moving Average Convergence Divergence) hesaplar: (MACD, sinyal, histogram)
         """
         try:
-            # Hızlı ve yavaş EMA hesapla
-            exp1 = df['close'].ewm(span=fast, adjust=False).mean()
-            exp2 = df['close'].ewm(span=slow, adjust=False).mean()
-            
-            # MACD çizgisi
-            macd = exp1 - exp2
-            
-            # Sinyal çizgisi
-            signal_line = macd.ewm(span=signal, adjust=False).mean()
-            
-            # Histogram
-            histogram = macd - signal_line
-            
-            return macd, signal_line, histogram
+            return indicator_graph.macd(df['close'], fast, slow, signal)
             
         except Exception as e:
             print(f"MACD hesaplama hatası: {str(e)}")
-            # Hata durumunda sıfır serisi döndür
-            zeros = pd.Series([0] * len(df))
-            return zeros, zeros, zeros 
+            empty = pd.Series(np.nan, index=df.index)
+            return empty, empty, empty
 
     def calculate_adx(self, df, period=14):
         """
         ADX (Average Directional Index) hesaplar
         """
         try:
-            # True Range hesapla
-            df['TR'] = pd.DataFrame([
-                df['high'] - df['low'],
-                abs(df['high'] - df['close'].shift(1)),
-                abs(df['low'] - df['close'].shift(1))
-            ]).max()
-            
-            # +DM ve -DM hesapla
-            df['HD'] = df['high'] - df['high'].shift(1)
-            df['LD'] = df['low'].shift(1) - df['low']
-            
-            df['+DM'] = ((df['HD'] > df['LD']) & (df['HD'] > 0)) * df['HD']
-            df['-DM'] = ((df['LD'] > df['HD']) & (df['LD'] > 0)) * df['LD']
-            
-            # ATR hesapla
-            df['ATR'] = df['TR'].ewm(span=period, adjust=False).mean()
-            
-            # +DI ve -DI hesapla
-            df['+DI'] = 100 * df['+DM'].ewm(span=period, adjust=False).mean() / df['ATR']
-            df['-DI'] = 100 * df['-DM'].ewm(span=period, adjust=False).mean() / df['ATR']
-            
-            # DX ve ADX hesapla
-            df['DX'] = 100 * abs(df['+DI'] - df['-DI']) / (df['+DI'] + df['-DI'])
-            adx = df['DX'].ewm(span=period, adjust=False).mean()
-            
-            # Geçici sütunları temizle
-            df.drop(['TR', 'HD', 'LD', '+DM', '-DM', 'ATR', '+DI', '-DI', 'DX'], axis=1, inplace=True)
-            
+            # Ara sütunlar DataFrame'e yazılmaz
+            adx, _, _ = indicator_graph.adx(df['high'], df['low'], df['close'], period)
             return adx
             
         except Exception as e:
             print(f"ADX hesaplama hatası: {str(e)}")
-            return pd.Series([20] * len(df))  # Hata durumunda nötr değer döndür 
+            return pd.Series(np.nan, index=df.index)
 
     def calculate_bollinger_bands(self, df, period=20, std_dev=2):
         """
-        Bollinger Bands hesaplar
+        Bollinger Bands hesaplar: (üst, orta, alt)
         """
         try:
-            # Orta bant (20 periyot SMA)
-            middle_band = df['close'].rolling(window=period).mean()
-            
-            # Standart sapma
-            std = df['close'].rolling(window=period).std()
-            
-            # Üst ve alt bantlar
-            upper_band = middle_band + (std * std_dev)
-            lower_band = middle_band - (std * std_dev)
-            
-            return upper_band, middle_band, lower_band
+            middle, upper, lower = indicator_graph.bollinger_bands(df['close'], period, std_dev)
+            return upper, middle, lower
             
         except Exception as e:
             print(f"Bollinger Bands hesaplama hatası: {str(e)}")
-            # Hata durumunda yaklaşık değerler döndür
-            price = df['close'].iloc[-1]
-            return (
-                pd.Series([price * 1.02] * len(df)),  # Upper band
-                pd.Series([price] * len(df)),         # Middle band
-                pd.Series([price * 0.98] * len(df))   # Lower band
-            ) 
\ No newline at end of file
+            empty = pd.Series(np.nan, index=df.index)
+            return empty, empty, empty
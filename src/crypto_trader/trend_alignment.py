@@ -0,0 +1,147 @@
+"""
+Çoklu zaman dilimi trend uyumu.
+
+(sembol, zaman dilimi) başına son kapanmış muma ait trend önbellekte tutulur ve sadece o
+zaman diliminin mumu kapandığında yeniden hesaplanır. Uyum sorguları (ör. 15m sinyali
+için 1h/4h/1d onayı) önbellekten cevaplanır; üst zaman dilimleri her değerlendirmede
+yeniden hesaplanmaz.
+"""
+import threading
+import numpy as np
+import pandas as pd
+
+# SignalGenerator.analyze_multiple_timeframes'in karşılaştırdığı komşu zaman dilimleri
+ALIGNMENT_TIMEFRAMES = {
+    '15m': ['5m', '1h'],
+    '1h': ['15m', '4h'],
+    '4h': ['1h', '1d']
+}
+
+TREND_WINDOW = 1000  # determine_trend'in çalıştığı çerçeve uzunluğu (EMA ısınması dahil)
+
+
+def trend_from_close(close):
+    """
+    Kapanış serisinden SignalGenerator.determine_trend ile aynı trend etiketi
+    (EMA 20/50 dizilimi, değilse son 20 mumdaki değişim)
+    """
+    close = pd.Series(np.asarray(close, dtype='float64'))
+    if len(close) == 0:
+        return "Belirsiz"
+
+    last_close = close.iloc[-1]
+    ema20 = close.ewm(span=20, adjust=False).mean().iloc[-1]
+    ema50 = close.ewm(span=50, adjust=False).mean().iloc[-1]
+
+    if last_close > ema20 > ema50:
+        return "Yukarı"
+    if last_close < ema20 < ema50:
+        return "Aşağı"
+    if len(close) < 20:
+        return "Belirsiz"
+
+    price_change = (last_close - close.iloc[-20]) / close.iloc[-20] * 100
+    if price_change > 2:
+        return "Yukarı"
+    if price_change < -2:
+        return "Aşağı"
+    return "Yatay"
+
+
+class TrendState:
+    __slots__ = ('trend', 'candle_timestamp', 'period_start')
+
+    def __init__(self, trend, candle_timestamp, period_start):
+        self.trend = trend
+        self.candle_timestamp = candle_timestamp  # trendi belirleyen son kapanmış mumun açılışı (ms)
+        self.period_start = period_start  # hesaplandığı anda açık olan mumun başlangıcı (ms)
+
+
+class TrendAlignment:
+    """
+    Trend önbelleği. Veri kaynağı dışarıdan verilir:
+    load_closed(symbol, timeframe) -> son kapanmış mumların kapanışları ve son mumun
+    zaman damgası (close dizisi, timestamp ms) ya da None.
+    Bir durum, hesaplandığı mum periyodu bitene (yeni mum kapanana) kadar ve trendi
+    belirleyen mum bu periyottan hemen önceki mum olduğu sürece günceldir.
+    Veri bulunamayan zaman dilimleri de (trend None) periyot sonuna kadar önbellekte tutulur,
+    böylece depoda olmayan zaman dilimi her sorguda yeniden okunmaz.
+    """
+
+    def __init__(self, load_closed, timeframe_ms, clock):
+        self.load_closed = load_closed
+        self.timeframe_ms = timeframe_ms  # zaman dilimi -> ms
+        self.clock = clock  # şimdiki zaman (ms)
+        self.stats = {'computed': 0, 'reused': 0, 'missed': 0}
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _period_start(self, timeframe, now):
+        period = self.timeframe_ms(timeframe)
+        return now - now % period
+
+    def is_fresh(self, symbol, timeframe, now=None):
+        state = self._states.get((symbol, timeframe))
+        if state is None:
+            return False
+        now = self.clock() if now is None else now
+        period_start = self._period_start(timeframe, now)
+        if state.period_start != period_start:
+            return False
+        # Son kapanan mum depoya henüz yazılmadıysa trend eskidir
+        return state.candle_timestamp is None or state.candle_timestamp == period_start - self.timeframe_ms(timeframe)
+
+    def refresh(self, symbol, timeframe, now=None):
+        """
+        Zaman diliminin trendini yeniden hesaplar (mum kapanışında çağrılır)
+        """
+        now = self.clock() if now is None else now
+        loaded = self.load_closed(symbol, timeframe)
+        if loaded is None:
+            state = TrendState(None, None, self._period_start(timeframe, now))
+            with self._lock:
+                self._states[(symbol, timeframe)] = state
+                self.stats['missed'] += 1
+            return None
+
+        close, candle_timestamp = loaded
+        state = TrendState(trend_from_close(close), candle_timestamp, self._period_start(timeframe, now))
+        with self._lock:
+            self._states[(symbol, timeframe)] = state
+            self.stats['computed'] += 1
+        return state.trend
+
+    def trend(self, symbol, timeframe):
+        """
+        Son kapanmış muma ait trend (veri yoksa None); mum kapanmadıysa önbellekten
+        """
+        if self.is_fresh(symbol, timeframe):
+            self.stats['reused'] += 1
+            return self._states[(symbol, timeframe)].trend
+        return self.refresh(symbol, timeframe)
+
+    def alignment(self, symbol, base_timeframe, timeframes=None, base_trend=None):
+        """
+        Diğer zaman dilimlerinin temel zaman dilimindeki trendle uyum oranı.
+        base_trend verilirse (ör. açık mumu içeren çerçeveden) o kullanılır.
+        Dönüş: {'trend', 'timeframes': {zaman dilimi: trend}, 'alignment'} veya None
+        """
+        timeframes = timeframes or ALIGNMENT_TIMEFRAMES.get(base_timeframe)
+        if not timeframes:
+            return None
+
+        base_trend = base_trend or self.trend(symbol, base_timeframe)
+        results = {timeframe: self.trend(symbol, timeframe) for timeframe in timeframes}
+        aligned = sum(1 for trend in results.values() if trend is not None and trend == base_trend)
+
+        return {
+            'trend': base_trend,
+            'timeframes': results,
+            'alignment': aligned / len(timeframes)
+        }
+
+    def reset(self, symbol=None, timeframe=None):
+        with self._lock:
+            for key in list(self._states):
+                if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe):
+                    del self._states[key]
@@ -0,0 +1,297 @@
+"""
+Fiyat seviyesine göre hacim (volume-at-price) profili.
+
+Her mumun hacmi [low, high] aralığının kestiği fiyat kutularına, kesişim uzunluğuyla
+orantılı dağıtılır (high == low ise hacim kapanışın kutusuna yazılır). Kutular
+`bin_size` genişliğinde, sıfıra hizalı sabit bir ızgaradadır; böylece toplu hesaplama
+ve mum kapanışlarıyla artımlı güncellenen profil aynı kutuları kullanır.
+
+- POC: en yüksek hacimli kutunun orta fiyatı
+- VAH/VAL: POC'tan başlayıp komşu kutulardan hacmi büyük olanı ekleyerek toplam hacmin
+  `value_area` oranına ulaşan bölgenin üst/alt sınırı
+- HVN/LVN: komşularından yüksek (düşük) ve ortalamanın üstünde (altında) hacimli kutular
+"""
+import math
+from collections import deque
+import numpy as np
+
+VALUE_AREA = 0.7
+# Kutu hacmi karşılaştırmalarında göreli tolerans: toplu ve artımlı hesabın yuvarlama
+# farkları eşit kutular arasındaki seçimi (POC, genişleme yönü, düğümler) değiştirmesin
+NODE_RTOL = 1e-9
+
+
+def default_bin_size(high, low, bins=50):
+    """
+    Aralığı yaklaşık `bins` kutuya bölen kutu genişliği (son eksen üzerinden, sembol başına)
+    """
+    price_range = np.nanmax(np.asarray(high, dtype='float64'), axis=-1) - np.nanmin(np.asarray(low, dtype='float64'), axis=-1)
+    return np.where(price_range > 0, price_range / bins, np.nanmax(np.asarray(high, dtype='float64'), axis=-1) * 1e-3)
+
+
+def _bin_index(price, size, upper=False):
+    """
+    Fiyatın kutu indeksi; upper=True ise üst sınır olarak (kenara denk gelen sınır alttaki kutuda).
+    Bölme yuvarlaması kenardaki fiyatı komşu kutuya kaydırmasın diye göreli pay bırakılır.
+    """
+    if upper:
+        return np.ceil(price / size - NODE_RTOL) - 1
+    return np.floor(price / size + NODE_RTOL)
+
+
+def _overlap_share(high, low, first, size, bins):
+    """
+    Mumların (high > low) [first, first + bins) kutularıyla kesişim oranı; sadece yuvarlamadan
+    kalan kesişimler sıfırlanır
+    """
+    indexes = first + np.arange(bins)
+    overlap = np.minimum(high, (indexes + 1) * size) - np.maximum(low, indexes * size)
+    overlap = np.where(overlap > size * NODE_RTOL, overlap, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(high > low, overlap / (high - low), 0.0)
+
+
+def _distribute(high, low, close, volume, first, bin_size, bins):
+    """
+    (semboller x mumlar) girişten (semboller x kutular) hacim histogramı.
+    first: ilk kutunun indeksi, bin_size: kutu genişliği (sembol başına)
+    """
+    share = _overlap_share(high[:, :, None], low[:, :, None], first[:, None, None],
+                           bin_size[:, None, None], bins)
+
+    # Aralığı sıfır olan mumlar: tüm hacim kapanışın kutusuna
+    flat = ~(high > low) & np.isfinite(close)
+    if flat.any():
+        close_bin = (_bin_index(close, bin_size[:, None]) - first[:, None]).astype('int64')
+        close_bin = np.clip(close_bin, 0, bins - 1)
+        rows, candles = np.nonzero(flat)
+        share[rows, candles, close_bin[rows, candles]] = 1.0
+
+    return np.nansum(share * np.nan_to_num(volume)[:, :, None], axis=1)
+
+
+def _row_counts(histogram, counts):
+    """
+    Satır başına kullanılan kutu sayısı; satırlar ortak genişliğe sağdan boş kutularla tamamlanmış olabilir
+    """
+    if counts is None:
+        return np.full(len(histogram), histogram.shape[1])
+    return np.minimum(np.asarray(counts, dtype='int64'), histogram.shape[1])
+
+
+def _greater(a, b):
+    return (a > b) & ~np.isclose(a, b, rtol=NODE_RTOL, atol=0.0)
+
+
+def _greater_equal(a, b):
+    return (a >= b) | np.isclose(a, b, rtol=NODE_RTOL, atol=0.0)
+
+
+def value_area(histogram, share=VALUE_AREA, counts=None):
+    """
+    Satır başına (POC, VAL, VAH) kutu indeksleri. Semboller boyunca vektörel,
+    kutular boyunca en fazla kutu sayısı kadar adımda genişler.
+    counts: satır başına gerçek kutu sayısı (fazlası genişlemeye katılmaz)
+    """
+    histogram = np.atleast_2d(histogram)
+    rows = np.arange(len(histogram))
+    bins = histogram.shape[1]
+    last = _row_counts(histogram, counts) - 1
+
+    # Eşit tepeler arasında ilk kutu
+    poc = np.argmax(_greater_equal(histogram, histogram.max(axis=1, keepdims=True)), axis=1)
+    target = histogram.sum(axis=1) * share
+    covered = histogram[rows, poc].copy()
+    low = poc.copy()
+    high = poc.copy()
+
+    for _ in range(bins - 1):
+        active = _greater(target, covered)
+        if not active.any():
+            break
+        below = np.where(low > 0, histogram[rows, np.maximum(low - 1, 0)], -1.0)
+        above = np.where(high < last, histogram[rows, np.minimum(high + 1, bins - 1)], -1.0)
+        active &= (below >= 0) | (above >= 0)
+
+        # Eşitlikte yukarı genişlenir
+        take_above = active & _greater_equal(above, below)
+        take_below = active & ~take_above
+        covered += np.where(take_above, above, 0.0) + np.where(take_below, below, 0.0)
+        high += take_above
+        low -= take_below
+
+    return poc, low, high
+
+
+def volume_nodes(histogram, counts=None):
+    """
+    (HVN maskesi, LVN maskesi): yerel tepe/dip olan ve ortalamanın üstünde/altında kalan kutular.
+    counts: satır başına gerçek kutu sayısı (ortalama ve kenar komşuluğu buna göre)
+    Karşılaştırmalar göreli toleranslıdır; düz bölgelerde (eşit komşular) toplu ve artımlı
+    profil aynı düğümleri verir.
+    """
+    histogram = np.atleast_2d(histogram)
+    counts = _row_counts(histogram, counts)
+    positions = np.arange(histogram.shape[1])[None, :]
+    valid = positions < counts[:, None]
+
+    padded = np.pad(histogram, ((0, 0), (1, 1)), mode='edge')
+    left = padded[:, :-2]
+    # Son gerçek kutunun sağ komşusu kendisidir (edge dolgusu gibi)
+    right = np.where(positions + 1 < counts[:, None], padded[:, 2:], histogram)
+    mean = np.where(valid, histogram, 0.0).sum(axis=1, keepdims=True) / np.maximum(counts, 1)[:, None]
+
+    hvn = valid & _greater(histogram, left) & _greater_equal(histogram, right) & _greater(histogram, mean)
+    lvn = (valid & _greater(left, histogram) & _greater_equal(right, histogram) &
+           _greater(mean, histogram) & (histogram > 0))
+    return hvn, lvn
+
+
+def _levels(histogram, origin, bin_size, share, counts=None):
+    """
+    Histogramlardan fiyat seviyeleri; sembol başına sözlük listesi
+    """
+    poc, val, vah = value_area(histogram, share, counts)
+    hvn, lvn = volume_nodes(histogram, counts)
+    centers = origin[:, None] + (np.arange(histogram.shape[1])[None, :] + 0.5) * bin_size[:, None]
+    rows = np.arange(len(histogram))
+    empty = histogram.sum(axis=1) <= 0
+
+    results = []
+    for i in rows:
+        if empty[i]:
+            results.append({'poc': math.nan, 'vah': math.nan, 'val': math.nan, 'hvn': (), 'lvn': ()})
+            continue
+        results.append({
+            'poc': float(centers[i, poc[i]]),
+            'vah': float(origin[i] + (vah[i] + 1) * bin_size[i]),
+            'val': float(origin[i] + val[i] * bin_size[i]),
+            'hvn': tuple(centers[i, hvn[i]].tolist()),
+            'lvn': tuple(centers[i, lvn[i]].tolist())
+        })
+    return results
+
+
+def compute_profiles(high, low, close, volume, lookback=100, bins=50, bin_size=None, share=VALUE_AREA):
+    """
+    Son `lookback` mumun hacim profili; 1D (tek sembol) veya 2D (semboller x zaman) giriş.
+    bin_size verilmezse sembol başına aralık/bins kullanılır (tek değer veya sembol başına dizi).
+    Dönüş: 1D girişte tek sözlük, 2D girişte sözlük listesi
+    {'poc', 'vah', 'val', 'hvn', 'lvn'}
+    """
+    single = np.ndim(close) == 1
+    high, low, close, volume = (np.atleast_2d(np.asarray(values, dtype='float64'))[:, -lookback:]
+                                for values in (high, low, close, volume))
+
+    if bin_size is None:
+        bin_size = default_bin_size(high, low, bins)
+    bin_size = np.broadcast_to(np.asarray(bin_size, dtype='float64'), (len(close),)).copy()
+
+    # Sıfıra hizalı ızgara: artımlı profille aynı kutular
+    size = bin_size[:, None]
+    first = np.nanmin(np.where(high > low, _bin_index(low, size), _bin_index(close, size)), axis=1)
+    # Üst sınırı kutu kenarına denk gelen mum üstteki kutuya hacim yazmaz
+    top = np.where(high > low, _bin_index(high, size, upper=True), _bin_index(close, size))
+    counts = (np.nanmax(top, axis=1) - first).astype('int64') + 1
+    valid = np.isfinite(first)
+    width = int(counts[valid].max()) if valid.any() else 1
+    first = np.where(valid, first, 0.0)
+    origin = first * bin_size
+
+    histogram = _distribute(high, low, close, volume, first, bin_size, width)
+    # Satırlar en geniş satıra göre boş kutularla tamamlanır; seviyeler satırın kendi kutularından
+    results = _levels(histogram, origin, bin_size, share, np.where(valid, counts, 1))
+    return results[0] if single else results
+
+
+class VolumeProfile:
+    """
+    Tek bir (sembol, zaman dilimi) için mum kapanışlarıyla artımlı güncellenen profil.
+    Her mumun kutu katkısı saklanır; pencereden çıkan mumun katkısı geri alınır,
+    yani güncelleme mumun kestiği kutu sayısı kadar iş yapar.
+    """
+
+    def __init__(self, bin_size, lookback=100, share=VALUE_AREA):
+        self.bin_size = float(bin_size)
+        self.lookback = lookback
+        self.share = share
+        self.last_timestamp = None
+        self._volumes = {}  # kutu indeksi -> hacim
+        self._candles = deque()  # (kutu indeksleri, hacimler)
+        self._pushes = 0
+
+    def _contribution(self, high, low, close, volume):
+        size = self.bin_size
+        if not high > low:
+            return np.array([int(_bin_index(close, size))]), np.array([volume])
+
+        first = int(_bin_index(low, size))
+        last = max(int(_bin_index(high, size, upper=True)), first)
+        share = _overlap_share(high, low, first, size, last - first + 1)
+        used = share > 0
+        return np.arange(first, last + 1)[used], volume * share[used]
+
+    def _apply(self, indexes, amounts, sign):
+        for index, amount in zip(indexes.tolist(), amounts.tolist()):
+            value = self._volumes.get(index, 0.0) + sign * amount
+            if sign < 0 and value <= 1e-12 * max(abs(amount), 1.0):
+                self._volumes.pop(index, None)
+            else:
+                self._volumes[index] = value
+
+    def push(self, candle):
+        """
+        Kapanan mumu profile ekler; aynı mum ikinci kez gelirse yok sayılır
+        """
+        timestamp = candle.get('timestamp')
+        if timestamp is not None and self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return
+        self.last_timestamp = timestamp
+
+        volume = float(candle['volume'])
+        if math.isnan(volume):
+            volume = 0.0
+        contribution = self._contribution(float(candle['high']), float(candle['low']), float(candle['close']), volume)
+        self._candles.append(contribution)
+        self._apply(*contribution, 1)
+
+        if len(self._candles) > self.lookback:
+            self._apply(*self._candles.popleft(), -1)
+
+        self._pushes += 1
+        if self._pushes % self.lookback == 0:
+            self._rebuild()
+
+    def _rebuild(self):
+        """
+        Ekle/çıkar işlemlerinde biriken yuvarlama hatasını sıfırla
+        """
+        self._volumes = {}
+        for indexes, amounts in self._candles:
+            self._apply(indexes, amounts, 1)
+
+    def extend(self, columns):
+        """
+        Birden fazla kapanmış mumu işler. columns: CandleStore.read çıktısı
+        """
+        for i in range(len(columns['timestamp'])):
+            self.push({name: columns[name][i] for name in ('timestamp', 'high', 'low', 'close', 'volume')})
+        return self
+
+    def histogram(self):
+        """
+        (ilk kutunun alt sınırı, yoğun hacim dizisi)
+        """
+        if not self._volumes:
+            return math.nan, np.zeros(0)
+        first = min(self._volumes)
+        dense = np.zeros(max(self._volumes) - first + 1)
+        for index, value in self._volumes.items():
+            dense[index - first] = value
+        return first * self.bin_size, dense
+
+    def levels(self):
+        origin, dense = self.histogram()
+        if len(dense) == 0:
+            return {'poc': math.nan, 'vah': math.nan, 'val': math.nan, 'hvn': (), 'lvn': ()}
+        return _levels(dense[None, :], np.array([origin]), np.array([self.bin_size]), self.share)[0]